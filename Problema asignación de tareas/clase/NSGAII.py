@@ -1,6 +1,21 @@
 import numpy as np
 
 
+#--------------------------- ESTADÍSTICAS ------------------------------------
+# Contadores acumulados que lee la instrumentación (ver instrumentacion.py). Cada algoritmo los
+# actualiza una sola vez por llamada (o por comparación en `dominancia_pareto`), así que su costo
+# es despreciable y pueden estar siempre activos.
+#   - comparaciones_dominancia: pares de vectores comparados por dominancia. En las versiones
+#     vectorizadas cuenta los pares que se comparan con NumPy.
+ESTADISTICAS = {"comparaciones_dominancia": 0}
+
+
+def reiniciar_estadisticas():
+    """Pone en cero los contadores de ESTADISTICAS."""
+    for nombre in ESTADISTICAS:
+        ESTADISTICAS[nombre] = 0
+
+
 #--------------------------- DOMINANCIA DE PARETO ------------------------------------
 
 def dominancia_pareto(U, V, modo="minimize"):
@@ -22,7 +37,8 @@ def dominancia_pareto(U, V, modo="minimize"):
     
     if modo not in ["minimize", "maximize"]:
         raise ValueError("El modo debe ser 'minimize' para minimización o 'maximize' para maximización.")
-    
+
+    ESTADISTICAS["comparaciones_dominancia"] += 1
     if modo == "minimize":
         u_domina_v = all(u <= v for u, v in zip(U, V)) and any(u < v for u, v in zip(U, V))
         v_domina_u = all(v <= u for v, u in zip(V, U)) and any(v < u for v, u in zip(V, U))
@@ -38,20 +54,316 @@ def dominancia_pareto(U, V, modo="minimize"):
         return 3
 
 
+# ------------------------------  Matriz de dominancia (NumPy) -------------------------------------
+# Presupuesto aproximado (en elementos) para los arreglos temporales de cada bloque de filas
+_ELEMENTOS_POR_BLOQUE = 2**24
+
+# A partir de cuántos vectores "auto" usa ENS en lugar de la matriz de dominancia (M >= 3)
+_UMBRAL_ENS = 2000
+
+
+def _como_minimizacion(vectores, modo):
+    """Convierte los vectores a un array (n, M) de flotantes en el que siempre se minimiza."""
+    if modo not in ["minimize", "maximize"]:
+        raise ValueError("El modo debe ser 'minimize' para minimización o 'maximize' para maximización.")
+    F = np.asarray(vectores, dtype=float)
+    if F.ndim == 1:
+        F = F.reshape(-1, 1) if F.size else F.reshape(0, 0)
+    return F if modo == "minimize" else -F
+
+
+def _tam_bloque(n_vectores, n_objetivos, tam_bloque):
+    if tam_bloque is None:
+        tam_bloque = _ELEMENTOS_POR_BLOQUE // max(1, n_vectores * n_objetivos)
+    return max(1, int(tam_bloque))
+
+
+def matriz_dominancia(vectores, modo="minimize", tam_bloque=None):
+    """
+    Calcula la matriz booleana de dominancia con broadcasting de NumPy.
+
+    D[i, j] es True si el vector i domina al vector j. La comparación se hace por bloques de
+    filas para que los arreglos temporales (bloque x n x M) no rebasen un tamaño fijo.
+
+    Args:
+        vectores (list | np.ndarray): Vectores de fitness, forma (n, M).
+        modo (str): "minimize" o "maximize".
+        tam_bloque (int, opcional): Filas por bloque. Por defecto se calcula a partir de n y M.
+
+    Returns:
+        np.ndarray: Matriz booleana (n, n).
+    """
+    F = _como_minimizacion(vectores, modo)
+    n_vectores = len(F)
+    tam_bloque = _tam_bloque(n_vectores, F.shape[1], tam_bloque)
+
+    ESTADISTICAS["comparaciones_dominancia"] += n_vectores * n_vectores
+    D = np.zeros((n_vectores, n_vectores), dtype=bool)
+    for inicio in range(0, n_vectores, tam_bloque):
+        bloque = F[inicio:inicio + tam_bloque, None, :]
+        D[inicio:inicio + tam_bloque] = np.all(bloque <= F[None, :, :], axis=2) & np.any(bloque < F[None, :, :], axis=2)
+    return D
+
+
+def _frentes_matriz(vectores, modo="minimize", tam_bloque=None):
+    """
+    Obtiene los frentes (índices) pelando la matriz de dominancia con conteos por columna.
+
+    El orden de los índices dentro de cada frente es el mismo que produce el algoritmo clásico:
+    el primer frente en orden ascendente y, en los siguientes, en el orden en el que su contador
+    llega a cero (según la posición de su último dominador en el frente anterior y luego el índice).
+    """
+    D = matriz_dominancia(vectores, modo, tam_bloque)
+    if len(D) == 0:
+        return [[]]
+
+    contador_dominancia = D.sum(axis=0)   # n_p: cuántas soluciones dominan a cada una
+    frente = np.flatnonzero(contador_dominancia == 0)
+
+    frentes_con_indices = [ ]
+    while frente.size:
+        frentes_con_indices.append(frente.tolist())
+
+        dominadas = D[frente]   # S_p de cada solución del frente, como filas booleanas
+        contador_dominancia = contador_dominancia - dominadas.sum(axis=0)
+        candidatos = np.flatnonzero(dominadas.any(axis=0) & (contador_dominancia == 0))
+        if not candidatos.size:
+            break
+
+        # Posición (dentro del frente actual) del último dominador de cada candidato
+        posiciones = np.arange(len(frente))[:, None]
+        ultimo_dominador = np.where(dominadas[:, candidatos], posiciones, -1).max(axis=0)
+        frente = candidatos[np.lexsort((candidatos, ultimo_dominador))]
+
+    return frentes_con_indices
+
+
+# ------------------------------  Ordenamiento bi-objetivo O(N log N) ------------------------------
+def _maximo_en_rangos(valores, inicio, fin):
+    """Máximo de valores[inicio[q]:fin[q] + 1] para cada consulta q, con una tabla dispersa (sparse table)."""
+    valores = np.asarray(valores)
+    tabla = [valores]
+    ancho = 1
+    while 2 * ancho <= len(valores):
+        anterior = tabla[-1]
+        tabla.append(np.maximum(anterior[:-ancho], anterior[ancho:]))
+        ancho *= 2
+
+    longitud = fin - inicio + 1
+    nivel = np.floor(np.log2(longitud)).astype(int)
+    resultado = np.empty(len(inicio), dtype=valores.dtype)
+    for j in np.unique(nivel):
+        q = nivel == j
+        resultado[q] = np.maximum(tabla[j][inicio[q]], tabla[j][fin[q] - (1 << j) + 1])
+    return resultado
+
+
+def _frentes_biobjetivo(vectores, modo="minimize"):
+    """
+    Frentes de Pareto para exactamente dos objetivos en O(N log N).
+
+    Los vectores se ordenan por (f1, f2) y cada uno se asigna, por búsqueda binaria, al primer frente
+    cuyo último elemento no lo domina. Los vectores repetidos quedan en el mismo frente, igual que en
+    el algoritmo clásico. El orden de los índices dentro de cada frente también es el del algoritmo
+    clásico: se obtiene con la posición del último dominador en el frente anterior (los dominadores
+    forman un rango contiguo del frente anterior ordenado por f1).
+    """
+    F = _como_minimizacion(vectores, modo)
+    n_vectores = len(F)
+    if n_vectores == 0:
+        return [[]]
+
+    orden = np.lexsort((F[:, 1], F[:, 0]))
+    f1 = F[orden, 0].tolist()
+    f2 = F[orden, 1].tolist()
+
+    # --- Asignación de frentes (sobre las posiciones del orden lexicográfico) ---
+    frentes_lex = [ ]
+    cola_f1 = [ ]   # f1 del último elemento agregado a cada frente
+    cola_f2 = [ ]   # f2 del último elemento agregado a cada frente (el menor del frente)
+    comparaciones = 0
+    for k in range(n_vectores):
+        a, b = f1[k], f2[k]
+        bajo, alto = 0, len(frentes_lex)
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            comparaciones += 1
+            # ¿El frente 'medio' domina al vector? Basta revisar su último elemento
+            if cola_f2[medio] < b or (cola_f2[medio] == b and cola_f1[medio] != a):
+                bajo = medio + 1
+            else:
+                alto = medio
+        if bajo == len(frentes_lex):
+            frentes_lex.append([ ])
+            cola_f1.append(a)
+            cola_f2.append(b)
+        frentes_lex[bajo].append(k)
+        cola_f1[bajo] = a
+        cola_f2[bajo] = b
+    ESTADISTICAS["comparaciones_dominancia"] += comparaciones
+
+    # --- Orden de cada frente igual al del algoritmo clásico ---
+    f1 = np.asarray(f1)
+    f2 = np.asarray(f2)
+    frente_lex = np.asarray(frentes_lex[0])
+    frente_indices = np.sort(orden[frente_lex])
+    frentes_con_indices = [frente_indices.tolist()]
+    posicion = np.empty(n_vectores, dtype=np.intp)
+
+    for siguiente in frentes_lex[1:]:
+        siguiente = np.asarray(siguiente)
+
+        # Posición de cada miembro del frente actual (en orden f1) dentro de su orden clásico
+        posicion[frente_indices] = np.arange(len(frente_indices))
+        posicion_clasica = posicion[orden[frente_lex]]
+
+        # Dominadores de q en el frente actual: f1 <= q.f1 (prefijo) y f2 <= q.f2 (sufijo)
+        fin = np.searchsorted(f1[frente_lex], f1[siguiente], side="right") - 1
+        inicio = np.searchsorted(-f2[frente_lex], -f2[siguiente], side="left")
+        ultimo_dominador = _maximo_en_rangos(posicion_clasica, inicio, fin)
+
+        indices = orden[siguiente]
+        frente_indices = indices[np.lexsort((indices, ultimo_dominador))]
+        frentes_con_indices.append(frente_indices.tolist())
+        frente_lex = siguiente
+
+    return frentes_con_indices
+
+
+# ------------------------------  Efficient Non-dominated Sort (ENS-BS) ----------------------------
+class _FrenteCreciente:
+    """
+    Frente de Pareto que crece sobre un arreglo por columnas (objetivos x capacidad) cuya
+    capacidad se duplica. Se asume que los vectores llegan en orden lexicográfico.
+    """
+
+    def __init__(self, n_objetivos, capacidad=64):
+        self.columnas = np.empty((n_objetivos, capacidad))
+        self.indices = [ ]
+
+    def agregar(self, vector, indice):
+        n = len(self.indices)
+        if n == self.columnas.shape[1]:
+            self.columnas = np.concatenate([self.columnas, np.empty_like(self.columnas)], axis=1)
+        self.columnas[:, n] = vector
+        self.indices.append(indice)
+
+    def domina_a(self, vector):
+        """
+        True si algún miembro del frente domina al vector (minimización).
+
+        Por el orden lexicográfico todos los miembros ya cumplen f1 <= vector[0], así que se
+        filtran candidatos objetivo por objetivo a partir del segundo; al final basta con que
+        algún candidato sea distinto del vector (los repetidos no se dominan).
+        """
+        n = len(self.indices)
+        if n == 0:
+            return False
+        if len(vector) == 1:
+            return bool(self.columnas[0, 0] < vector[0])
+
+        candidatos = np.flatnonzero(self.columnas[1, :n] <= vector[1])
+        for m in range(2, len(vector)):
+            if not candidatos.size:
+                return False
+            candidatos = candidatos[self.columnas[m, candidatos] <= vector[m]]
+        return bool(candidatos.size) and bool((self.columnas[:, candidatos] != vector[:, None]).any())
+
+
+def _frentes_ens(vectores, modo="minimize"):
+    """
+    Efficient Non-dominated Sort con búsqueda binaria (ENS-BS), para cualquier número de objetivos.
+
+    Los vectores se ordenan lexicográficamente; así, un vector solo puede ser dominado por vectores
+    que aparecen antes que él. Cada vector se compara únicamente contra los frentes que visita la
+    búsqueda binaria (y contra todos sus miembros a la vez con NumPy), en lugar de contra toda la
+    población. Los vectores repetidos quedan en el mismo frente. Los índices de cada frente se
+    regresan en orden ascendente.
+    """
+    F = _como_minimizacion(vectores, modo)
+    n_vectores = len(F)
+    if n_vectores == 0:
+        return [[]]
+
+    # Orden lexicográfico: primera columna como llave principal
+    orden = np.lexsort(F.T[::-1])
+
+    frentes = [ ]
+    comparaciones = 0
+    for idx in orden.tolist():
+        vector = F[idx]
+        bajo, alto = 0, len(frentes)
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            comparaciones += len(frentes[medio].indices)
+            if frentes[medio].domina_a(vector):
+                bajo = medio + 1
+            else:
+                alto = medio
+        if bajo == len(frentes):
+            frentes.append(_FrenteCreciente(F.shape[1]))
+        frentes[bajo].agregar(vector, idx)
+    ESTADISTICAS["comparaciones_dominancia"] += comparaciones
+
+    return [sorted(frente.indices) for frente in frentes]
+
+
 # ------------------------------  Fast-non-dominated sort -------------------------------------------
-def fast_non_dominated_sort(vectores, modo="minimize"):
+def fast_non_dominated_sort(vectores, modo="minimize", method="auto"):
     """
     Ordena un conjunto de vectores de acuerdo a la dominancia de Pareto (NSGA-II).
 
     Args:
         vectores (list): Una lista de vectores de fitness.
         modo (str): "minimize" o "maximize".
+        method (str): Algoritmo para calcular los frentes:
+            - "clasico": doble ciclo de Python con `dominancia_pareto` (versión original).
+            - "matriz": matriz de dominancia con NumPy, por bloques.
+            - "biobjetivo": O(N log N), solo para vectores con exactamente dos objetivos.
+            - "ens": Efficient Non-dominated Sort con búsqueda binaria, para cualquier número de
+              objetivos; los índices de cada frente quedan en orden ascendente.
+            - "auto": elige el más rápido disponible ("biobjetivo" si hay dos objetivos, "matriz"
+              para poblaciones pequeñas y "ens" a partir de _UMBRAL_ENS vectores).
 
     Returns:
         tuple: Una tupla con dos elementos:
                1. (list): La lista de frentes con los VECTORES de fitness.
                2. (list): La lista de frentes con los ÍNDICES originales de esos vectores.
     """
+    if method == "auto":
+        n_objetivos = len(vectores[0]) if len(vectores) else 0
+        if n_objetivos == 2:
+            method = "biobjetivo"
+        elif len(vectores) >= _UMBRAL_ENS:
+            method = "ens"
+        else:
+            method = "matriz"
+
+    if method == "clasico":
+        frentes_con_indices = _frentes_clasico(vectores, modo)
+    elif method == "matriz":
+        frentes_con_indices = _frentes_matriz(vectores, modo)
+    elif method == "biobjetivo":
+        frentes_con_indices = _frentes_biobjetivo(vectores, modo)
+    elif method == "ens":
+        frentes_con_indices = _frentes_ens(vectores, modo)
+    else:
+        raise ValueError(f"Método de ordenamiento no reconocido: {method}")
+
+    # 1. Crear la lista de frentes con los vectores (como en la versión original)
+    frentes_con_vectores = []
+    for frente_indices in frentes_con_indices:
+        vectores_frente = [vectores[i] for i in frente_indices]
+        frentes_con_vectores.append(vectores_frente)
+        
+    return frentes_con_vectores, frentes_con_indices
+
+
+def _frentes_clasico(vectores, modo="minimize"):
+    """
+    Versión original de fast-non-dominated-sort: construye S_p y n_p comparando todos los pares.
+    Regresa la lista de frentes con los ÍNDICES de los vectores.
+    """
     n_vectores = len(vectores)
     
     soluciones_dominadas = [[] for _ in range(n_vectores)]
@@ -92,66 +404,59 @@ def fast_non_dominated_sort(vectores, modo="minimize"):
             frentes_con_indices.append(Q)
         else:
             break
-            
-    # --- Paso 4: Formatear la salida para tener AMBOS resultados ---
-    # 1. Crear la lista de frentes con los vectores (como en la versión original)
-    frentes_con_vectores = []
-    for frente_indices in frentes_con_indices:
-        vectores_frente = [vectores[i] for i in frente_indices]
-        frentes_con_vectores.append(vectores_frente)
-        
-    return frentes_con_vectores, frentes_con_indices
+
+    return frentes_con_indices
 
 # ------------------------ CROWDING-DISTANCE ASSIGNMENT -------------------------------------
 def crowding_distance(poblacion_soluciones):
     """
     Calcula la distancia de crowding para un conjunto de soluciones en un frente.
-    Esta versión está corregida para evitar errores de índice.
+
+    Versión vectorizada: se ordena cada objetivo con argsort sobre un arreglo (n, M).
+    - Las soluciones extremas de cada objetivo reciben distancia infinita (np.inf).
+    - Un objetivo con rango cero (todos los valores iguales) no aporta distancia.
+    - Las soluciones repetidas reciben la misma distancia: se calcula sobre los puntos únicos,
+      para que una copia no quede como "vecina a distancia cero" de la otra.
+
+    Args:
+        poblacion_soluciones (list | np.ndarray): Vectores de fitness del frente, forma (n, M).
+
+    Returns:
+        np.ndarray: Distancia de crowding de cada solución, en el mismo orden de entrada.
     """
-    # Convierte a lista de listas si son arrays de numpy, para consistencia
-    poblacion_soluciones = [list(sol) for sol in poblacion_soluciones]
+    F = np.asarray(poblacion_soluciones, dtype=float)
+    l = len(F)
+    if l == 0:
+        return np.empty(0)
+    if F.ndim == 1:
+        F = F.reshape(-1, 1)
 
-    l = len(poblacion_soluciones)
-    if l <= 2:
-        # Si hay 2 o menos soluciones, todas son extremos y su distancia es infinita
-        return [10000] * l
+    unicos, inversa = np.unique(F, axis=0, return_inverse=True)
+    inversa = inversa.reshape(-1)
+    n_unicos = len(unicos)
+    if n_unicos <= 2:
+        # Si hay 2 o menos soluciones distintas, todas son extremos y su distancia es infinita
+        return np.full(l, np.inf)
 
-    num_obj = len(poblacion_soluciones[0])
-    distancias = [0.0 for _ in range(l)]
+    # Índices que ordenan cada objetivo y valores ordenados, forma (n_unicos, M)
+    orden = np.argsort(unicos, axis=0, kind="stable")
+    ordenados = np.take_along_axis(unicos, orden, axis=0)
+    rango = ordenados[-1] - ordenados[0]
+    con_rango = rango > 0
 
-    for i in range(num_obj):
-        # Ordenamos los índices de las soluciones según el objetivo 'i'
-        indices_ordenados = sorted(range(l), key=lambda j: poblacion_soluciones[j][i])
-        
-        # Asignamos una distancia infinita a las soluciones extremas para este objetivo
-        # Esto asegura que los puntos en los bordes del frente de Pareto sean preferidos
-        distancias[indices_ordenados[0]] = 10000
-        distancias[indices_ordenados[-1]] = 10000
-
-        # Obtenemos los valores mínimo y máximo para normalizar
-        f_min = poblacion_soluciones[indices_ordenados[0]][i]
-        f_max = poblacion_soluciones[indices_ordenados[-1]][i]
-        rango = f_max - f_min
-
-        # Si el rango es cero, no se puede calcular la distancia para este objetivo
-        if rango == 0:
-            continue
-
-        # Calculamos la distancia para las soluciones intermedias
-        for j in range(1, l - 1):
-            # Índice original del individuo actual en la lista ordenada
-            idx_original = indices_ordenados[j]
-            
-            # Valor del objetivo del vecino anterior en la lista ordenada
-            valor_anterior = poblacion_soluciones[indices_ordenados[j-1]][i]
+    # Aporte de cada posición ordenada: distancia normalizada entre el vecino siguiente y el anterior
+    aporte = np.zeros_like(ordenados)
+    aporte[1:-1] = np.divide(ordenados[2:] - ordenados[:-2], rango, out=np.zeros_like(ordenados[1:-1]),
+                             where=con_rango)
+    aporte[0] = np.where(con_rango, np.inf, 0.0)
+    aporte[-1] = np.where(con_rango, np.inf, 0.0)
 
-            # Valor del objetivo del vecino siguiente en la lista ordenada
-            valor_siguiente = poblacion_soluciones[indices_ordenados[j+1]][i]
-            
-            # Acumulamos la distancia normalizada
-            distancias[idx_original] += (valor_siguiente - valor_anterior) / rango
+    # Regresar los aportes a la posición original de cada punto y sumar por objetivo
+    aporte_original = np.empty_like(aporte)
+    np.put_along_axis(aporte_original, orden, aporte, axis=0)
+    distancias = aporte_original.sum(axis=1)
 
-    return distancias
+    return distancias[inversa]
 
 # ------------------- SOBREVIVIENTES POR DISTANCIA DE CROWDING --------------------------------
 def sobrevivientes_dist_crowding(vec_frente, n_sobrevivientes):
@@ -164,14 +469,38 @@ def sobrevivientes_dist_crowding(vec_frente, n_sobrevivientes):
     
     Returns:
         soluciones (list): Lista con los vectores de las soluciones que sobrevirián
-        indices (list): Lista con los índices de las soluciones que sobrevivirán
+        indices (list): Lista con los índices de las soluciones que sobrevivirán, de mayor a menor distancia
     """
-    #print(f"Iniciando el proceso de calcular la distancia de crowding")
-    distancias_crowding = crowding_distance(vec_frente)
-    #print(f"El proceso de calculo para la distancia de crowding terminó correctamente")
-    #print(f"Las distancias de crowding para los vectores son: {distancias_crowding}")
-    indices = sorted(range(len(distancias_crowding)), key=lambda i: distancias_crowding[i], reverse=True)[:n_sobrevivientes]
+    indices = indices_mayor_crowding(crowding_distance(vec_frente), n_sobrevivientes)
     soluciones = [vec_frente[i] for i in indices]
 
     return soluciones, indices
 
+
+def indices_mayor_crowding(distancias_crowding, n_sobrevivientes):
+    """
+    Índices de los `n_sobrevivientes` vectores con mayor distancia de crowding, de mayor a menor
+    distancia (los empates se resuelven por índice). Sirve cuando las distancias ya se calcularon.
+
+    Returns:
+        list: Índices elegidos.
+    """
+    distancias_crowding = np.asarray(distancias_crowding)
+    n_vectores = len(distancias_crowding)
+    k = min(max(n_sobrevivientes, 0), n_vectores)
+    if k == 0:
+        return []
+
+    if k < n_vectores:
+        # Se ubica la k-ésima mayor distancia sin ordenar todo el frente (argpartition, O(n))
+        umbral = distancias_crowding[np.argpartition(-distancias_crowding, k - 1)[k - 1]]
+        mayores = np.flatnonzero(distancias_crowding > umbral)
+        # Los empates en el umbral se resuelven por índice, igual que un ordenamiento estable
+        empatados = np.flatnonzero(distancias_crowding == umbral)[:k - len(mayores)]
+        elegidos = np.concatenate([mayores, empatados])
+    else:
+        elegidos = np.arange(n_vectores)
+
+    # Solo los k elegidos se ordenan de mayor a menor distancia
+    elegidos = elegidos[np.lexsort((elegidos, -distancias_crowding[elegidos]))]
+    return elegidos.tolist()
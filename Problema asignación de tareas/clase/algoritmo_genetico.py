@@ -21,6 +21,11 @@
 import numpy as np 
 import random
 from NSGAII import *
+from instancia import compilar_instancia
+
+# Cromosomas decodificados en este proceso (o enviados a un evaluador en paralelo). Los aciertos de
+# la caché no llegan a la decodificación, así que no cuentan. MotorNSGAII lo usa para `n_evaluaciones`.
+ESTADISTICAS_EVALUACION = {"evaluaciones": 0}
 
 
 # ---------------------- INICIALIZACIÓN ------------------
@@ -47,11 +52,39 @@ def generar_cromosoma_random(n, limite_inferior=1, limite_superior=4):
 
 
 
-def generar_poblacion_inicial(tam_poblacion, len_cromosoma, mtx_op_t, mtx_op_e, l_tsk_oper):
+def generar_poblacion_inicial(tam_poblacion, len_cromosoma, mtx_op_t, mtx_op_e=None, l_tsk_oper=None, cache=None,
+                              checkpoints=None, evaluador=None):
+    """
+    Genera la población inicial y la evalúa.
+
+    Args:
+        tam_poblacion (int): Número de individuos.
+        len_cromosoma (int): Número de genes (operaciones) de cada cromosoma.
+        mtx_op_t (list | InstanciaProblema): matriz con la relación de operaciones-tiempo,
+            o una instancia compilada (en cuyo caso mtx_op_e y l_tsk_oper no se usan).
+        mtx_op_e (list): matriz con la relación de operaciones-energía
+        l_tsk_oper (list): lista con las operaciones de cada tarea
+        cache (CacheAptitud, opcional): Caché de evaluaciones. Si es None no se usa caché.
+        checkpoints (CacheAptitud, opcional): Almacén donde se guardan los checkpoints de decodificación
+            de cada individuo, para que sus hijos se evalúen de forma incremental.
+        evaluador (EvaluadorParalelo, opcional): Evaluador por lotes que reparte la población entre procesos.
+            No se usa si se dan checkpoints.
+
+    Returns:
+        list: Población con el formato [[cromosoma], [f1, f2]]
+    """
+    instancia = compilar_instancia(mtx_op_t, mtx_op_e, l_tsk_oper)
+    cromosomas = [generar_cromosoma_random(len_cromosoma, 1, instancia.n_maquinas) for _ in range(0, tam_poblacion)]
+
+    # Se evalúa toda la población en una sola llamada al decodificador por lotes; con checkpoints,
+    # la misma pasada los guarda
+    if checkpoints is not None:
+        aptitudes = _evaluar_con_bases(cromosomas, [()] * len(cromosomas), instancia, checkpoints, cache)
+    else:
+        aptitudes = evaluar_fitness_poblacion(cromosomas, instancia, cache=cache, evaluador=evaluador)
+
     poblacion = [ ]
-    for _ in range(0,tam_poblacion):
-        cromosoma = generar_cromosoma_random(len_cromosoma)
-        aptitud = evaluar_fitness(cromosoma, mtx_op_t, mtx_op_e, l_tsk_oper)
+    for cromosoma, aptitud in zip(cromosomas, aptitudes):
         X = [cromosoma, aptitud]
         poblacion.append(X)
     return poblacion
@@ -59,67 +92,365 @@ def generar_poblacion_inicial(tam_poblacion, len_cromosoma, mtx_op_t, mtx_op_e,
 
 # ----------------------- EVALUACION -----------------------
 
-def evaluar_fitness(vec_solucion, mtx_op_t, mtx_op_e, l_tsk_oper):
-    """_summary_
+def evaluar_fitness(vec_solucion, mtx_op_t, mtx_op_e=None, l_tsk_oper=None, cache=None):
+    """
+    Decodifica un cromosoma y calcula el makespan y el consumo de energía.
 
     Args:
-        vec_solucion (_type_): _description_
-        mtx_op_t (_type_): _description_
-        mtx_op_e (_type_): _description_
-        l_tsk_oper (_type_): _description_
+        vec_solucion (list): Cromosoma con la máquina (base 1) asignada a cada operación.
+        mtx_op_t (list | InstanciaProblema): matriz con la relación de operaciones-tiempo,
+            o una instancia compilada (en cuyo caso mtx_op_e y l_tsk_oper no se usan).
+        mtx_op_e (list): matriz con la relación de operaciones-energía
+        l_tsk_oper (list): lista con las operaciones de cada tarea
+        cache (CacheAptitud, opcional): Caché de evaluaciones para no decodificar dos veces el mismo cromosoma.
 
     Returns:
         numpy.ndarray: Un array de dos dimensiones. La primera representa el cálculo del makespan y el segundo 
         cálculo del consumo total de energía
     """
+    instancia = compilar_instancia(mtx_op_t, mtx_op_e, l_tsk_oper)
+    if cache is not None:
+        return cache.evaluar(vec_solucion, evaluar_fitness, instancia)
 
-    num_tareas = len(l_tsk_oper)
-    num_maquinas = len(mtx_op_t[0])
-    tiemp_maquinas = [0.0] * num_maquinas  # Reloj de cada máquina
-    tiemp_tareas = [0.0] * num_tareas      # Reloj de cada tarea
+    return _simular_relojes(vec_solucion, instancia, 0, None, None)
 
-    energia_consumida = 0.0
 
-    vec_solucion = np.array(vec_solucion)
+# --------------------- EVALUACIÓN INCREMENTAL (CHECKPOINTS) ---------------------
 
-    idx_op_maq = 0 # Obtiene la máquina del vector original
-    for i in range(len(l_tsk_oper)): # Recorriendo cada tarea
-        for j in range(len(l_tsk_oper[i])): # Recorriendo la operación J de la tarea I 
-            maquina = vec_solucion[idx_op_maq]
-            operacion = l_tsk_oper[i][j]
-            
-            energia_consumida += mtx_op_e[operacion-1][maquina-1] 
-            duracion = mtx_op_t[operacion-1][maquina-1] # Obtener la duracion de la operacion en proceso 
+class CheckpointsDecodificacion:
+    """
+    Estados guardados de la simulación de relojes de un cromosoma.
 
-            
-            tiempo_fin_op_anterior = tiemp_tareas[i]
-            tiempo_maquina_libre = tiemp_maquinas[maquina-1]
-            
-            # El tiempo de inicio es el MÁXIMO de los dos anteriores.
-            tiempo_inicio = max(tiempo_fin_op_anterior, tiempo_maquina_libre)
-            
-            # El tiempo de fin de la operación actual
+    La fila k de `estados` es el estado ANTES de decodificar el gen k*paso:
+    [relojes de máquinas..., relojes de tareas..., energía acumulada].
+    La fila 0 siempre es el estado inicial (todo en cero).
+
+    Atributos:
+        paso (int): Número de genes entre dos checkpoints consecutivos.
+        estados (numpy.ndarray): Matriz (n_checkpoints, n_maquinas + n_tareas + 1).
+        aptitud (numpy.ndarray): [makespan, energía] del cromosoma completo.
+    """
+
+    def __init__(self, paso, estados, aptitud):
+        self.paso = paso
+        self.estados = estados
+        self.aptitud = aptitud
+
+    def __repr__(self):
+        return f"CheckpointsDecodificacion(paso={self.paso}, n_checkpoints={len(self.estados)})"
+
+
+def _paso_checkpoints(instancia):
+    """Paso por defecto entre checkpoints: unos 16 por cromosoma."""
+    return max(1, -(-instancia.n_genes // 16))
+
+
+def _simular_relojes(vec_solucion, instancia, gen_inicio, estado_inicial, paso, estados=None):
+    """
+    Avanza los relojes de máquinas y tareas desde `gen_inicio` hasta el final del cromosoma.
+
+    Args:
+        vec_solucion (list): Cromosoma completo.
+        instancia (InstanciaProblema): Instancia compilada.
+        gen_inicio (int): Primer gen a decodificar.
+        estado_inicial (numpy.ndarray | None): Estado antes de `gen_inicio` (None = todo en cero).
+        paso (int | None): Genes entre checkpoints.
+        estados (numpy.ndarray | None): Matriz de checkpoints (ver `CheckpointsDecodificacion`). Si se
+            da, se escribe en ella el estado antes de cada gen múltiplo de `paso` posterior a `gen_inicio`.
+
+    Returns:
+        numpy.ndarray: aptitud [makespan, energía]
+    """
+    ESTADISTICAS_EVALUACION["evaluaciones"] += 1
+    n_maquinas = instancia.n_maquinas
+    if estado_inicial is None:
+        tiemp_maquinas = [0.0] * n_maquinas           # Reloj de cada máquina
+        tiemp_tareas = [0.0] * instancia.n_tareas     # Reloj de cada tarea
+        energia_inicial = 0.0
+    else:
+        tiemp_maquinas = estado_inicial[:n_maquinas].tolist()
+        tiemp_tareas = estado_inicial[n_maquinas:-1].tolist()
+        energia_inicial = estado_inicial[-1]
+
+    # Duración y energía de cada gen en la máquina que tiene asignada
+    maquinas = np.asarray(vec_solucion, dtype=np.intp)[gen_inicio:] - 1
+    idx_genes = instancia.idx_genes[gen_inicio:]
+    duraciones = instancia.tiempos_gen[idx_genes, maquinas].tolist()
+
+    # Suma secuencial (igual que acumular gen por gen): energia_acumulada[k] es la energía antes del gen gen_inicio + k
+    energia_acumulada = np.cumsum(np.concatenate(([energia_inicial], instancia.energia_gen[idx_genes, maquinas])))
+    tareas = instancia.tarea_gen_lista[gen_inicio:]
+    maquinas = maquinas.tolist()
+
+    # Se decodifica por tramos entre checkpoints, para no revisar en cada gen si toca guardar el estado
+    n_restantes = len(tareas)
+    cortes = [ ]
+    if estados is not None:
+        cortes = list(range((gen_inicio // paso + 1) * paso - gen_inicio, n_restantes, paso))
+    for inicio, fin in zip([0] + cortes, cortes + [n_restantes]):
+        if inicio > 0:
+            fila = estados[(gen_inicio + inicio) // paso]
+            fila[:n_maquinas] = tiemp_maquinas
+            fila[n_maquinas:-1] = tiemp_tareas
+            fila[-1] = energia_acumulada[inicio]
+
+        for tarea, maquina, duracion in zip(tareas[inicio:fin], maquinas[inicio:fin], duraciones[inicio:fin]):
+            # El tiempo de inicio es el MÁXIMO entre el fin de la operación anterior y la máquina libre
+            tiempo_inicio = max(tiemp_tareas[tarea], tiemp_maquinas[maquina])
             tiempo_fin_actual = tiempo_inicio + duracion
-            
-           
 
-            # --- CAMBIO 3: Actualizar los "relojes" ---
             # Actualizamos el reloj de la máquina y de la tarea con el tiempo de finalización.
-            tiemp_maquinas[maquina-1] = tiempo_fin_actual
-            tiemp_tareas[i] = tiempo_fin_actual
-            
-            idx_op_maq += 1
+            tiemp_maquinas[maquina] = tiempo_fin_actual
+            tiemp_tareas[tarea] = tiempo_fin_actual
 
     # Cálculo Final del Makespan ---
     # El makespan es el tiempo en que la ÚLTIMA máquina termina.
     makespan = max(tiemp_maquinas)
 
-    return np.array([makespan, energia_consumida])
+    return np.array([makespan, float(energia_acumulada[-1])])
+
+
+def _estados_vacios(instancia, paso, n_cromosomas=None):
+    """Matriz de checkpoints en ceros: (n_checkpoints, ancho) o (n_cromosomas, n_checkpoints, ancho)."""
+    forma = (-(-instancia.n_genes // paso), instancia.n_maquinas + instancia.n_tareas + 1)
+    return np.zeros(forma if n_cromosomas is None else (n_cromosomas,) + forma)
+
+
+def evaluar_fitness_con_checkpoints(vec_solucion, mtx_op_t, mtx_op_e=None, l_tsk_oper=None, paso=None):
+    """
+    Evalúa un cromosoma completo y guarda checkpoints de los relojes cada `paso` genes.
+
+    Args:
+        vec_solucion (list): Cromosoma con la máquina (base 1) asignada a cada operación.
+        mtx_op_t (list | InstanciaProblema): matriz operaciones-tiempo o instancia compilada.
+        mtx_op_e (list): matriz con la relación de operaciones-energía
+        l_tsk_oper (list): lista con las operaciones de cada tarea
+        paso (int, opcional): Genes entre checkpoints. Por defecto se guardan unos 16 checkpoints.
+
+    Returns:
+        tuple: (aptitud, CheckpointsDecodificacion)
+    """
+    instancia = compilar_instancia(mtx_op_t, mtx_op_e, l_tsk_oper)
+    if paso is None:
+        paso = _paso_checkpoints(instancia)
+
+    estados = _estados_vacios(instancia, paso)
+    aptitud = _simular_relojes(vec_solucion, instancia, 0, None, paso, estados)
+    return aptitud, CheckpointsDecodificacion(paso, estados, aptitud)
+
+
+def reevaluar_fitness_incremental(vec_solucion, vec_base, checkpoints_base, mtx_op_t, mtx_op_e=None, l_tsk_oper=None,
+                                  gen_distinto=None):
+    """
+    Evalúa un cromosoma reanudando la simulación desde los checkpoints de otro cromosoma (padre).
+
+    Se busca el primer gen en el que difieren `vec_solucion` y `vec_base`, se toma el último
+    checkpoint anterior a ese gen y se decodifica solo a partir de ahí. El resultado es idéntico
+    al de `evaluar_fitness`.
+
+    Args:
+        vec_solucion (list): Cromosoma a evaluar (hijo o mutante).
+        vec_base (list): Cromosoma del que se tienen checkpoints (padre).
+        checkpoints_base (CheckpointsDecodificacion): Checkpoints de `vec_base`.
+        mtx_op_t (list | InstanciaProblema): matriz operaciones-tiempo o instancia compilada.
+        mtx_op_e (list): matriz con la relación de operaciones-energía
+        l_tsk_oper (list): lista con las operaciones de cada tarea
+        gen_distinto (int, opcional): Primer gen distinto, si ya se conoce.
+
+    Returns:
+        tuple: (aptitud, CheckpointsDecodificacion del nuevo cromosoma)
+    """
+    instancia = compilar_instancia(mtx_op_t, mtx_op_e, l_tsk_oper)
+
+    if gen_distinto is None:
+        gen_distinto = _primer_gen_distinto(vec_solucion, vec_base)
+    if gen_distinto >= len(vec_solucion):
+        return checkpoints_base.aptitud, checkpoints_base
+
+    paso = checkpoints_base.paso
+    fila = gen_distinto // paso
+    estados = np.empty_like(checkpoints_base.estados)
+    estados[:fila + 1] = checkpoints_base.estados[:fila + 1]
+    aptitud = _simular_relojes(vec_solucion, instancia, fila * paso, checkpoints_base.estados[fila], paso, estados)
+    return aptitud, CheckpointsDecodificacion(paso, estados, aptitud)
+
+
+def _primer_gen_distinto(vec_a, vec_b):
+    diferencias = np.flatnonzero(np.asarray(vec_a) != np.asarray(vec_b))
+    return int(diferencias[0]) if diferencias.size else len(vec_a)
+
+
+# Costos medidos de la decodificación (microsegundos, solo importan sus proporciones). El lote
+# vectorizado paga un costo fijo por columna (operación) más un poco por cromosoma; la decodificación
+# escalar paga por llamada y por gen decodificado. Así, el lote conviene para muchos cromosomas y
+# sufijos largos, y la reanudación escalar para pocos cromosomas o sufijos cortos.
+_COSTO_COLUMNA_LOTE = 12.0
+_COSTO_CROMOSOMA_LOTE = 0.07
+_COSTO_LLAMADA_ESCALAR = 12.0
+_COSTO_GEN_ESCALAR = 0.55
+# Con cromosomas más cortos el manejo de checkpoints (claves, almacén) cuesta más que decodificar
+# de nuevo, así que se evalúa con el lote normal y no se guardan checkpoints
+_GENES_MINIMOS_CHECKPOINTS = 256
+
+
+def _evaluar_con_bases(cromosomas, bases, instancia, almacen_checkpoints, cache=None):
+    """
+    Evalúa cada cromosoma respecto a sus bases (padres, o el cromosoma antes de mutar).
+
+    Cada cromosoma se puede reanudar desde el checkpoint de la base con checkpoints con la que
+    comparte el prefijo más largo (o decodificar desde el inicio si no hay ninguna). Con los costos
+    medidos se elige lo más barato: decodificar todos de forma escalar desde su checkpoint, o
+    decodificar completos en un solo lote los que tienen sufijos largos (el lote también guarda sus
+    checkpoints). Con `cache` solo se evalúan los cromosomas que no estaban en ella. Si los cromosomas
+    tienen menos de `_GENES_MINIMOS_CHECKPOINTS` genes, todos se evalúan en lote sin checkpoints.
+
+    Returns:
+        numpy.ndarray: Matriz (N, 2) con la aptitud de cada cromosoma.
+    """
+    if instancia.n_genes < _GENES_MINIMOS_CHECKPOINTS:
+        return evaluar_fitness_poblacion(cromosomas, instancia, cache=cache)
+    if cache is not None:
+        bases_por_id = {id(cromosoma): bases_cromosoma for cromosoma, bases_cromosoma in zip(cromosomas, bases)}
+        return cache.evaluar_lote(cromosomas, lambda faltantes: _evaluar_con_bases(
+            faltantes, [bases_por_id[id(cromosoma)] for cromosoma in faltantes], instancia, almacen_checkpoints))
+
+    genes = np.asarray(cromosomas, dtype=np.intp)
+    if genes.size == 0:
+        return np.empty((0, 2))
+    n_cromosomas, n_genes = genes.shape
+
+    # Base elegida para cada cromosoma: (genes de la base, checkpoints, primer gen distinto)
+    elegidas = [None] * n_cromosomas
+    restantes = np.full(n_cromosomas, n_genes)   # Genes que quedan por decodificar al reanudar
+    for j in range(max((len(b) for b in bases), default=0)):
+        filas = [i for i, b in enumerate(bases) if len(b) > j]
+        genes_base = np.asarray([bases[i][j] for i in filas], dtype=np.intp)
+        distintos = genes[filas] != genes_base
+        primer_distinto = np.where(distintos.any(axis=1), distintos.argmax(axis=1), n_genes).tolist()
+        for k, i in enumerate(filas):
+            gen_distinto = primer_distinto[k]
+            if elegidas[i] is not None and gen_distinto <= elegidas[i][2]:
+                continue
+            checkpoints_base = almacen_checkpoints.obtener(genes_base[k])
+            if checkpoints_base is not None:
+                elegidas[i] = (genes_base[k], checkpoints_base, gen_distinto)
+                paso_base = checkpoints_base.paso
+                restantes[i] = 0 if gen_distinto == n_genes else n_genes - gen_distinto // paso_base * paso_base
+
+    # Los sufijos más cortos que esto siempre son más baratos de forma escalar que dentro del lote
+    corto = restantes * _COSTO_GEN_ESCALAR + _COSTO_LLAMADA_ESCALAR <= n_genes * _COSTO_CROMOSOMA_LOTE
+    costo_escalar = np.sum(restantes * _COSTO_GEN_ESCALAR + _COSTO_LLAMADA_ESCALAR)
+    costo_lote = (n_genes * (_COSTO_COLUMNA_LOTE + _COSTO_CROMOSOMA_LOTE * np.count_nonzero(~corto))
+                  + np.sum(restantes[corto] * _COSTO_GEN_ESCALAR + _COSTO_LLAMADA_ESCALAR))
+    escalar = np.ones(n_cromosomas, dtype=bool) if costo_escalar <= costo_lote else corto
+
+    aptitudes = np.empty((n_cromosomas, 2))
+    paso = _paso_checkpoints(instancia)
+    for i in np.flatnonzero(escalar).tolist():
+        if elegidas[i] is None:
+            aptitudes[i], checkpoints = evaluar_fitness_con_checkpoints(genes[i], instancia, paso=paso)
+        else:
+            genes_base, checkpoints_base, gen_distinto = elegidas[i]
+            aptitudes[i], checkpoints = reevaluar_fitness_incremental(genes[i], genes_base, checkpoints_base,
+                                                                      instancia, gen_distinto=gen_distinto)
+        almacen_checkpoints.guardar(genes[i], checkpoints)
+
+    lote = np.flatnonzero(~escalar)
+    if lote.size:
+        aptitudes_lote, estados = _simular_relojes_lote(genes[lote], instancia, paso)
+        aptitudes[lote] = aptitudes_lote
+        for k, i in enumerate(lote.tolist()):
+            almacen_checkpoints.guardar(genes[i], CheckpointsDecodificacion(paso, estados[k], aptitudes_lote[k]))
+    return aptitudes
+
+
+def _simular_relojes_lote(genes, instancia, paso=None):
+    """
+    Avanza los relojes de máquinas y tareas de todos los cromosomas al mismo tiempo, una columna
+    (operación) a la vez.
+
+    Args:
+        genes (numpy.ndarray): Matriz de enteros (individuos x operaciones), máquinas en base 1.
+        instancia (InstanciaProblema): Instancia compilada.
+        paso (int | None): Si no es None, también se guardan los checkpoints de cada cromosoma.
+
+    Returns:
+        tuple: (aptitudes (N, 2), estados (N, n_checkpoints, ancho) o None)
+    """
+    n_individuos = genes.shape[0]
+    ESTADISTICAS_EVALUACION["evaluaciones"] += n_individuos
+    n_maquinas = instancia.n_maquinas
+    tiemp_maquinas = np.zeros((n_individuos, n_maquinas))           # Reloj de cada máquina por individuo
+    tiemp_tareas = np.zeros((n_individuos, instancia.n_tareas))     # Reloj de cada tarea por individuo
+    energia_consumida = np.zeros(n_individuos)
+    filas = np.arange(n_individuos)
+    estados = None if paso is None else _estados_vacios(instancia, paso, n_individuos)
+
+    for g, tarea in enumerate(instancia.tarea_gen_lista):
+        if estados is not None and g > 0 and g % paso == 0:
+            estados[:, g // paso, :n_maquinas] = tiemp_maquinas
+            estados[:, g // paso, n_maquinas:-1] = tiemp_tareas
+            estados[:, g // paso, -1] = energia_consumida
+
+        maquinas = genes[:, g] - 1  # Máquina de la operación en cada individuo
+
+        energia_consumida += instancia.energia_gen[g, maquinas]
+        duracion = instancia.tiempos_gen[g, maquinas]
+
+        # El tiempo de inicio es el MÁXIMO entre el fin de la operación anterior y la máquina libre
+        tiempo_inicio = np.maximum(tiemp_tareas[:, tarea], tiemp_maquinas[filas, maquinas])
+        tiempo_fin_actual = tiempo_inicio + duracion
+
+        tiemp_maquinas[filas, maquinas] = tiempo_fin_actual
+        tiemp_tareas[:, tarea] = tiempo_fin_actual
+
+    makespan = tiemp_maquinas.max(axis=1)
+    return np.column_stack((makespan, energia_consumida)), estados
+
+
+def evaluar_fitness_poblacion(poblacion_genes, mtx_op_t, mtx_op_e=None, l_tsk_oper=None, cache=None, evaluador=None):
+    """
+    Evalúa todos los cromosomas de una población en una sola pasada.
+
+    En lugar de decodificar un cromosoma a la vez, se avanzan los relojes de máquinas
+    y tareas de todos los individuos al mismo tiempo, una columna (operación) a la vez.
+    El resultado es idéntico al de llamar a `evaluar_fitness` por cada cromosoma.
+
+    Args:
+        poblacion_genes (list | numpy.ndarray): Matriz de enteros (individuos x operaciones)
+            con la máquina asignada a cada operación (base 1).
+        mtx_op_t (list | InstanciaProblema): matriz con la relación de operaciones-tiempo,
+            o una instancia compilada (en cuyo caso mtx_op_e y l_tsk_oper no se usan).
+        mtx_op_e (list): matriz con la relación de operaciones-energía
+        l_tsk_oper (list): lista con las operaciones de cada tarea
+        cache (CacheAptitud, opcional): Caché de evaluaciones; solo se decodifican los cromosomas que no están en ella.
+        evaluador (EvaluadorParalelo, opcional): Si se da, los cromosomas se decodifican con él (en paralelo)
+            en lugar de en este proceso. Debe corresponder a la misma instancia.
+
+    Returns:
+        numpy.ndarray: Matriz de tamaño (N, 2). La columna 0 es el makespan y la columna 1
+        el consumo total de energía de cada individuo.
+    """
+    instancia = compilar_instancia(mtx_op_t, mtx_op_e, l_tsk_oper)
+
+    genes = np.asarray(poblacion_genes, dtype=np.intp)
+    if genes.size == 0:
+        return np.empty((0, 2))
+    if genes.ndim == 1:
+        genes = genes.reshape(1, -1)
+    if evaluador is not None:
+        if cache is not None:
+            return cache.evaluar_lote(genes, evaluador.evaluar)
+        return evaluador.evaluar(genes)
+    if cache is not None:
+        return cache.evaluar_lote(genes, evaluar_fitness_poblacion, instancia)
+
+    return _simular_relojes_lote(genes, instancia)[0]
 
 
 # ----------------------- SELECCIÓN -----------------------
 
-def seleccion_por_torneo(poblacion, k, modo_optimizacion="minimize"):
+def seleccion_por_torneo(poblacion, k, modo_optimizacion="minimize", rango=None, crowding=None):
     """
     Selecciona padres mediante torneo, usando dominancia de Pareto.
 
@@ -127,10 +458,16 @@ def seleccion_por_torneo(poblacion, k, modo_optimizacion="minimize"):
         poblacion (list): La población actual. Formato: [[cromosoma], [fit1, fit2]].
         k (int): El tamaño del torneo.
         modo_optimizacion (str): "minimize" o "maximize", para la función de dominancia.
+        rango (array, opcional): Frente (0 = primero) de cada individuo. Si se da junto con `crowding`,
+            se usa el operador de comparación por crowding (ver `seleccion_por_torneo_crowding`).
+        crowding (array, opcional): Distancia de crowding de cada individuo.
 
     Returns:
         list: Una lista con los ÍNDICES de los individuos seleccionados como padres.
     """
+    if rango is not None and crowding is not None:
+        return seleccion_por_torneo_crowding(rango, crowding, k).tolist()
+
     padres_seleccionados = []
     num_selecciones = len(poblacion)
     
@@ -180,6 +517,47 @@ def seleccion_por_torneo(poblacion, k, modo_optimizacion="minimize"):
     return padres_seleccionados
 
 
+def seleccion_por_torneo_crowding(rango, crowding, k, n_padres=None, generador=None):
+    """
+    Torneo con el operador de comparación por crowding de NSGA-II, usando el rango y la
+    distancia de crowding que ya se calcularon en el reemplazo.
+
+    Todos los torneos se sortean de una vez como una matriz (n_padres, k) de índices (con
+    reemplazo). En cada fila gana el individuo de menor rango y, entre los de igual rango,
+    el de mayor distancia de crowding; si sigue el empate gana el primero sorteado.
+
+    Args:
+        rango (array): Frente (0 = primero) de cada individuo.
+        crowding (array): Distancia de crowding de cada individuo.
+        k (int): El tamaño del torneo.
+        n_padres (int, opcional): Número de padres a seleccionar. Por defecto, el tamaño de la población
+            (redondeado a par, como en `seleccion_por_torneo`).
+        generador (np.random.Generator, opcional): Generador de números aleatorios. Si es None se usa
+            el generador global de NumPy (np.random).
+
+    Returns:
+        np.ndarray: Arreglo con los ÍNDICES de los individuos seleccionados como padres.
+    """
+    rango = np.asarray(rango)
+    crowding = np.asarray(crowding, dtype=float)
+    n_individuos = len(rango)
+    if n_padres is None:
+        n_padres = n_individuos + n_individuos % 2
+    if n_individuos == 0 or n_padres == 0:
+        return np.empty(0, dtype=np.intp)
+
+    sortear = generador.integers if generador is not None else np.random.randint
+    participantes = sortear(0, n_individuos, size=(n_padres, k))
+
+    # Comparación lexicográfica vectorizada: (menor rango, mayor crowding)
+    rango_part = rango[participantes]
+    mejor_rango = rango_part.min(axis=1, keepdims=True)
+    crowding_part = np.where(rango_part == mejor_rango, crowding[participantes], -np.inf)
+    ganadores = crowding_part.argmax(axis=1)
+
+    return participantes[np.arange(n_padres), ganadores].astype(np.intp)
+
+
 
 # --------------------------------------- CRUZA ---------------------------------------------------
 def cruza_n_puntos(p1, p2, n_puntos):
@@ -238,7 +616,62 @@ def cruza_n_puntos(p1, p2, n_puntos):
     return h1, h2
 
 
-def crearHijos(pobl_padres, idx_padres, pCruza, nPtosCruza, mtx_op_t, mtx_op_e, l_tsks):
+def cruza_n_puntos_lote(genes_padres, parejas, pCruza, nPtosCruza, generador=None):
+    """
+    Cruza de n puntos aplicada a todas las parejas de padres a la vez.
+
+    Se sortean juntos la decisión de cruza de cada pareja y sus puntos de corte (distintos y
+    sin los extremos, igual que en `cruza_n_puntos`). Con los cortes se arma una máscara de
+    paridad de segmento: en los segmentos impares cada hijo toma los genes del otro padre, y
+    la matriz completa de hijos se construye con np.where.
+
+    Args:
+        genes_padres (np.ndarray): Matriz (individuos x genes) con los cromosomas.
+        parejas (np.ndarray): Arreglo (n_parejas, 2) con los índices de los dos padres de cada pareja.
+            También se acepta la lista plana de índices que regresa la selección (p1, p2, p1, p2, ...).
+        pCruza (float): Probabilidad de cruza de cada pareja; las parejas que no se cruzan no generan hijos,
+            como en `crearHijos`.
+        nPtosCruza (int): Número de puntos de corte.
+        generador (np.random.Generator, opcional): Generador de números aleatorios. Si es None se usa
+            el generador global de NumPy (np.random).
+
+    Returns:
+        hijos (np.ndarray): Matriz (2 * n_cruzadas, genes) con los hijos h1, h2 de cada pareja cruzada, en orden.
+        idx_cruzadas (np.ndarray): Índices (en `parejas`) de las parejas que se cruzaron.
+    """
+    genes_padres = np.asarray(genes_padres)
+    parejas = np.asarray(parejas, dtype=np.intp).reshape(-1, 2)
+    n_genes = genes_padres.shape[1]
+    if nPtosCruza < 1 or nPtosCruza >= n_genes:
+        raise ValueError("El número de puntos de cruce debe ser entre 1 y len(p1) - 1.")
+
+    aleatorio = generador.random if generador is not None else np.random.random_sample
+
+    # 1. Parejas que se cruzan
+    idx_cruzadas = np.flatnonzero(aleatorio(len(parejas)) <= pCruza)
+    n_cruzadas = len(idx_cruzadas)
+    if n_cruzadas == 0:
+        return np.empty((0, n_genes), dtype=genes_padres.dtype), idx_cruzadas
+    padres_1 = genes_padres[parejas[idx_cruzadas, 0]]
+    padres_2 = genes_padres[parejas[idx_cruzadas, 1]]
+
+    # 2. nPtosCruza cortes distintos por pareja en 1..n_genes-1: los menores de una fila de aleatorios
+    cortes = np.argpartition(aleatorio((n_cruzadas, n_genes - 1)), nPtosCruza - 1, axis=1)[:, :nPtosCruza] + 1
+
+    # 3. Máscara de paridad: el gen g está en el segmento (número de cortes <= g)
+    marcas = np.zeros((n_cruzadas, n_genes), dtype=np.int8)
+    marcas[np.arange(n_cruzadas)[:, None], cortes] = 1
+    segmento_impar = (np.cumsum(marcas, axis=1) % 2).astype(bool)
+
+    # 4. Hijos intercalados: h1, h2 de la primera pareja, h1, h2 de la segunda, ...
+    hijos = np.empty((2 * n_cruzadas, n_genes), dtype=genes_padres.dtype)
+    hijos[0::2] = np.where(segmento_impar, padres_2, padres_1)
+    hijos[1::2] = np.where(segmento_impar, padres_1, padres_2)
+    return hijos, idx_cruzadas
+
+
+def crearHijos(pobl_padres, idx_padres, pCruza, nPtosCruza, mtx_op_t, mtx_op_e=None, l_tsks=None, cache=None,
+               checkpoints=None, evaluador=None):
     """_summary_
 
     Args:
@@ -246,16 +679,23 @@ def crearHijos(pobl_padres, idx_padres, pCruza, nPtosCruza, mtx_op_t, mtx_op_e,
         idx_padres (list): Indice de los individuos que se cruzaran resultado del proceso de selección.
         pCruza (int): Porcentaje de cruza
         nPtosCruza (int): Numero de puntos para hacer la recombinación de cromosomas
-        mtx_op_t (list): matriz con la relación de operaciones-tiempo 
+        mtx_op_t (list | InstanciaProblema): matriz con la relación de operaciones-tiempo,
+            o una instancia compilada (en cuyo caso mtx_op_e y l_tsks no se usan)
         mtx_op_e (list): matriz con la relación de operaciones-energía
         l_tsks (list): lista con las tareas que se realizan
+        cache (CacheAptitud, opcional): Caché de evaluaciones. Si es None no se usa caché.
+        checkpoints (CacheAptitud, opcional): Almacén de checkpoints de decodificación. Si se da, cada hijo
+            se evalúa reanudando desde el checkpoint del padre con el que comparte el prefijo más largo.
+        evaluador (EvaluadorParalelo, opcional): Evaluador por lotes en paralelo. No se usa si se dan checkpoints,
+            porque la evaluación incremental ocurre en este proceso.
 
     Returns:
         hijos: list
               Lista con los hijos creados en el mismo formato que los padres
     """
     tam_poblacion = len(idx_padres)
-    hijos = [ ]
+    cromosomas_hijos = [ ]
+    padres_hijos = [ ]
     j = 0
     while j < tam_poblacion:
         idx_p1 = idx_padres[j]
@@ -265,15 +705,26 @@ def crearHijos(pobl_padres, idx_padres, pCruza, nPtosCruza, mtx_op_t, mtx_op_e,
             p2 = pobl_padres[idx_p2][0]
 
             h1_crom, h2_crom = cruza_n_puntos(p1, p2, nPtosCruza)
-            H1 = [h1_crom, evaluar_fitness(h1_crom, mtx_op_t, mtx_op_e, l_tsks)]
-            H2 = [h2_crom, evaluar_fitness(h2_crom, mtx_op_t, mtx_op_e, l_tsks)]
-            hijos.append(H1)
-            hijos.append(H2)
+            cromosomas_hijos.append(h1_crom)
+            cromosomas_hijos.append(h2_crom)
+            padres_hijos.append((p1, p2))
+            padres_hijos.append((p2, p1))
         j += 2
+
+    if checkpoints is not None:
+        # Evaluación incremental a partir de los checkpoints de los padres
+        instancia = compilar_instancia(mtx_op_t, mtx_op_e, l_tsks)
+        aptitudes = _evaluar_con_bases(cromosomas_hijos, padres_hijos, instancia, checkpoints, cache)
+    else:
+        # Todos los hijos de la generación se evalúan en un solo lote
+        aptitudes = evaluar_fitness_poblacion(cromosomas_hijos, mtx_op_t, mtx_op_e, l_tsks, cache=cache,
+                                              evaluador=evaluador)
+    hijos = [[crom, aptitud] for crom, aptitud in zip(cromosomas_hijos, aptitudes)]
     return hijos
 
 # ------------------------------------- MUTACION --------------------------------------
-def mutar_poblacion_por_desplazamiento(poblacion_hijos, porc_muta, mtx_op_t, mtx_op_e, l_tsks):
+def mutar_poblacion_por_desplazamiento(poblacion_hijos, porc_muta, mtx_op_t, mtx_op_e=None, l_tsks=None, cache=None,
+                                       checkpoints=None, evaluador=None):
     """
     Aplica la mutación por desplazamiento a una población de hijos.
 
@@ -281,12 +732,22 @@ def mutar_poblacion_por_desplazamiento(poblacion_hijos, porc_muta, mtx_op_t, mtx
         poblacion_hijos (list): La población de hijos a mutar.
                                 Formato: [[cromosoma], [fit1, fit2]].
         porc_muta (float): El porcentaje de mutación (ej. 0.05 para 5%).
+        mtx_op_t (list | InstanciaProblema): matriz con la relación de operaciones-tiempo,
+            o una instancia compilada (en cuyo caso mtx_op_e y l_tsks no se usan)
+        mtx_op_e (list): matriz con la relación de operaciones-energía
+        l_tsks (list): lista con las tareas que se realizan
+        cache (CacheAptitud, opcional): Caché de evaluaciones. Si es None no se usa caché.
+        checkpoints (CacheAptitud, opcional): Almacén de checkpoints de decodificación. Si se da, cada
+            mutante se evalúa reanudando desde el checkpoint del cromosoma antes de mutar.
+        evaluador (EvaluadorParalelo, opcional): Evaluador por lotes en paralelo. No se usa si se dan checkpoints.
 
     Returns:
         list: La misma lista de la población de hijos, con las mutaciones aplicadas.
     """
     counter = 0
-    for hijo in poblacion_hijos:
+    idx_mutados = [ ]
+    cromosomas_originales = [ ]
+    for idx_hijo, hijo in enumerate(poblacion_hijos):
         if random.uniform(0, 1) <= porc_muta:
             counter += 1
             
@@ -311,18 +772,110 @@ def mutar_poblacion_por_desplazamiento(poblacion_hijos, porc_muta, mtx_op_t, mtx
                 
                 # Se actualiza el cromosoma del hijo con su versión mutada
                 hijo[0] = cromosoma_mutado
-                hijo[1] = evaluar_fitness(hijo[0], mtx_op_t, mtx_op_e, l_tsks)
+                idx_mutados.append(idx_hijo)
+                cromosomas_originales.append((cromosoma,))
+
+    if idx_mutados and checkpoints is not None:
+        # Todo lo anterior al segmento desplazado no cambia: se reanuda desde el cromosoma original
+        instancia = compilar_instancia(mtx_op_t, mtx_op_e, l_tsks)
+        aptitudes = _evaluar_con_bases([poblacion_hijos[i][0] for i in idx_mutados], cromosomas_originales,
+                                       instancia, checkpoints, cache)
+        for i, aptitud in zip(idx_mutados, aptitudes):
+            poblacion_hijos[i][1] = aptitud
+
+    # Se re-evalúan únicamente los hijos mutados, todos en un solo lote
+    elif idx_mutados:
+        aptitudes = evaluar_fitness_poblacion([poblacion_hijos[i][0] for i in idx_mutados],
+                                              mtx_op_t, mtx_op_e, l_tsks, cache=cache, evaluador=evaluador)
+        for i, aptitud in zip(idx_mutados, aptitudes):
+            poblacion_hijos[i][1] = aptitud
     return poblacion_hijos
 
 
 
+def mutacion_desplazamiento_lote(genes, porc_muta, generador=None, en_sitio=False):
+    """
+    Mutación por desplazamiento aplicada a una matriz de cromosomas de una sola vez.
+
+    Para todo el bloque se sortean juntos qué filas mutan, el segmento [inicio, fin] de cada una
+    y la posición donde se reinserta (mismas reglas que `mutar_poblacion_por_desplazamiento`).
+    Cada mutación se expresa como una permutación de posiciones y se aplica con indexado
+    avanzado, sin construir listas intermedias. No se evalúa nada: con los índices de las filas
+    que cambiaron la evaluación se puede hacer por lotes o de forma incremental después.
+
+    Args:
+        genes (np.ndarray): Matriz (individuos x genes) con los cromosomas.
+        porc_muta (float): Probabilidad de mutación de cada fila.
+        generador (np.random.Generator, opcional): Generador de números aleatorios. Si es None se usa
+            el generador global de NumPy (np.random).
+        en_sitio (bool): Si es True se modifica `genes`; si no, se trabaja sobre una copia.
+
+    Returns:
+        genes_mutados (np.ndarray): Matriz con las mutaciones aplicadas.
+        idx_cambiados (np.ndarray): Índices de las filas cuyo contenido cambió. Una fila sorteada puede
+            quedar igual (por ejemplo, si el segmento se reinserta en su lugar) y entonces no se incluye.
+    """
+    genes = np.asarray(genes)
+    if not en_sitio:
+        genes = genes.copy()
+    n_individuos, n_genes = genes.shape
+    if n_genes < 2 or n_individuos == 0:
+        return genes, np.empty(0, dtype=np.intp)
+
+    aleatorio = generador.random if generador is not None else np.random.random_sample
+
+    # 1. Filas que mutan
+    idx_mutados = np.flatnonzero(aleatorio(n_individuos) <= porc_muta)
+    m = len(idx_mutados)
+    if m == 0:
+        return genes, idx_mutados
+
+    # 2. Segmento entre dos posiciones distintas y posición de reinserción en el resto
+    sorteos = aleatorio((m, 3))
+    a = (sorteos[:, 0] * n_genes).astype(np.intp)
+    b = (sorteos[:, 1] * (n_genes - 1)).astype(np.intp)
+    b += b >= a
+    inicio = np.minimum(a, b)[:, None]
+    largo = (np.abs(a - b) + 1)[:, None]
+    nueva_pos = (sorteos[:, 2] * (n_genes - largo[:, 0] + 1)).astype(np.intp)[:, None]
+
+    # 3. Permutación: resto[:nueva_pos] + segmento + resto[nueva_pos:]
+    posiciones = np.arange(n_genes)[None, :]
+    en_resto = np.where(posiciones < nueva_pos, posiciones, posiciones - largo)
+    fuente_resto = np.where(en_resto < inicio, en_resto, en_resto + largo)
+    en_segmento = (posiciones >= nueva_pos) & (posiciones < nueva_pos + largo)
+    fuente = np.where(en_segmento, inicio + posiciones - nueva_pos, fuente_resto)
+
+    originales = genes[idx_mutados]
+    mutados = np.take_along_axis(originales, fuente, axis=1)
+    cambiaron = np.any(mutados != originales, axis=1)
+
+    idx_cambiados = idx_mutados[cambiaron]
+    genes[idx_cambiados] = mutados[cambiaron]
+    return genes, idx_cambiados
+
+
 # ------------------------------- REEMPLAZO ---------------------------
-def nueva_poblacion(poblacion_combinada, tam_poblacion):
+def nueva_poblacion(poblacion_combinada, tam_poblacion, por_crowding=False):
+    """
+    Reemplazo de NSGA-II: frentes completos y, en el frente de corte, los de mayor distancia de crowding.
+
+    Con `por_crowding` también se regresan el rango (0 = primer frente) y la distancia de crowding
+    de cada sobreviviente, para el torneo de `seleccion_por_torneo(..., rango=, crowding=)`. El
+    crowding del frente de corte es el mismo que decidió el corte; el de los frentes completos se
+    calcula sobre cada frente.
 
+    Returns:
+        tuple: (nueva_poblacion, frentes, vectores_crowding, idx_frente_corte) y, con `por_crowding`,
+        además (rango, crowding).
+    """
     nueva_poblacion = [ ]
+    rango = [ ]
+    crowding = [ ]
     poblacion_comb_fitness = [ ]
     contador_poblacion = 0
     idx_frente_corte = 0
+    vec_crowding = [ ]   # Se queda vacío si los frentes completos llenan la población exactamente
     for i in range(len(poblacion_combinada)):
         poblacion_comb_fitness.append(poblacion_combinada[i][1])
     
@@ -333,13 +886,21 @@ def nueva_poblacion(poblacion_combinada, tam_poblacion):
         if contador_poblacion + len(frente) <= tam_poblacion:
             for j in frente:
                 nueva_poblacion.append(poblacion_combinada[j])
+            if por_crowding:
+                rango.extend([idx_frente_corte] * len(frente))
+                crowding.extend(crowding_distance(frentes_P[idx_frente_corte]))
             contador_poblacion = contador_poblacion + len(frente)
             idx_frente_corte += 1
         else:  # ---> Aplicar el criterio de la distancia de crowding
             idx_frente_corte # El frente que ya no se sumó
             # ---> Aplicando distancia de crowding:
             #print(f"Se le está pasando a la función: {frentes_P[idx_frente_corte]}")
-            vec_crowding, vec_crowding_idxs= sobrevivientes_dist_crowding(frentes_P[idx_frente_corte], tam_poblacion-contador_poblacion)
+            distancias = crowding_distance(frentes_P[idx_frente_corte])
+            vec_crowding_idxs = indices_mayor_crowding(distancias, tam_poblacion-contador_poblacion)
+            vec_crowding = [frentes_P[idx_frente_corte][i] for i in vec_crowding_idxs]
+            if por_crowding:
+                rango.extend([idx_frente_corte] * len(vec_crowding_idxs))
+                crowding.extend(distancias[vec_crowding_idxs])
             for indice in vec_crowding_idxs:
                 indice_real = frentes_P_idxs[idx_frente_corte][indice]
                 #print(f"El valor de índice real es: {indice_real}")
@@ -347,4 +908,7 @@ def nueva_poblacion(poblacion_combinada, tam_poblacion):
                 nueva_poblacion.append(poblacion_combinada[indice_real])
             break
     #print(f"Se completo la seleccion, el tamaño de la población nueva es : {len(nueva_poblacion)}")
+    if por_crowding:
+        return (nueva_poblacion, frentes_P, vec_crowding, idx_frente_corte+1,
+                np.array(rango, dtype=np.int32), np.array(crowding, dtype=float))
     return nueva_poblacion, frentes_P, vec_crowding, idx_frente_corte+1
@@ -0,0 +1,340 @@
+#####################################################################################################
+#       archivo_pareto.py
+#       Archivo externo de soluciones no dominadas, acotado, respaldado por un ND-tree.
+#           El reemplazo elitista de NSGA-II puede descartar soluciones del primer frente al truncar
+#           por crowding; el archivo conserva todas las no dominadas que se han evaluado.
+#           - ND-tree (Jaszkiewicz y Lust, 2018): cada nodo guarda el ideal y el nadir aproximados
+#             de sus puntos, así que regiones enteras se aceptan o descartan con dos comparaciones.
+#           - Si se supera la capacidad se elimina el punto con menor contribución al hipervolumen.
+#       Los vectores se guardan como tuplas: con 2 o 3 objetivos las comparaciones de Python puro son
+#       mucho más rápidas que las operaciones de NumPy sobre arreglos tan pequeños.
+#####################################################################################################
+
+from operator import le
+
+import numpy as np
+
+from hipervolumen import contribuciones_hipervolumen
+
+
+def _menor_igual(a, b):
+    """True si a <= b en todos los objetivos (a domina débilmente a b)."""
+    return all(map(le, a, b))
+
+
+# ------------------------------ ESTRUCTURAS DEL ND-TREE ------------------------------
+class _Entrada:
+    """Una solución del archivo: vector de aptitud (tupla), cromosoma y hoja del árbol que la contiene."""
+
+    __slots__ = ("aptitud", "cromosoma", "hoja")
+
+    def __init__(self, aptitud, cromosoma):
+        self.aptitud = aptitud
+        self.cromosoma = cromosoma
+        self.hoja = None
+
+
+class _Nodo:
+    """
+    Nodo del ND-tree. Las hojas guardan entradas y los nodos internos guardan hijos.
+
+    `ideal` y `nadir` acotan a todos los puntos del subárbol. Al eliminar puntos no se recalculan:
+    las cotas siguen siendo válidas (solo se vuelven más holgadas), que es lo que necesitan las
+    pruebas de dominancia.
+    """
+
+    __slots__ = ("ideal", "nadir", "entradas", "hijos", "padre")
+
+    def __init__(self, padre=None):
+        self.ideal = None
+        self.nadir = None
+        self.entradas = [ ]
+        self.hijos = [ ]
+        self.padre = padre
+
+    @property
+    def es_hoja(self):
+        return not self.hijos
+
+    def ampliar(self, punto):
+        if self.ideal is None:
+            self.ideal = self.nadir = punto
+        else:
+            self.ideal = tuple(map(min, self.ideal, punto))
+            self.nadir = tuple(map(max, self.nadir, punto))
+
+    def distancia_al_centro(self, punto):
+        return sum(((i + n) / 2 - p) ** 2 for i, n, p in zip(self.ideal, self.nadir, punto))
+
+
+# ------------------------------ ARCHIVO ------------------------------
+class ArchivoPareto:
+    """
+    Archivo externo de soluciones no dominadas (minimización).
+
+        archivo = ArchivoPareto(capacidad=200)
+        motor = MotorNSGAII(..., archivo=archivo)
+        motor.ejecutar()
+        graficar_archivo_pareto(archivo, motor.poblacion)
+
+    Cada individuo evaluado se ofrece con `agregar`; se inserta si ningún punto del archivo lo
+    domina (o es igual a él) y se eliminan los puntos que domina. Las pruebas de dominancia
+    recorren solo los nodos del ND-tree cuya caja [ideal, nadir] puede interactuar con el punto.
+
+    Si se indica `capacidad`, al superarla se elimina el punto con menor contribución exclusiva al
+    hipervolumen. Los extremos de cada objetivo nunca se eliminan. Con dos objetivos las
+    contribuciones salen de los vecinos en un solo ordenamiento; con más, se calculan con WFG y la
+    poda es bastante más costosa.
+
+    Atributos:
+    ----------
+    n_ofrecidos : int
+        Vectores ofrecidos al archivo.
+    n_insertados : int
+        Vectores que entraron al archivo (aunque después se hayan eliminado).
+    n_podados : int
+        Vectores eliminados por la cota de capacidad.
+    """
+
+    def __init__(self, capacidad=None, tam_hoja=20, n_hijos=None):
+        """
+        Parámetros:
+        -----------
+        capacidad : int | None
+            Número máximo de soluciones. None para un archivo sin cota.
+        tam_hoja : int
+            Máximo de entradas en una hoja antes de dividirla.
+        n_hijos : int | None
+            Hijos que se crean al dividir una hoja (por defecto, número de objetivos + 1).
+        """
+        if capacidad is not None and capacidad < 2:
+            raise ValueError("La capacidad del archivo debe ser de al menos 2 soluciones.")
+        self.capacidad = capacidad
+        self.tam_hoja = tam_hoja
+        self.n_hijos = n_hijos
+        self._raiz = _Nodo()
+        # Entradas por identidad, en orden de inserción (para recorrer y podar sin bajar por el árbol)
+        self._entradas = {}
+        self.n_ofrecidos = 0
+        self.n_insertados = 0
+        self.n_podados = 0
+
+    # ------------------------------ Inserción ------------------------------
+    def agregar(self, aptitud, cromosoma=None):
+        """
+        Ofrece un vector de aptitud (y su cromosoma) al archivo.
+
+        Returns:
+            bool: True si el vector entró al archivo.
+        """
+        self.n_ofrecidos += 1
+        punto = tuple(map(float, aptitud))
+        if self._entradas and not self._actualizar(self._raiz, punto):
+            return False
+
+        entrada = _Entrada(punto, None if cromosoma is None else list(cromosoma))
+        self._insertar(self._raiz, entrada)
+        self._entradas[id(entrada)] = entrada
+        self.n_insertados += 1
+
+        if self.capacidad is not None and len(self._entradas) > self.capacidad:
+            self._podar()
+        return id(entrada) in self._entradas
+
+    def agregar_poblacion(self, poblacion):
+        """
+        Ofrece una población con el formato [[cromosoma], [f1, f2]]. Regresa cuántos entraron.
+
+        Antes de tocar el árbol se descartan, con una sola comparación vectorizada, los individuos
+        dominados dentro del mismo lote: nunca podrían quedar en el archivo.
+        """
+        if not poblacion:
+            return 0
+        aptitud = np.array([individuo[1] for individuo in poblacion], dtype=float)
+        menor_igual = np.all(aptitud[:, None, :] <= aptitud[None, :, :], axis=2)
+        menor = np.any(aptitud[:, None, :] < aptitud[None, :, :], axis=2)
+        candidatos = np.flatnonzero(~np.any(menor_igual & menor, axis=0))
+
+        self.n_ofrecidos += len(poblacion) - len(candidatos)
+        return sum(self.agregar(poblacion[i][1], poblacion[i][0]) for i in candidatos)
+
+    def _actualizar(self, nodo, punto):
+        """
+        Elimina del subárbol los puntos dominados por `punto`.
+
+        Returns:
+            bool: False si algún punto del subárbol domina o es igual a `punto` (se rechaza).
+        """
+        if _menor_igual(nodo.nadir, punto):
+            # Todos los puntos del nodo dominan (o igualan) al nuevo punto
+            return False
+        if _menor_igual(punto, nodo.ideal):
+            # El nuevo punto domina a todos los puntos del nodo
+            self._eliminar_nodo(nodo)
+            return True
+        if not (_menor_igual(punto, nodo.nadir) or _menor_igual(nodo.ideal, punto)):
+            # La caja del nodo no puede dominar ni ser dominada por el punto
+            return True
+
+        if nodo.es_hoja:
+            conservar = [ ]
+            for entrada in nodo.entradas:
+                if _menor_igual(entrada.aptitud, punto):
+                    return False
+                if _menor_igual(punto, entrada.aptitud):
+                    del self._entradas[id(entrada)]
+                else:
+                    conservar.append(entrada)
+            nodo.entradas = conservar
+            if not conservar:
+                self._eliminar_nodo(nodo)
+            return True
+
+        for hijo in list(nodo.hijos):
+            if not self._actualizar(hijo, punto):
+                return False
+        return True
+
+    def _insertar(self, nodo, entrada):
+        while True:
+            nodo.ampliar(entrada.aptitud)
+            if nodo.es_hoja:
+                break
+            # Se baja por el hijo cuyo centro está más cerca del punto
+            nodo = min(nodo.hijos, key=lambda hijo: hijo.distancia_al_centro(entrada.aptitud))
+
+        nodo.entradas.append(entrada)
+        entrada.hoja = nodo
+        if len(nodo.entradas) > self.tam_hoja:
+            self._dividir(nodo)
+
+    def _dividir(self, hoja):
+        """Reparte las entradas de una hoja llena entre nuevos hijos agrupados por cercanía."""
+        puntos = np.array([entrada.aptitud for entrada in hoja.entradas])
+        n_hijos = min(self.n_hijos or puntos.shape[1] + 1, len(puntos))
+
+        # Semillas: el punto más alejado del resto y, después, el más alejado de las semillas elegidas
+        distancias = np.sqrt(((puntos[:, None, :] - puntos[None, :, :]) ** 2).sum(axis=2))
+        semillas = [int(np.argmax(distancias.mean(axis=1)))]
+        while len(semillas) < n_hijos:
+            semillas.append(int(np.argmax(distancias[:, semillas].min(axis=1))))
+        grupo = np.argmin(distancias[:, semillas], axis=1)
+
+        entradas = hoja.entradas
+        hoja.entradas = [ ]
+        hoja.hijos = [_Nodo(hoja) for _ in semillas]
+        for entrada, indice in zip(entradas, grupo):
+            hijo = hoja.hijos[indice]
+            hijo.ampliar(entrada.aptitud)
+            hijo.entradas.append(entrada)
+            entrada.hoja = hijo
+
+    def _eliminar_nodo(self, nodo):
+        """Quita un nodo (y todo su subárbol) del árbol y sus entradas del archivo."""
+        pendientes = [nodo]
+        while pendientes:
+            actual = pendientes.pop()
+            for entrada in actual.entradas:
+                self._entradas.pop(id(entrada), None)
+            pendientes.extend(actual.hijos)
+        self._desligar(nodo)
+
+    def _desligar(self, nodo):
+        padre = nodo.padre
+        if padre is None:
+            # Es la raíz: se deja vacía
+            nodo.entradas, nodo.hijos = [ ], [ ]
+            nodo.ideal = nodo.nadir = None
+            return
+        padre.hijos.remove(nodo)
+        if not padre.hijos:
+            # Un nodo interno sin hijos también se elimina
+            self._desligar(padre)
+
+    # ------------------------------ Poda por hipervolumen ------------------------------
+    def _contribuciones(self, puntos):
+        """Contribución de cada punto al hipervolumen; los extremos reciben infinito."""
+        if puntos.shape[1] == 2:
+            orden = np.argsort(puntos[:, 0], kind="stable")
+            x, y = puntos[orden, 0], puntos[orden, 1]
+            contribucion_ordenada = np.full(len(puntos), np.inf)
+            contribucion_ordenada[1:-1] = (x[2:] - x[1:-1]) * (y[:-2] - y[1:-1])
+            contribuciones = np.empty(len(puntos))
+            contribuciones[orden] = contribucion_ordenada
+            return contribuciones
+
+        rango = puntos.max(axis=0) - puntos.min(axis=0)
+        referencia = puntos.max(axis=0) + 0.1 * np.where(rango > 0, rango, 1.0)
+        contribuciones = contribuciones_hipervolumen(puntos, referencia)
+        contribuciones[np.argmin(puntos, axis=0)] = np.inf
+        return contribuciones
+
+    def _podar(self):
+        entradas = list(self._entradas.values())
+        puntos = np.array([entrada.aptitud for entrada in entradas])
+        while len(entradas) > self.capacidad:
+            indice = int(np.argmin(self._contribuciones(puntos)))
+            self._quitar_entrada(entradas.pop(indice))
+            puntos = np.delete(puntos, indice, axis=0)
+            self.n_podados += 1
+
+    def _quitar_entrada(self, entrada):
+        del self._entradas[id(entrada)]
+        hoja = entrada.hoja
+        hoja.entradas.remove(entrada)
+        if not hoja.entradas:
+            self._desligar(hoja)
+
+    # ------------------------------ Integración con el motor ------------------------------
+    def conectar(self, motor):
+        """Ofrece al archivo la población inicial y todos los hijos evaluados por el motor."""
+        motor.registrar("al_iniciar", lambda _motor: self.agregar_poblacion(_motor.poblacion))
+        motor.registrar("al_evaluar", lambda _motor, hijos: self.agregar_poblacion(hijos))
+        return self
+
+    # ------------------------------ Resultados ------------------------------
+    def __len__(self):
+        return len(self._entradas)
+
+    def __iter__(self):
+        return iter(self.soluciones)
+
+    @property
+    def aptitudes(self):
+        """Vectores de aptitud del archivo, ordenados por el primer objetivo. Forma (n, M)."""
+        if not self._entradas:
+            return np.empty((0, 0))
+        puntos = np.array([entrada.aptitud for entrada in self._entradas.values()])
+        return puntos[np.lexsort(puntos.T[::-1])]
+
+    @property
+    def soluciones(self):
+        """Soluciones del archivo con el formato de la población: [[cromosoma], [f1, f2]]."""
+        entradas = sorted(self._entradas.values(), key=lambda entrada: entrada.aptitud)
+        return [[entrada.cromosoma, np.array(entrada.aptitud)] for entrada in entradas]
+
+    def __repr__(self):
+        return f"ArchivoPareto(n={len(self)}, capacidad={self.capacidad}, n_ofrecidos={self.n_ofrecidos})"
+
+    # ------------------------------ Estado (checkpoints) ------------------------------
+    def estado(self):
+        """Estado del archivo como diccionario de arreglos (ver `checkpoint.py`)."""
+        entradas = list(self._entradas.values())
+        estado = {
+            "aptitud": np.array([entrada.aptitud for entrada in entradas]),
+            "contadores": np.array([self.n_ofrecidos, self.n_insertados, self.n_podados]),
+        }
+        if entradas and all(entrada.cromosoma is not None for entrada in entradas):
+            estado["genes"] = np.array([entrada.cromosoma for entrada in entradas])
+        return estado
+
+    def cargar_estado(self, estado):
+        """Reconstruye el archivo a partir de un diccionario generado por `estado()`."""
+        self._raiz = _Nodo()
+        self._entradas = {}
+        genes = estado.get("genes")
+        for i, aptitud in enumerate(estado["aptitud"]):
+            entrada = _Entrada(tuple(map(float, aptitud)), None if genes is None else genes[i].tolist())
+            self._insertar(self._raiz, entrada)
+            self._entradas[id(entrada)] = entrada
+        self.n_ofrecidos, self.n_insertados, self.n_podados = (int(x) for x in estado["contadores"])
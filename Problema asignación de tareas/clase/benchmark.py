@@ -0,0 +1,253 @@
+#####################################################################################################
+#       benchmark.py
+#       Benchmarks repetibles de las partes críticas del algoritmo genético (sin notebook).
+#           Mide evaluar_fitness, fast_non_dominated_sort, crowding_distance, selección, cruza,
+#           mutación y generaciones completas con varios tamaños de población e instancia.
+#           Reporta percentiles por etapa y evaluaciones por segundo, y guarda una línea base en
+#           JSON para comparar versiones.
+#
+#       Uso:
+#           python benchmark.py --poblaciones 50 150 --instancias practica 20x10x6 --guardar base.json
+#           python benchmark.py --poblaciones 50 150 --instancias practica 20x10x6 --comparar base.json
+#####################################################################################################
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from datos_transformacion import cargar_instancia
+from generador_instancias import generar_instancia
+from instancia import compilar_instancia
+from NSGAII import fast_non_dominated_sort, crowding_distance
+from algoritmo_genetico import (generar_poblacion_inicial, evaluar_fitness, evaluar_fitness_poblacion,
+                                seleccion_por_torneo, cruza_n_puntos, mutar_poblacion_por_desplazamiento,
+                                mutacion_desplazamiento_lote)
+from motor_nsga2 import MotorNSGAII
+
+VERSION_FORMATO = 1
+PERCENTILES = (50, 90, 99)
+ETAPAS = ("evaluar_fitness", "evaluar_fitness_poblacion", "fast_non_dominated_sort", "crowding_distance",
+          "seleccion_por_torneo", "cruza_n_puntos", "mutacion_desplazamiento_lote",
+          "mutar_poblacion_por_desplazamiento", "generacion")
+
+_DIR_DATOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datos_practica")
+
+
+# ------------------------------ INSTANCIAS ------------------------------
+def cargar_instancia_benchmark(nombre):
+    """
+    "practica" carga los datos de `datos_practica`; "TxOxM" genera una instancia sintética con
+    T tareas, O operaciones y M máquinas.
+    """
+    if nombre == "practica":
+        return cargar_instancia(_DIR_DATOS, cache=False)
+    try:
+        n_tareas, n_operaciones, n_maquinas = (int(x) for x in nombre.lower().split("x"))
+    except ValueError:
+        raise ValueError(f"Instancia no reconocida: {nombre}. Use 'practica' o 'TxOxM' (por ejemplo 20x10x6).")
+    return generar_instancia(n_tareas, n_operaciones, n_maquinas, semilla=0)
+
+
+# ------------------------------ MEDICIÓN ------------------------------
+def medir(funcion, preparar=None, repeticiones=20, calentamiento=2):
+    """
+    Mide `funcion(*preparar())` varias veces. `preparar` no se incluye en la medición
+    (por ejemplo, para copiar una población que la función modifica en su lugar).
+
+    Returns:
+        np.ndarray: Segundos de cada repetición medida.
+    """
+    tiempos = np.empty(repeticiones)
+    for i in range(calentamiento + repeticiones):
+        argumentos = preparar() if preparar is not None else ()
+        inicio = time.perf_counter()
+        funcion(*argumentos)
+        transcurrido = time.perf_counter() - inicio
+        if i >= calentamiento:
+            tiempos[i - calentamiento] = transcurrido
+    return tiempos
+
+
+def resumir(tiempos, n_evaluaciones=0):
+    """Percentiles (en milisegundos) y evaluaciones por segundo de una serie de tiempos."""
+    resumen = {"min_ms": float(tiempos.min() * 1e3), "media_ms": float(tiempos.mean() * 1e3)}
+    for p, valor in zip(PERCENTILES, np.percentile(tiempos, PERCENTILES)):
+        resumen[f"p{p}_ms"] = float(valor * 1e3)
+    mediana = float(np.median(tiempos))
+    resumen["evaluaciones_por_segundo"] = n_evaluaciones / mediana if n_evaluaciones and mediana > 0 else None
+    return resumen
+
+
+def _copiar_poblacion(poblacion):
+    return [[list(individuo[0]), individuo[1]] for individuo in poblacion]
+
+
+def medir_etapas(nombre_instancia, tam_poblacion, repeticiones=20, calentamiento=2, semilla=0, etapas=ETAPAS,
+                 p_cruza=0.7, n_puntos_cruza=3, p_mutacion=0.3, k_torneo=2):
+    """
+    Mide cada etapa para una instancia y un tamaño de población.
+
+    Returns:
+        list: Un diccionario por etapa con los tiempos resumidos.
+    """
+    instancia = compilar_instancia(*cargar_instancia_benchmark(nombre_instancia))
+    random.seed(semilla)
+    np.random.seed(semilla)
+
+    poblacion = generar_poblacion_inicial(tam_poblacion, instancia.n_genes, instancia)
+    combinada = poblacion + generar_poblacion_inicial(tam_poblacion, instancia.n_genes, instancia)
+    cromosomas = [individuo[0] for individuo in poblacion]
+    aptitudes_combinada = [np.asarray(individuo[1]) for individuo in combinada]
+    genes = np.array(cromosomas)
+    n_parejas = tam_poblacion // 2
+
+    casos = {
+        "evaluar_fitness": (lambda: [evaluar_fitness(c, instancia) for c in cromosomas], None, tam_poblacion),
+        "evaluar_fitness_poblacion": (lambda: evaluar_fitness_poblacion(cromosomas, instancia), None, tam_poblacion),
+        "fast_non_dominated_sort": (lambda: fast_non_dominated_sort(aptitudes_combinada), None, 0),
+        "crowding_distance": (lambda: crowding_distance(aptitudes_combinada), None, 0),
+        "seleccion_por_torneo": (lambda: seleccion_por_torneo(poblacion, k_torneo, "minimize"), None, 0),
+        "cruza_n_puntos": (lambda: [cruza_n_puntos(cromosomas[2 * i], cromosomas[2 * i + 1], n_puntos_cruza)
+                                    for i in range(n_parejas)], None, 0),
+        "mutacion_desplazamiento_lote": (lambda: mutacion_desplazamiento_lote(genes, p_mutacion), None, 0),
+        "mutar_poblacion_por_desplazamiento": (
+            lambda hijos: mutar_poblacion_por_desplazamiento(hijos, p_mutacion, instancia),
+            lambda: (_copiar_poblacion(poblacion),), 0),
+    }
+
+    resultados = [ ]
+    for etapa in etapas:
+        if etapa == "generacion":
+            motor = MotorNSGAII(instancia, tam_poblacion=tam_poblacion, p_cruza=p_cruza,
+                                n_puntos_cruza=n_puntos_cruza, p_mutacion=p_mutacion, k_torneo=k_torneo,
+                                semilla=semilla)
+            motor.inicializar()
+            anteriores = motor.n_evaluaciones
+            tiempos = medir(motor.paso, repeticiones=repeticiones, calentamiento=calentamiento)
+            # Evaluaciones por generación, con los mutantes re-evaluados (promedio de todas las generaciones ejecutadas)
+            n_evaluaciones = (motor.n_evaluaciones - anteriores) / (repeticiones + calentamiento)
+        else:
+            funcion, preparar, n_evaluaciones = casos[etapa]
+            tiempos = medir(funcion, preparar, repeticiones, calentamiento)
+        resultado = {"etapa": etapa, "instancia": nombre_instancia, "tam_poblacion": tam_poblacion,
+                     "n_genes": int(instancia.n_genes), "repeticiones": repeticiones}
+        resultado.update(resumir(tiempos, n_evaluaciones))
+        resultados.append(resultado)
+    return resultados
+
+
+def ejecutar_benchmarks(instancias, poblaciones, repeticiones=20, calentamiento=2, semilla=0, etapas=ETAPAS,
+                        mostrar=True):
+    """Ejecuta todas las combinaciones instancia x población. Regresa el diccionario que se guarda en JSON."""
+    resultados = [ ]
+    for nombre_instancia in instancias:
+        for tam_poblacion in poblaciones:
+            nuevos = medir_etapas(nombre_instancia, tam_poblacion, repeticiones, calentamiento, semilla, etapas)
+            resultados.extend(nuevos)
+            if mostrar:
+                imprimir_tabla(nuevos)
+    return {"version_formato": VERSION_FORMATO, "metadatos": metadatos(), "resultados": resultados}
+
+
+def metadatos():
+    """Datos del entorno para poder interpretar una línea base guardada."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {"fecha": time.strftime("%Y-%m-%d %H:%M:%S"), "python": platform.python_version(),
+            "numpy": np.__version__, "plataforma": platform.platform(), "procesador": platform.processor(),
+            "n_cpus": os.cpu_count(), "commit": commit}
+
+
+# ------------------------------ REPORTES ------------------------------
+def imprimir_tabla(resultados):
+    columnas = ["p50_ms", "p90_ms", "p99_ms"]
+    print(f"\n{'etapa':<36}{'instancia':>12}{'N':>6}" + "".join(f"{c:>11}" for c in columnas) + f"{'eval/s':>12}")
+    for r in resultados:
+        eval_s = f"{r['evaluaciones_por_segundo']:>12.0f}" if r["evaluaciones_por_segundo"] else f"{'-':>12}"
+        print(f"{r['etapa']:<36}{r['instancia']:>12}{r['tam_poblacion']:>6}"
+              + "".join(f"{r[c]:>11.3f}" for c in columnas) + eval_s)
+
+
+def _clave(resultado):
+    return resultado["etapa"], resultado["instancia"], resultado["tam_poblacion"]
+
+
+def comparar_resultados(base, actual, tolerancia=0.10, mostrar=True):
+    """
+    Compara la mediana de cada etapa contra una línea base.
+
+    Args:
+        base, actual (dict): Diccionarios de `ejecutar_benchmarks` (o leídos del JSON).
+        tolerancia (float): Aumento relativo de la mediana que se considera regresión.
+
+    Returns:
+        list: Tuplas (etapa, instancia, tam_poblacion, razon) de las etapas que empeoraron.
+    """
+    anteriores = {_clave(r): r for r in base["resultados"]}
+    regresiones = [ ]
+    if mostrar:
+        print(f"\n{'etapa':<36}{'instancia':>12}{'N':>6}{'base p50':>11}{'actual p50':>12}{'razón':>8}")
+    for r in actual["resultados"]:
+        anterior = anteriores.get(_clave(r))
+        if anterior is None:
+            continue
+        razon = r["p50_ms"] / anterior["p50_ms"] if anterior["p50_ms"] > 0 else float("inf")
+        regresion = razon > 1 + tolerancia
+        if regresion:
+            regresiones.append((*_clave(r), razon))
+        if mostrar:
+            marca = "  REGRESIÓN" if regresion else ("  mejora" if razon < 1 - tolerancia else "")
+            print(f"{r['etapa']:<36}{r['instancia']:>12}{r['tam_poblacion']:>6}"
+                  f"{anterior['p50_ms']:>11.3f}{r['p50_ms']:>12.3f}{razon:>8.2f}{marca}")
+    return regresiones
+
+
+# ------------------------------ LÍNEA DE COMANDOS ------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del algoritmo genético (NSGA-II).")
+    parser.add_argument("--instancias", nargs="+", default=["practica"],
+                        help="'practica' o instancias sintéticas 'TxOxM' (tareas x operaciones x máquinas).")
+    parser.add_argument("--poblaciones", nargs="+", type=int, default=[50, 150])
+    parser.add_argument("--etapas", nargs="+", default=list(ETAPAS), choices=ETAPAS)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--calentamiento", type=int, default=2)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--guardar", metavar="JSON", help="Guarda los resultados como línea base.")
+    parser.add_argument("--comparar", metavar="JSON", help="Compara contra una línea base guardada.")
+    parser.add_argument("--tolerancia", type=float, default=0.10,
+                        help="Aumento relativo de la mediana que cuenta como regresión (por defecto 0.10).")
+    args = parser.parse_args(argv)
+    for nombre in args.instancias:
+        try:
+            cargar_instancia_benchmark(nombre)
+        except (ValueError, OSError) as error:
+            parser.error(str(error))
+
+    resultados = ejecutar_benchmarks(args.instancias, args.poblaciones, args.repeticiones, args.calentamiento,
+                                     args.semilla, args.etapas)
+    if args.guardar:
+        with open(args.guardar, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+        print(f"\nLínea base guardada en {args.guardar}")
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)
+        regresiones = comparar_resultados(base, resultados, args.tolerancia)
+        if regresiones:
+            print(f"\n{len(regresiones)} etapa(s) con regresión mayor a {args.tolerancia:.0%}.")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+#####################################################################################################
+#       cache_aptitud.py
+#       Caché opcional de evaluaciones de aptitud con desalojo LRU.
+#           La clave es el contenido binario del cromosoma, de modo que un genotipo que
+#           reaparece (por cruza o mutación) no se vuelve a evaluar.
+#####################################################################################################
+
+from collections import OrderedDict
+import numpy as np
+
+
+def _copiar(aptitud):
+    return aptitud.copy() if isinstance(aptitud, np.ndarray) else aptitud
+
+
+class CacheAptitud:
+    """
+    Caché acotada de aptitudes con política LRU (se desaloja el menos usado recientemente).
+
+    Una caché corresponde a UNA función de aptitud con UNOS datos fijos (por ejemplo, una
+    instancia del problema). No se debe compartir entre instancias distintas, porque la clave
+    solo depende del cromosoma.
+
+    Atributos:
+    ----------
+    tam_maximo : int
+        Número máximo de cromosomas guardados.
+    aciertos : int
+        Número de consultas que encontraron el cromosoma en la caché.
+    fallos : int
+        Número de consultas que tuvieron que evaluar el cromosoma.
+    """
+
+    def __init__(self, tam_maximo=10000):
+        if tam_maximo < 1:
+            raise ValueError("El tamaño máximo de la caché debe ser al menos 1.")
+        self.tam_maximo = tam_maximo
+        self.aciertos = 0
+        self.fallos = 0
+        self._datos = OrderedDict()
+
+    # ------------------------------ Claves ------------------------------
+    @staticmethod
+    def clave(cromosoma):
+        """
+        Regresa los bytes que identifican a un cromosoma.
+
+        Los cromosomas enteros (listas de int, arreglos int8/int16/int64, ...) se normalizan
+        a int64 para que el mismo genotipo tenga la misma clave sin importar cómo se guardó.
+        """
+        arreglo = np.asarray(cromosoma)
+        if arreglo.dtype.kind in "biu":
+            arreglo = arreglo.astype(np.int64, copy=False)
+        arreglo = np.ascontiguousarray(arreglo)
+        return arreglo.dtype.str.encode() + arreglo.tobytes()
+
+    # --------------------------- Consulta y guardado ---------------------------
+    def obtener(self, cromosoma, default=None):
+        """Regresa la aptitud guardada (y la marca como usada) o `default` si no existe. No cuenta aciertos."""
+        clave = self.clave(cromosoma)
+        if clave not in self._datos:
+            return default
+        self._datos.move_to_end(clave)
+        return self._datos[clave]
+
+    def guardar(self, cromosoma, aptitud):
+        """Guarda la aptitud de un cromosoma, desalojando el menos usado si se rebasa el tamaño máximo."""
+        self._guardar_clave(self.clave(cromosoma), aptitud)
+
+    def _guardar_clave(self, clave, aptitud):
+        self._datos[clave] = aptitud
+        self._datos.move_to_end(clave)
+        while len(self._datos) > self.tam_maximo:
+            self._datos.popitem(last=False)
+
+    def evaluar(self, cromosoma, funcion_fitness, *args, **kwargs):
+        """
+        Regresa la aptitud del cromosoma, evaluándola con `funcion_fitness` solo si no está en la caché.
+
+        Parámetros:
+        -----------
+        cromosoma : list | np.ndarray
+            Cromosoma a evaluar.
+        funcion_fitness : function
+            Se llama como funcion_fitness(cromosoma, *args, **kwargs).
+
+        Retorna:
+        --------
+        Una copia de la aptitud guardada, para que los individuos repetidos no compartan (ni
+        modifiquen) el mismo arreglo.
+        """
+        clave = self.clave(cromosoma)
+        if clave in self._datos:
+            self.aciertos += 1
+            self._datos.move_to_end(clave)
+            return _copiar(self._datos[clave])
+
+        self.fallos += 1
+        aptitud = funcion_fitness(cromosoma, *args, **kwargs)
+        self._guardar_clave(clave, aptitud)
+        return _copiar(aptitud)
+
+    def evaluar_lote(self, cromosomas, funcion_lote, *args, **kwargs):
+        """
+        Evalúa un conjunto de cromosomas; solo los que no están en la caché se pasan a `funcion_lote`.
+
+        Parámetros:
+        -----------
+        cromosomas : list | np.ndarray
+            Lista o matriz (individuos x genes) de cromosomas.
+        funcion_lote : function
+            Se llama como funcion_lote(cromosomas_faltantes, *args, **kwargs) y debe regresar
+            una matriz con una fila de aptitud por cromosoma.
+
+        Retorna:
+        --------
+        np.ndarray
+            Matriz con la aptitud de cada cromosoma, en el mismo orden de entrada.
+        """
+        resultados = self._buscar_lote(cromosomas, funcion_lote, args, kwargs)
+        if not resultados:
+            return np.empty((0, 0))
+        return np.array(resultados)
+
+    def evaluar_lista(self, cromosomas, funcion_lote, *args, **kwargs):
+        """
+        Igual que `evaluar_lote`, pero regresa una lista con la aptitud de cada cromosoma tal como
+        la regresó `funcion_lote` (escalar, tupla, arreglo...), sin convertirla a una matriz.
+
+        Retorna:
+        --------
+        list
+            Aptitud de cada cromosoma, en el mismo orden de entrada. Los arreglos son copias.
+        """
+        return [_copiar(aptitud) for aptitud in self._buscar_lote(cromosomas, funcion_lote, args, kwargs)]
+
+    def _buscar_lote(self, cromosomas, funcion_lote, args, kwargs):
+        """Aptitudes del lote (los mismos objetos guardados en la caché), evaluando solo las faltantes."""
+        claves = [self.clave(cromosoma) for cromosoma in cromosomas]
+        resultados = [None] * len(claves)
+        faltantes = { }  # clave -> posiciones que la necesitan
+
+        for i, clave in enumerate(claves):
+            if clave in self._datos:
+                self.aciertos += 1
+                self._datos.move_to_end(clave)
+                resultados[i] = self._datos[clave]
+            elif clave in faltantes:
+                # Cromosoma repetido dentro del mismo lote: se evalúa una sola vez
+                self.aciertos += 1
+                faltantes[clave].append(i)
+            else:
+                self.fallos += 1
+                faltantes[clave] = [i]
+
+        if faltantes:
+            posiciones = [lista[0] for lista in faltantes.values()]
+            aptitudes = funcion_lote([cromosomas[i] for i in posiciones], *args, **kwargs)
+            for (clave, lista), aptitud in zip(faltantes.items(), aptitudes):
+                self._guardar_clave(clave, aptitud)
+                for i in lista:
+                    resultados[i] = aptitud
+        return resultados
+
+    # ------------------------------ Estadísticas ------------------------------
+    @property
+    def tasa_aciertos(self):
+        consultas = self.aciertos + self.fallos
+        return self.aciertos / consultas if consultas else 0.0
+
+    def limpiar(self):
+        """Vacía la caché y reinicia los contadores."""
+        self._datos.clear()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self):
+        return len(self._datos)
+
+    def __contains__(self, cromosoma):
+        return self.clave(cromosoma) in self._datos
+
+    def __repr__(self):
+        return (f"CacheAptitud(tam={len(self)}/{self.tam_maximo}, aciertos={self.aciertos}, "
+                f"fallos={self.fallos}, tasa_aciertos={self.tasa_aciertos:.2%})")
@@ -0,0 +1,257 @@
+#####################################################################################################
+#       checkpoint.py
+#       Guardado y recuperación del estado completo de una ejecución de MotorNSGAII.
+#           El estado (genes y aptitud de la población, contadores, estados de los generadores
+#           de `random` y de NumPy, frentes, archivo y criterios de paro) se guarda en un .npz
+#           comprimido con escritura atómica. Una ejecución que se reanuda desde un checkpoint
+#           continúa exactamente igual que si nunca se hubiera detenido.
+#####################################################################################################
+
+import json
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+VERSION_FORMATO = 1
+
+# Parámetros del motor que se guardan para verificar que se reanuda con la misma configuración
+_PARAMETROS_MOTOR = ("tam_poblacion", "n_generaciones", "p_cruza", "n_puntos_cruza", "p_mutacion", "k_torneo",
+                     "por_crowding")
+
+
+# ------------------------------ ESTADOS DE LOS GENERADORES ------------------------------
+def _estado_random():
+    version, interno, gauss_siguiente = random.getstate()
+    return {
+        "random_version": np.array(version),
+        "random_interno": np.array(interno, dtype=np.uint64),
+        "random_gauss": np.array(np.nan if gauss_siguiente is None else gauss_siguiente),
+        "random_tiene_gauss": np.array(gauss_siguiente is not None),
+    }
+
+
+def _restaurar_random(estado):
+    gauss_siguiente = float(estado["random_gauss"]) if bool(estado["random_tiene_gauss"]) else None
+    interno = tuple(int(x) for x in estado["random_interno"])
+    random.setstate((int(estado["random_version"]), interno, gauss_siguiente))
+
+
+def _estado_numpy():
+    nombre, claves, posicion, tiene_gauss, gauss = np.random.get_state()
+    return {
+        "np_nombre": np.array(nombre),
+        "np_claves": np.asarray(claves, dtype=np.uint32),
+        "np_posicion": np.array(posicion),
+        "np_tiene_gauss": np.array(tiene_gauss),
+        "np_gauss": np.array(gauss),
+    }
+
+
+def _restaurar_numpy(estado):
+    np.random.set_state((str(estado["np_nombre"]), estado["np_claves"], int(estado["np_posicion"]),
+                         int(estado["np_tiene_gauss"]), float(estado["np_gauss"])))
+
+
+# ------------------------------ FRENTES (LISTAS DE DISTINTO TAMAÑO) ------------------------------
+def _aplanar_frentes(frentes):
+    """Convierte una lista de frentes (listas de vectores) en una matriz y los tamaños de cada frente."""
+    if not frentes:
+        return np.empty((0, 0)), np.empty(0, dtype=np.int64)
+    tamanos = np.array([len(frente) for frente in frentes], dtype=np.int64)
+    vectores = [np.asarray(vector, dtype=float) for frente in frentes for vector in frente]
+    return np.array(vectores), tamanos
+
+
+def _reconstruir_frentes(vectores, tamanos):
+    frentes = [ ]
+    inicio = 0
+    for tamano in tamanos.tolist():
+        frentes.append([vectores[i] for i in range(inicio, inicio + tamano)])
+        inicio += tamano
+    return frentes
+
+
+# ------------------------------ ESTADO DEL MOTOR ------------------------------
+def estado_motor(motor, archivo=None):
+    """
+    Regresa un diccionario {nombre: np.ndarray} con todo el estado necesario para reanudar.
+
+    Args:
+        motor (MotorNSGAII): Motor con una población ya inicializada.
+        archivo (opcional): Archivo de soluciones (por defecto, `motor.archivo`). Si tiene un método
+            `estado()` que regresa un diccionario de arreglos, se guarda ese diccionario; si no, se
+            guarda np.asarray(archivo).
+
+    Los criterios de paro de `motor.criterios_paro` con método `estado()` (como ConvergenciaFrente)
+    también se guardan; los que no lo tienen se consideran sin estado.
+    """
+    if motor.poblacion is None:
+        raise ValueError("El motor no tiene población: no hay nada que guardar.")
+    if archivo is None:
+        archivo = getattr(motor, "archivo", None)
+
+    genes = np.array([individuo[0] for individuo in motor.poblacion])
+    tipo_genes = np.int16 if genes.size and np.abs(genes).max() <= np.iinfo(np.int16).max else np.int64
+    parametros = {nombre: getattr(motor, nombre) for nombre in _PARAMETROS_MOTOR}
+
+    estado = {
+        "version_formato": np.array(VERSION_FORMATO),
+        "parametros": np.array(json.dumps(parametros)),
+        "genes": genes.astype(tipo_genes),
+        "aptitud": np.array([np.asarray(individuo[1], dtype=float) for individuo in motor.poblacion]),
+        "generacion": np.array(motor.generacion),
+        "n_evaluaciones": np.array(motor.n_evaluaciones),
+        "tiempo_ejecucion": np.array(motor.tiempo_transcurrido),
+        "idx_frente_crowding": np.array(-1 if motor.idx_frente_crowding is None else motor.idx_frente_crowding),
+    }
+    estado["frentes_vectores"], estado["frentes_tamanos"] = _aplanar_frentes(motor.frentes)
+    estado["crowding_vectores"], _ = _aplanar_frentes([motor.vectores_crowding or [ ]])
+    if motor.rango is not None:
+        estado["rango"] = np.asarray(motor.rango)
+        estado["crowding"] = np.asarray(motor.crowding, dtype=float)
+    estado.update(_estado_random())
+    estado.update(_estado_numpy())
+
+    if archivo is not None:
+        if hasattr(archivo, "estado"):
+            for nombre, arreglo in archivo.estado().items():
+                estado["archivo_" + nombre] = np.asarray(arreglo)
+        else:
+            estado["archivo_vectores"] = np.asarray(archivo)
+
+    for i, criterio in enumerate(motor.criterios_paro):
+        if hasattr(criterio, "estado"):
+            for nombre, arreglo in criterio.estado().items():
+                estado[f"criterio{i}_" + nombre] = np.asarray(arreglo)
+    return estado
+
+
+def restaurar_motor(motor, estado, archivo=None):
+    """
+    Aplica al motor (y a los generadores globales de números aleatorios) un estado guardado.
+
+    Args:
+        motor (MotorNSGAII): Motor construido con la misma instancia y los mismos parámetros.
+        estado (dict): Diccionario que regresa `cargar_checkpoint`.
+        archivo (opcional): Archivo de soluciones a restaurar (por defecto, `motor.archivo`); debe
+            tener un método `cargar_estado(dict)`.
+
+    Los criterios de paro con método `cargar_estado(dict)` recuperan el estado que se guardó para el
+    criterio en la misma posición de `motor.criterios_paro`.
+
+    Returns:
+        MotorNSGAII: El mismo motor, listo para continuar con `ejecutar()`.
+    """
+    parametros = json.loads(str(estado["parametros"]))
+    parametros.setdefault("por_crowding", False)   # Checkpoints anteriores a la opción
+    distintos = [nombre for nombre in _PARAMETROS_MOTOR if parametros[nombre] != getattr(motor, nombre)
+                 and nombre != "n_generaciones"]
+    if distintos:
+        raise ValueError(f"El checkpoint se creó con otros parámetros: {', '.join(distintos)}.")
+
+    estados_criterios = [ ]
+    for i, criterio in enumerate(motor.criterios_paro):
+        prefijo = f"criterio{i}_"
+        estados_criterios.append({nombre[len(prefijo):]: arreglo for nombre, arreglo in estado.items()
+                                  if nombre.startswith(prefijo)})
+        if hasattr(criterio, "cargar_estado") != bool(estados_criterios[-1]):
+            raise ValueError(f"El criterio de paro {i} no coincide con el del checkpoint.")
+
+    aptitudes = estado["aptitud"]
+    motor.poblacion = [[fila, aptitudes[i]] for i, fila in enumerate(estado["genes"].tolist())]
+    motor.generacion = int(estado["generacion"])
+    motor.n_evaluaciones = int(estado["n_evaluaciones"])
+    motor.tiempo_ejecucion = float(estado["tiempo_ejecucion"])
+    idx_frente = int(estado["idx_frente_crowding"])
+    motor.idx_frente_crowding = None if idx_frente < 0 else idx_frente
+    motor.frentes = _reconstruir_frentes(estado["frentes_vectores"], estado["frentes_tamanos"]) or None
+    motor.vectores_crowding = list(estado["crowding_vectores"])
+    motor.rango = estado.get("rango")
+    motor.crowding = estado.get("crowding")
+
+    _restaurar_random(estado)
+    _restaurar_numpy(estado)
+
+    if archivo is None:
+        archivo = getattr(motor, "archivo", None)
+    if archivo is not None:
+        prefijo = "archivo_"
+        archivo.cargar_estado({nombre[len(prefijo):]: arreglo for nombre, arreglo in estado.items()
+                               if nombre.startswith(prefijo)})
+
+    for criterio, estado_criterio in zip(motor.criterios_paro, estados_criterios):
+        if estado_criterio:
+            criterio.cargar_estado(estado_criterio)
+    return motor
+
+
+# ------------------------------ ARCHIVOS EN DISCO ------------------------------
+def guardar_checkpoint(ruta, motor, archivo=None):
+    """
+    Guarda el estado del motor en `ruta` (.npz comprimido).
+
+    La escritura es atómica: se escribe un archivo temporal en el mismo directorio y después se
+    renombra, así que si el proceso muere a la mitad el checkpoint anterior sigue intacto.
+    """
+    estado = estado_motor(motor, archivo)
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    descriptor, ruta_temporal = tempfile.mkstemp(dir=directorio, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as archivo_temporal:
+            np.savez_compressed(archivo_temporal, **estado)
+            archivo_temporal.flush()
+            os.fsync(archivo_temporal.fileno())
+        os.replace(ruta_temporal, ruta)
+    except BaseException:
+        if os.path.exists(ruta_temporal):
+            os.remove(ruta_temporal)
+        raise
+    return ruta
+
+
+def cargar_checkpoint(ruta):
+    """Lee un checkpoint y regresa su estado como diccionario {nombre: np.ndarray}."""
+    with np.load(ruta, allow_pickle=False) as datos:
+        estado = {nombre: datos[nombre] for nombre in datos.files}
+    if int(estado["version_formato"]) != VERSION_FORMATO:
+        raise ValueError(f"Versión de checkpoint no soportada: {int(estado['version_formato'])}.")
+    return estado
+
+
+def reanudar(ruta, motor, archivo=None):
+    """Carga el checkpoint de `ruta` en el motor. Después basta con llamar a `motor.ejecutar()`."""
+    return restaurar_motor(motor, cargar_checkpoint(ruta), archivo)
+
+
+# ------------------------------ HOOK DE GUARDADO PERIÓDICO ------------------------------
+class CheckpointPeriodico:
+    """
+    Hook "al_terminar_generacion" que guarda un checkpoint cada N generaciones y/o cada T segundos.
+
+        motor.registrar("al_terminar_generacion", CheckpointPeriodico("corrida.npz", cada_generaciones=25))
+
+    El estado se toma al final de la generación, después de todo el uso de los generadores
+    aleatorios, que es el punto desde el que `reanudar` continúa.
+    """
+
+    def __init__(self, ruta, cada_generaciones=None, cada_segundos=None, archivo=None):
+        if cada_generaciones is None and cada_segundos is None:
+            raise ValueError("Indique cada_generaciones, cada_segundos o ambos.")
+        self.ruta = ruta
+        self.cada_generaciones = cada_generaciones
+        self.cada_segundos = cada_segundos
+        self.archivo = archivo
+        self.n_guardados = 0
+        self._ultimo_guardado = time.perf_counter()
+
+    def __call__(self, motor):
+        por_generacion = self.cada_generaciones is not None and motor.generacion % self.cada_generaciones == 0
+        por_tiempo = (self.cada_segundos is not None
+                      and time.perf_counter() - self._ultimo_guardado >= self.cada_segundos)
+        if por_generacion or por_tiempo:
+            guardar_checkpoint(self.ruta, motor, self.archivo)
+            self.n_guardados += 1
+            self._ultimo_guardado = time.perf_counter()
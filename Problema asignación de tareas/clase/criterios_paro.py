@@ -0,0 +1,241 @@
+#####################################################################################################
+#       criterios_paro.py
+#       Criterios de paro por convergencia para MotorNSGAII.
+#           En cada generación se actualizan indicadores baratos del primer frente (hipervolumen,
+#           recambio de miembros y movimiento de los puntos ideal y nadir) y la ejecución termina
+#           cuando, dentro de una ventana de generaciones, ninguno mejora más que su tolerancia.
+#####################################################################################################
+
+import json
+import time
+from collections import deque
+
+import numpy as np
+
+from hipervolumen import hipervolumen
+
+
+class ConvergenciaFrente:
+    """
+    Criterio de paro: termina cuando el primer frente deja de moverse.
+
+        criterio = ConvergenciaFrente(ventana=30)
+        motor = MotorNSGAII(..., criterios_paro=[criterio])
+        motor.ejecutar()
+        print(criterio.resumen(motor))
+
+    Los indicadores se calculan sobre el conjunto de vectores no dominados encontrados hasta el
+    momento (el primer frente de cada generación se acumula), porque el primer frente de NSGA-II
+    puede perder puntos al truncar por crowding y sus indicadores oscilan aunque ya no haya mejora.
+
+    Los objetivos se normalizan con el ideal y el nadir de la primera población combinada, así que las
+    tolerancias no dependen de la escala del makespan o de la energía. El punto de referencia del
+    hipervolumen se fija una sola vez (1.1 en el espacio normalizado) para que los valores de
+    distintas generaciones sean comparables.
+
+    La ejecución se detiene cuando, entre la generación actual y la de hace `ventana` generaciones:
+        - la mejora relativa del hipervolumen es menor que `tol_hipervolumen`,
+        - la fracción promedio de vectores nuevos en el conjunto no dominado es menor que `tol_recambio`, y
+        - el ideal y el nadir se movieron menos que `tol_ideal_nadir` (distancia máxima normalizada).
+    Una tolerancia en None desactiva ese indicador.
+    """
+
+    __name__ = "ConvergenciaFrente"
+
+    def __init__(self, ventana=30, tol_hipervolumen=1e-3, tol_recambio=0.05, tol_ideal_nadir=1e-3,
+                 generaciones_minimas=None):
+        """
+        Parámetros:
+        -----------
+        ventana : int
+            Número de generaciones con las que se compara la generación actual.
+        tol_hipervolumen, tol_recambio, tol_ideal_nadir : float | None
+            Tolerancias de cada indicador.
+        generaciones_minimas : int | None
+            Generaciones que se ejecutan antes de revisar la convergencia (por defecto, `ventana`).
+        """
+        if ventana < 1:
+            raise ValueError("La ventana debe ser de al menos una generación.")
+        self.ventana = ventana
+        self.tol_hipervolumen = tol_hipervolumen
+        self.tol_recambio = tol_recambio
+        self.tol_ideal_nadir = tol_ideal_nadir
+        self.generaciones_minimas = ventana if generaciones_minimas is None else generaciones_minimas
+
+        # Historial completo de los indicadores, por generación (útil para graficar)
+        self.historial = {"generacion": [ ], "hipervolumen": [ ], "recambio": [ ], "ideal": [ ], "nadir": [ ]}
+        self._ventana_hv = deque(maxlen=ventana + 1)
+        self._ventana_recambio = deque(maxlen=ventana)
+        self._ventana_ideal = deque(maxlen=ventana + 1)
+        self._ventana_nadir = deque(maxlen=ventana + 1)
+
+        self._origen = None
+        self._escala = None
+        self._referencia = None
+        self.no_dominados = None
+        self._tiempo_cpu = 0.0
+        self._ultimo_tiempo_cpu = None
+        self._generaciones_medidas = 0
+        self.generacion_paro = None
+
+    # ------------------------------ Indicadores ------------------------------
+    def _normalizar(self, vectores):
+        return (np.asarray(vectores, dtype=float) - self._origen) / self._escala
+
+    def _fijar_normalizacion(self, motor):
+        poblacion = motor.poblacion_combinada or motor.poblacion
+        aptitudes = np.array([individuo[1] for individuo in poblacion], dtype=float)
+        self._origen = aptitudes.min(axis=0)
+        rango = aptitudes.max(axis=0) - self._origen
+        self._escala = np.where(rango > 0, rango, 1.0)
+        self._referencia = np.full(aptitudes.shape[1], 1.1)
+
+    def _acumular(self, frente):
+        """Une el frente con los no dominados acumulados. Regresa cuántos vectores del frente entraron."""
+        if self.no_dominados is None:
+            self.no_dominados = np.unique(frente, axis=0)
+            return len(self.no_dominados)
+        anteriores = set(map(tuple, self.no_dominados.tolist()))
+        union = np.unique(np.concatenate([self.no_dominados, frente]), axis=0)
+        # (menor_igual & menor)[i, j]: el vector i domina al vector j
+        menor_igual = np.all(union[:, None, :] <= union[None, :, :], axis=2)
+        menor = np.any(union[:, None, :] < union[None, :, :], axis=2)
+        self.no_dominados = union[~np.any(menor_igual & menor, axis=0)]
+        return sum(vector not in anteriores for vector in map(tuple, self.no_dominados.tolist()))
+
+    def _actualizar(self, motor):
+        nuevos = self._acumular(np.asarray(motor.frente_pareto, dtype=float))
+        frente = self._normalizar(self.no_dominados)
+
+        hv = hipervolumen(frente, self._referencia)
+        recambio = nuevos / len(frente)
+        ideal, nadir = frente.min(axis=0), frente.max(axis=0)
+
+        self._ventana_hv.append(hv)
+        self._ventana_recambio.append(recambio)
+        self._ventana_ideal.append(ideal)
+        self._ventana_nadir.append(nadir)
+
+        self.historial["generacion"].append(motor.generacion)
+        self.historial["hipervolumen"].append(hv)
+        self.historial["recambio"].append(recambio)
+        self.historial["ideal"].append(ideal)
+        self.historial["nadir"].append(nadir)
+
+    def _convergio(self):
+        if len(self._ventana_hv) <= self.ventana:
+            return False
+        if self.tol_hipervolumen is not None:
+            hv_inicio, hv_fin = self._ventana_hv[0], self._ventana_hv[-1]
+            if (hv_fin - hv_inicio) / max(hv_inicio, np.finfo(float).tiny) >= self.tol_hipervolumen:
+                return False
+        if self.tol_recambio is not None and np.mean(self._ventana_recambio) >= self.tol_recambio:
+            return False
+        if self.tol_ideal_nadir is not None:
+            movimiento = max(np.max(np.abs(self._ventana_ideal[-1] - self._ventana_ideal[0])),
+                             np.max(np.abs(self._ventana_nadir[-1] - self._ventana_nadir[0])))
+            if movimiento >= self.tol_ideal_nadir:
+                return False
+        return True
+
+    # ------------------------------ Criterio ------------------------------
+    def __call__(self, motor):
+        if not motor.frentes:
+            return False
+
+        # Tiempo de CPU por generación, para estimar el ahorro al detener la ejecución
+        ahora = time.process_time()
+        if self._ultimo_tiempo_cpu is not None:
+            self._tiempo_cpu += ahora - self._ultimo_tiempo_cpu
+            self._generaciones_medidas += 1
+        self._ultimo_tiempo_cpu = ahora
+
+        if self._origen is None:
+            self._fijar_normalizacion(motor)
+        self._actualizar(motor)
+
+        if motor.generacion >= self.generaciones_minimas and self._convergio():
+            self.generacion_paro = motor.generacion
+            return True
+        return False
+
+    def resumen(self, motor):
+        """
+        Generaciones y tiempo de CPU que se ahorraron respecto a `motor.n_generaciones`.
+
+        El tiempo ahorrado es una estimación: generaciones no ejecutadas por el tiempo de CPU
+        promedio de las generaciones medidas.
+
+        Returns:
+            dict: generaciones_ejecutadas, generaciones_ahorradas, cpu_por_generacion,
+            cpu_ahorrado_estimado e hipervolumen_final.
+        """
+        ahorradas = max(motor.n_generaciones - motor.generacion, 0)
+        cpu_por_generacion = self._tiempo_cpu / self._generaciones_medidas if self._generaciones_medidas else 0.0
+        return {
+            "generaciones_ejecutadas": motor.generacion,
+            "generaciones_ahorradas": ahorradas,
+            "cpu_por_generacion": cpu_por_generacion,
+            "cpu_ahorrado_estimado": ahorradas * cpu_por_generacion,
+            "hipervolumen_final": self.historial["hipervolumen"][-1] if self.historial["hipervolumen"] else 0.0,
+        }
+
+    # ------------------------------ Estado (checkpoints) ------------------------------
+    def estado(self):
+        """Estado del criterio como diccionario de arreglos (ver `checkpoint.py`)."""
+        parametros = {"ventana": self.ventana, "tol_hipervolumen": self.tol_hipervolumen,
+                      "tol_recambio": self.tol_recambio, "tol_ideal_nadir": self.tol_ideal_nadir,
+                      "generaciones_minimas": self.generaciones_minimas}
+        estado = {
+            "parametros": np.array(json.dumps(parametros)),
+            "generacion": np.array(self.historial["generacion"], dtype=np.int64),
+            "hipervolumen": np.array(self.historial["hipervolumen"], dtype=float),
+            "recambio": np.array(self.historial["recambio"], dtype=float),
+            "ideal": np.array(self.historial["ideal"], dtype=float),
+            "nadir": np.array(self.historial["nadir"], dtype=float),
+            "no_dominados": np.empty((0, 0)) if self.no_dominados is None else self.no_dominados,
+            "normalizacion": (np.empty((0, 0)) if self._origen is None
+                              else np.array([self._origen, self._escala, self._referencia])),
+            "tiempo_cpu": np.array(self._tiempo_cpu),
+            "generaciones_medidas": np.array(self._generaciones_medidas),
+            "generacion_paro": np.array(-1 if self.generacion_paro is None else self.generacion_paro),
+        }
+        return estado
+
+    def cargar_estado(self, estado):
+        """
+        Reconstruye el criterio a partir de un diccionario generado por `estado()`.
+
+        Las ventanas son la cola del historial, así que se reconstruyen a partir de él. La primera
+        generación después de reanudar no entra en el tiempo de CPU medido, porque el reloj de
+        CPU de otro proceso no es comparable.
+        """
+        parametros = json.loads(str(estado["parametros"]))
+        distintos = [nombre for nombre, valor in parametros.items() if getattr(self, nombre) != valor]
+        if distintos:
+            raise ValueError(f"El estado del criterio se creó con otros parámetros: {', '.join(distintos)}.")
+
+        self.historial = {
+            "generacion": estado["generacion"].tolist(),
+            "hipervolumen": estado["hipervolumen"].tolist(),
+            "recambio": estado["recambio"].tolist(),
+            "ideal": list(estado["ideal"]),
+            "nadir": list(estado["nadir"]),
+        }
+        self._ventana_hv = deque(self.historial["hipervolumen"], maxlen=self.ventana + 1)
+        self._ventana_recambio = deque(self.historial["recambio"], maxlen=self.ventana)
+        self._ventana_ideal = deque(self.historial["ideal"], maxlen=self.ventana + 1)
+        self._ventana_nadir = deque(self.historial["nadir"], maxlen=self.ventana + 1)
+
+        self.no_dominados = estado["no_dominados"] if estado["no_dominados"].size else None
+        normalizacion = estado["normalizacion"]
+        if normalizacion.size:
+            self._origen, self._escala, self._referencia = (fila.copy() for fila in normalizacion)
+        else:
+            self._origen = self._escala = self._referencia = None
+
+        self._tiempo_cpu = float(estado["tiempo_cpu"])
+        self._generaciones_medidas = int(estado["generaciones_medidas"])
+        self._ultimo_tiempo_cpu = None
+        generacion_paro = int(estado["generacion_paro"])
+        self.generacion_paro = None if generacion_paro < 0 else generacion_paro
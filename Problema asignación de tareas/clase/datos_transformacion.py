@@ -6,12 +6,21 @@
 #####################################################################################################
 
 
-import numpy as np
+import hashlib
+import json
+import os
 import re
+import tempfile
+
+import numpy as np
+
+# Nombres de los archivos de una instancia (como en `datos_practica`)
+NOMBRES_ARCHIVOS = {"tiempo": "datos_operacion_tiempo.txt", "energia": "datos_operacion_consumo.txt",
+                    "tareas": "tareas.txt"}
 
 # ---> Funcion para cargar los datos y devolverlos como un array de numpy 
 
-def cargar_matriz_operaciones_maquina(archivo):
+def cargar_matriz_operaciones_maquina(archivo, cache=False):
     """
     Devuelve en una matriz numpy los datos que 
     relacionan las operaciones con las máquinas\n 
@@ -22,12 +31,19 @@ def cargar_matriz_operaciones_maquina(archivo):
     -----------
     archivo : str
         Cadena con la dirección de la ruta en donde están los datos.
+    cache : bool
+        Si es True se usa la caché binaria junto al archivo (ver `_cargar_con_cache`); la matriz
+        se regresa mapeada en memoria y es de solo lectura.
 
     Retorna:
     --------
     np.ndarray
         Un array de NumPy con valores que relacionan operaciones-maquinas
     """
+    if cache:
+        return _cargar_con_cache(archivo, "matriz", lambda: cargar_matriz_operaciones_maquina(archivo),
+                                 lambda matriz: matriz, lambda arreglo: arreglo)
+
     with open(archivo, 'r') as f:
         lineas = f.readlines()
         
@@ -42,7 +58,7 @@ def cargar_matriz_operaciones_maquina(archivo):
 
 
 # ---> Funcion para cargar los datos de cada una de las operaciones por tarea 
-def cargar_matriz_tareas(archivo):
+def cargar_matriz_tareas(archivo, cache=False):
     """
     Devuelve en una lista de listas con los datos que 
     relacionan las operaciones con las tareas\n 
@@ -53,12 +69,18 @@ def cargar_matriz_tareas(archivo):
     -----------
     archivo : str
         Cadena con la dirección de la ruta en donde están los datos.
+    cache : bool
+        Si es True se usa la caché binaria junto al archivo (ver `_cargar_con_cache`).
 
     Retorna:
     --------
     lst
         Una lista de listas con los valores tareas-operaciones
     """
+    if cache:
+        return _cargar_con_cache(archivo, "tareas", lambda: cargar_matriz_tareas(archivo),
+                                 _tareas_a_arreglo, _tareas_desde_arreglo)
+
     with open(archivo, 'r') as f:
         lineas = f.readlines()
     
@@ -77,6 +99,119 @@ def cargar_matriz_tareas(archivo):
     return filas
 
 
+# ---> Funcion para cargar los tres archivos de una instancia
+def cargar_instancia(directorio, cache=True):
+    """
+    Carga las matrices de tiempo y energía y la lista de tareas de un directorio con los
+    archivos de `NOMBRES_ARCHIVOS` (por ejemplo `datos_practica`).
+
+    Retorna:
+    --------
+    tuple
+        (mtx_op_t, mtx_op_e, l_tsk_oper)
+    """
+    return (cargar_matriz_operaciones_maquina(os.path.join(directorio, NOMBRES_ARCHIVOS["tiempo"]), cache),
+            cargar_matriz_operaciones_maquina(os.path.join(directorio, NOMBRES_ARCHIVOS["energia"]), cache),
+            cargar_matriz_tareas(os.path.join(directorio, NOMBRES_ARCHIVOS["tareas"]), cache))
+
+
+# ---------------------------- CACHÉ BINARIA ----------------------------
+# Junto a cada archivo de texto se guardan:
+#   <archivo>.cache.npy   los datos ya convertidos (se abren con np.load(mmap_mode="r"))
+#   <archivo>.cache.json  la huella del archivo: ruta, tamaño, mtime y SHA-256 del contenido
+# Si ruta, tamaño y mtime coinciden, la caché se usa sin leer el archivo de texto. Si no coinciden
+# (archivo movido, copiado o "tocado") pero el contenido tiene el mismo hash, la caché se reutiliza y
+# se actualiza la huella. En otro caso se vuelve a convertir el texto.
+
+VERSION_CACHE = 1
+SUFIJO_CACHE = ".cache.npy"
+SUFIJO_HUELLA = ".cache.json"
+
+
+def _hash_archivo(archivo):
+    resumen = hashlib.sha256()
+    with open(archivo, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            resumen.update(bloque)
+    return resumen.hexdigest()
+
+
+def _huella(archivo, tipo):
+    estado = os.stat(archivo)
+    return {"version": VERSION_CACHE, "tipo": tipo, "ruta": os.path.abspath(archivo),
+            "tamano": estado.st_size, "mtime_ns": estado.st_mtime_ns}
+
+
+def _escribir_atomico(ruta, escribir, modo):
+    """Escribe en un temporal del mismo directorio y lo renombra, para que otro proceso nunca lea un archivo a medias."""
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, modo) as f:
+            escribir(f)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+
+def _cargar_con_cache(archivo, tipo, convertir, a_arreglo, desde_arreglo):
+    """
+    Carga `archivo` desde su caché binaria si es válida; si no, lo convierte con `convertir()` y
+    guarda `a_arreglo(resultado)` como caché. Si el directorio no se puede escribir se regresa el
+    resultado convertido sin caché.
+    """
+    ruta_datos, ruta_huella = archivo + SUFIJO_CACHE, archivo + SUFIJO_HUELLA
+    huella = _huella(archivo, tipo)
+
+    try:
+        with open(ruta_huella, 'r') as f:
+            guardada = json.load(f)
+    except (OSError, ValueError):
+        guardada = None
+
+    if guardada is not None and os.path.exists(ruta_datos):
+        valida = all(guardada.get(clave) == valor for clave, valor in huella.items())
+        if not valida and all(guardada.get(clave) == huella[clave] for clave in ("version", "tipo", "tamano")):
+            contenido = _hash_archivo(archivo)
+            if guardada.get("sha256") == contenido:
+                valida = True
+                try:
+                    _escribir_atomico(ruta_huella, lambda f: json.dump({**huella, "sha256": contenido}, f), 'w')
+                except OSError:
+                    pass
+        if valida:
+            try:
+                return desde_arreglo(np.load(ruta_datos, mmap_mode='r'))
+            except (OSError, ValueError):
+                pass
+
+    contenido = _hash_archivo(archivo)
+    resultado = convertir()
+    # Si el archivo cambió mientras se leía, no se guarda una caché que podría no corresponderle
+    if _huella(archivo, tipo) != huella:
+        return resultado
+    try:
+        _escribir_atomico(ruta_datos, lambda f: np.save(f, a_arreglo(resultado)), 'wb')
+        _escribir_atomico(ruta_huella, lambda f: json.dump({**huella, "sha256": contenido}, f), 'w')
+    except OSError:
+        pass
+    return resultado
+
+
+def _tareas_a_arreglo(tareas):
+    """Lista de listas -> un solo arreglo int32: [n_tareas, desplazamientos (n_tareas + 1), operaciones]."""
+    desplazamientos = np.concatenate([[0], np.cumsum([len(fila) for fila in tareas])])
+    operaciones = [op for fila in tareas for op in fila]
+    return np.concatenate([[len(tareas)], desplazamientos, operaciones]).astype(np.int32)
+
+
+def _tareas_desde_arreglo(arreglo):
+    n_tareas = int(arreglo[0])
+    desplazamientos = arreglo[1:n_tareas + 2].tolist()
+    operaciones = arreglo[n_tareas + 2:].tolist()
+    return [operaciones[inicio:fin] for inicio, fin in zip(desplazamientos[:-1], desplazamientos[1:])]
+
 
 
 ##############################################################
@@ -0,0 +1,190 @@
+#####################################################################################################
+#       evaluacion_paralela.py
+#       Evaluación de aptitud en paralelo con un grupo persistente de procesos.
+#           Las tablas de la instancia compilada (tiempos y energía por gen) se copian UNA vez a
+#           memoria compartida; cada proceso trabajador las lee sin copiarlas y solo recibe
+#           bloques de cromosomas. Los resultados se reensamblan en el orden de entrada.
+#####################################################################################################
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+import weakref
+
+import numpy as np
+
+from instancia import compilar_instancia, InstanciaProblema
+from algoritmo_genetico import ESTADISTICAS_EVALUACION, evaluar_fitness_poblacion
+
+
+# ---------------------------- LADO DEL PROCESO TRABAJADOR ----------------------------
+# Cada trabajador guarda la instancia reconstruida sobre la memoria compartida, y las
+# referencias a los segmentos para que no se liberen mientras el proceso viva.
+_INSTANCIA_TRABAJADOR = None
+_MEMORIAS_TRABAJADOR = [ ]
+
+
+def _inicializar_trabajador(descriptores):
+    """Se conecta a los segmentos de memoria compartida y reconstruye la instancia (una vez por proceso)."""
+    global _INSTANCIA_TRABAJADOR
+    tablas = { }
+    for nombre, (nombre_segmento, forma, tipo) in descriptores.items():
+        memoria = shared_memory.SharedMemory(name=nombre_segmento)
+        _MEMORIAS_TRABAJADOR.append(memoria)
+        tablas[nombre] = np.ndarray(forma, dtype=np.dtype(tipo), buffer=memoria.buf)
+    _INSTANCIA_TRABAJADOR = InstanciaProblema.desde_tablas(tablas)
+
+
+def _evaluar_bloque(genes):
+    """Evalúa un bloque de cromosomas con la instancia del trabajador."""
+    return evaluar_fitness_poblacion(genes, _INSTANCIA_TRABAJADOR)
+
+
+# ---------------------------- LADO DEL PROCESO PRINCIPAL ----------------------------
+def _liberar_recursos(ejecutor, memorias):
+    """Cierra el grupo de procesos y libera los segmentos de memoria compartida."""
+    if ejecutor is not None:
+        ejecutor.shutdown(wait=True)
+    for memoria in memorias:
+        memoria.close()
+        try:
+            memoria.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class EvaluadorParalelo:
+    """
+    Evaluador de aptitud por lotes que reparte los cromosomas entre varios procesos.
+
+    Produce exactamente los mismos valores que `evaluar_fitness_poblacion` (y que `evaluar_fitness`
+    cromosoma por cromosoma), porque cada trabajador usa el mismo decodificador sobre su bloque.
+
+    El grupo de procesos se crea la primera vez que hace falta y se reutiliza en todas las
+    generaciones. Para poblaciones pequeñas, donde el costo de comunicación entre procesos
+    domina, se evalúa en el proceso principal.
+
+    Se recomienda usarlo como administrador de contexto para liberar los procesos y la memoria:
+
+        with EvaluadorParalelo(mtx_op_t, mtx_op_e, l_tsk_oper, n_procesos=8) as evaluador:
+            hijos = crearHijos(..., evaluador=evaluador)
+
+    Atributos:
+    ----------
+    instancia : InstanciaProblema
+        Instancia compilada que se evalúa.
+    n_procesos : int
+        Número de procesos trabajadores.
+    tam_bloque : int
+        Número de cromosomas que se envían juntos a un trabajador.
+    umbral_serial : int
+        Si el lote tiene menos cromosomas que este valor se evalúa en serie.
+    """
+
+    def __init__(self, mtx_op_t, mtx_op_e=None, l_tsk_oper=None, n_procesos=None, tam_bloque=64,
+                 umbral_serial=256):
+        """
+        Parámetros:
+        -----------
+        mtx_op_t : InstanciaProblema | list | np.ndarray
+            Instancia compilada o matriz operaciones-máquinas con los tiempos.
+        mtx_op_e : list | np.ndarray | None
+            Matriz operaciones-máquinas con la energía.
+        l_tsk_oper : list | None
+            Lista con las operaciones de cada tarea.
+        n_procesos : int | None
+            Número de procesos. Si es None se usa el número de CPUs disponibles.
+        tam_bloque : int
+            Cromosomas por bloque enviado a los trabajadores.
+        umbral_serial : int
+            Tamaño de lote por debajo del cual no se usa el grupo de procesos.
+        """
+        if tam_bloque < 1:
+            raise ValueError("El tamaño de bloque debe ser al menos 1.")
+        if n_procesos is not None and n_procesos < 1:
+            raise ValueError("El número de procesos debe ser al menos 1.")
+
+        self.instancia = compilar_instancia(mtx_op_t, mtx_op_e, l_tsk_oper)
+        self.n_procesos = n_procesos if n_procesos is not None else (os.cpu_count() or 1)
+        self.tam_bloque = tam_bloque
+        self.umbral_serial = umbral_serial
+
+        # Los genes viajan con el tipo entero más pequeño que alcanza para el número de máquinas
+        self._tipo_genes = np.min_scalar_type(self.instancia.n_maquinas)
+
+        self._memorias = [ ]
+        self._descriptores = None
+        self._ejecutor = None
+        self._finalizador = None
+
+    # ------------------------------ Recursos ------------------------------
+    def _crear_memoria_compartida(self):
+        """Copia las tablas de la instancia a segmentos de memoria compartida (una sola vez)."""
+        self._descriptores = { }
+        for nombre, arreglo in self.instancia.tablas().items():
+            arreglo = np.ascontiguousarray(arreglo)
+            memoria = shared_memory.SharedMemory(create=True, size=max(arreglo.nbytes, 1))
+            np.ndarray(arreglo.shape, dtype=arreglo.dtype, buffer=memoria.buf)[...] = arreglo
+            self._memorias.append(memoria)
+            self._descriptores[nombre] = (memoria.name, arreglo.shape, arreglo.dtype.str)
+
+    def _obtener_ejecutor(self):
+        if self._ejecutor is None:
+            self._crear_memoria_compartida()
+            self._ejecutor = ProcessPoolExecutor(max_workers=self.n_procesos, initializer=_inicializar_trabajador,
+                                                 initargs=(self._descriptores,))
+            # Si el evaluador se descarta sin cerrarlo, los recursos se liberan igualmente
+            self._finalizador = weakref.finalize(self, _liberar_recursos, self._ejecutor, self._memorias)
+        return self._ejecutor
+
+    def cerrar(self):
+        """Termina los procesos trabajadores y libera la memoria compartida."""
+        if self._finalizador is not None:
+            self._finalizador()
+        self._ejecutor = None
+        self._finalizador = None
+        self._memorias = [ ]
+        self._descriptores = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    # ------------------------------ Evaluación ------------------------------
+    def evaluar(self, poblacion_genes):
+        """
+        Evalúa una población de cromosomas.
+
+        Args:
+            poblacion_genes (list | np.ndarray): Matriz (individuos x genes) con la máquina (base 1) de cada operación.
+
+        Returns:
+            np.ndarray: Matriz (N, 2) con [makespan, energía] de cada cromosoma, en el orden de entrada.
+        """
+        genes = np.asarray(poblacion_genes)
+        if genes.size == 0:
+            return np.empty((0, 2))
+        if genes.ndim == 1:
+            genes = genes.reshape(1, -1)
+
+        n_individuos = genes.shape[0]
+        if self.n_procesos == 1 or n_individuos < self.umbral_serial:
+            return evaluar_fitness_poblacion(genes, self.instancia)
+
+        # Los trabajadores llevan su propio contador: aquí se cuentan los cromosomas que se envían
+        ESTADISTICAS_EVALUACION["evaluaciones"] += n_individuos
+        genes = genes.astype(self._tipo_genes, copy=False)
+        bloques = [genes[i:i + self.tam_bloque] for i in range(0, n_individuos, self.tam_bloque)]
+        # map conserva el orden de los bloques, así que basta con apilarlos
+        resultados = list(self._obtener_ejecutor().map(_evaluar_bloque, bloques))
+        return np.vstack(resultados)
+
+    def __call__(self, poblacion_genes):
+        return self.evaluar(poblacion_genes)
+
+    def __repr__(self):
+        estado = "activo" if self._ejecutor is not None else "inactivo"
+        return (f"EvaluadorParalelo(n_procesos={self.n_procesos}, tam_bloque={self.tam_bloque}, "
+                f"umbral_serial={self.umbral_serial}, {estado})")
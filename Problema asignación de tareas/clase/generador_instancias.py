@@ -0,0 +1,228 @@
+#####################################################################################################
+#       generador_instancias.py
+#       Generador de instancias sintéticas (con semilla) y estudio de escalamiento.
+#           Las instancias se escriben en los mismos formatos que leen
+#           `cargar_matriz_operaciones_maquina` y `cargar_matriz_tareas`, así que se usan igual que
+#           `datos_practica`. El estudio de escalamiento ejecuta NSGA-II completo con instancias de
+#           tamaño creciente y ajusta una curva tiempo = c * n^b (pendiente en escala log-log).
+#
+#       Uso:
+#           python generador_instancias.py generar datos_grandes --tareas 500 --maquinas 50 --operaciones 20 --ops-por-tarea 5 15
+#           python generador_instancias.py escalamiento --tareas 10 20 40 80 160 --generaciones 20
+#####################################################################################################
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from datos_transformacion import NOMBRES_ARCHIVOS
+from instancia import compilar_instancia
+from motor_nsga2 import MotorNSGAII
+
+
+# ------------------------------ DISTRIBUCIONES ------------------------------
+def _muestrear(distribucion, generador, forma):
+    """
+    Muestra valores de una distribución descrita como tupla o función:
+        ("uniforme", a, b), ("normal", media, desviacion), ("lognormal", media, sigma),
+        ("exponencial", escala), ("entera", a, b) o funcion(generador, forma) -> arreglo.
+    """
+    if callable(distribucion):
+        return np.asarray(distribucion(generador, forma), dtype=float)
+    nombre, *parametros = distribucion
+    if nombre == "uniforme":
+        return generador.uniform(*parametros, forma)
+    if nombre == "normal":
+        return generador.normal(*parametros, forma)
+    if nombre == "lognormal":
+        return generador.lognormal(*parametros, forma)
+    if nombre == "exponencial":
+        return generador.exponential(*parametros, forma)
+    if nombre == "entera":
+        a, b = parametros
+        return generador.integers(a, b + 1, forma).astype(float)
+    raise ValueError(f"Distribución no reconocida: {nombre}")
+
+
+# ------------------------------ GENERACIÓN ------------------------------
+def generar_instancia(n_tareas, n_operaciones, n_maquinas, ops_por_tarea=None, dist_tiempo=("uniforme", 1.0, 10.0),
+                      dist_energia=("uniforme", 1.0, 10.0), decimales=1, semilla=None):
+    """
+    Genera una instancia del problema de asignación de tareas.
+
+    Args:
+        n_tareas (int): Número de tareas (J1, J2, ...).
+        n_operaciones (int): Número de tipos de operación (filas de las matrices, O1, O2, ...).
+        n_maquinas (int): Número de máquinas (columnas de las matrices).
+        ops_por_tarea (int | tuple, opcional): Operaciones de cada tarea: un número fijo o un rango
+            (mínimo, máximo) inclusivo. Cada tarea usa operaciones distintas, en orden ascendente.
+            Por defecto, entre 2 y n_operaciones.
+        dist_tiempo, dist_energia (tuple | function): Distribución de los tiempos y de la energía
+            de cada operación en cada máquina (ver `_muestrear`).
+        decimales (int): Decimales con los que se redondean (y se escriben) los valores. Los
+            valores se acotan a un mínimo de 10^-decimales para que no haya ceros ni negativos.
+        semilla (int | np.random.Generator, opcional): Semilla del generador de números aleatorios.
+
+    Returns:
+        tuple: (mtx_op_t, mtx_op_e, l_tsk_oper), igual que los cargadores de `datos_transformacion`.
+    """
+    if ops_por_tarea is None:
+        ops_por_tarea = (min(2, n_operaciones), n_operaciones)
+    elif isinstance(ops_por_tarea, int):
+        ops_por_tarea = (ops_por_tarea, ops_por_tarea)
+    minimo_ops, maximo_ops = ops_por_tarea
+    if not 1 <= minimo_ops <= maximo_ops <= n_operaciones:
+        raise ValueError("Las operaciones por tarea deben cumplir 1 <= mínimo <= máximo <= n_operaciones.")
+
+    generador = np.random.default_rng(semilla)
+    valor_minimo = 10.0 ** -decimales
+    mtx_op_t = np.maximum(np.round(_muestrear(dist_tiempo, generador, (n_operaciones, n_maquinas)), decimales),
+                          valor_minimo)
+    mtx_op_e = np.maximum(np.round(_muestrear(dist_energia, generador, (n_operaciones, n_maquinas)), decimales),
+                          valor_minimo)
+
+    tareas = [ ]
+    for _ in range(n_tareas):
+        n_ops = int(generador.integers(minimo_ops, maximo_ops + 1))
+        tareas.append(sorted((generador.choice(n_operaciones, n_ops, replace=False) + 1).tolist()))
+    return mtx_op_t, mtx_op_e, tareas
+
+
+def escribir_instancia(directorio, mtx_op_t, mtx_op_e, l_tsk_oper, decimales=1):
+    """
+    Escribe una instancia en `directorio` con los nombres y formatos de `datos_practica`:
+        datos_operacion_tiempo.txt / datos_operacion_consumo.txt:  "3.5, 6.7, 2.5" por operación
+        tareas.txt:  "J1 = {O2, O4, O5}" por tarea
+
+    Returns:
+        dict: Rutas de los archivos escritos ("tiempo", "energia" y "tareas").
+    """
+    os.makedirs(directorio, exist_ok=True)
+    rutas = {clave: os.path.join(directorio, nombre) for clave, nombre in NOMBRES_ARCHIVOS.items()}
+
+    for clave, matriz in (("tiempo", mtx_op_t), ("energia", mtx_op_e)):
+        lineas = [", ".join(f"{valor:.{decimales}f}" for valor in fila) for fila in np.asarray(matriz, dtype=float)]
+        with open(rutas[clave], "w") as f:
+            f.write("\n".join(lineas))
+
+    lineas = [f"J{i} = {{{', '.join(f'O{op}' for op in operaciones)}}}"
+              for i, operaciones in enumerate(l_tsk_oper, start=1)]
+    with open(rutas["tareas"], "w") as f:
+        f.write("\n".join(lineas))
+    return rutas
+
+
+# ------------------------------ ESTUDIO DE ESCALAMIENTO ------------------------------
+def ajustar_potencia(x, y):
+    """
+    Ajusta y = c * x^b por mínimos cuadrados en escala log-log.
+
+    Returns:
+        tuple: (b, c, r2) exponente, coeficiente y coeficiente de determinación del ajuste.
+    """
+    log_x, log_y = np.log(np.asarray(x, dtype=float)), np.log(np.asarray(y, dtype=float))
+    b, log_c = np.polyfit(log_x, log_y, 1)
+    residuos = log_y - (b * log_x + log_c)
+    total = np.sum((log_y - log_y.mean()) ** 2)
+    r2 = 1 - np.sum(residuos ** 2) / total if total > 0 else 1.0
+    return float(b), float(np.exp(log_c)), float(r2)
+
+
+def estudio_escalamiento(tamanos_tareas, n_operaciones=10, n_maquinas=10, ops_por_tarea=None, maquinas_por_tarea=None,
+                         tam_poblacion=50, n_generaciones=20, repeticiones=3, semilla=0, mostrar=True):
+    """
+    Mide el tiempo de una ejecución completa de NSGA-II para instancias de tamaño creciente.
+
+    Args:
+        tamanos_tareas (list): Números de tareas de cada instancia.
+        n_operaciones, n_maquinas, ops_por_tarea: Parámetros de `generar_instancia`.
+        maquinas_por_tarea (float, opcional): Si se da, las máquinas crecen con las tareas:
+            n_maquinas = max(1, round(n_tareas * maquinas_por_tarea)).
+        tam_poblacion, n_generaciones: Parámetros de cada ejecución.
+        repeticiones (int): Ejecuciones por tamaño; se usa la mediana del tiempo.
+        semilla (int): Semilla de las instancias y de las ejecuciones.
+
+    Returns:
+        dict: "resultados" (una fila por tamaño) y los ajustes "ajuste_genes" y "ajuste_tareas",
+        cada uno con el exponente b, el coeficiente c y r2 de tiempo = c * n^b.
+    """
+    resultados = [ ]
+    for n_tareas in tamanos_tareas:
+        maquinas = n_maquinas if maquinas_por_tarea is None else max(1, round(n_tareas * maquinas_por_tarea))
+        instancia = compilar_instancia(*generar_instancia(n_tareas, n_operaciones, maquinas, ops_por_tarea,
+                                                          semilla=semilla))
+        tiempos = [ ]
+        for repeticion in range(repeticiones):
+            motor = MotorNSGAII(instancia, tam_poblacion=tam_poblacion, n_generaciones=n_generaciones,
+                                semilla=semilla + repeticion)
+            inicio = time.perf_counter()
+            motor.ejecutar()
+            tiempos.append(time.perf_counter() - inicio)
+        fila = {"n_tareas": n_tareas, "n_maquinas": maquinas, "n_genes": int(instancia.n_genes),
+                "tiempo_s": float(np.median(tiempos)), "tiempo_min_s": float(np.min(tiempos))}
+        fila["tiempo_por_generacion_ms"] = 1e3 * fila["tiempo_s"] / n_generaciones
+        resultados.append(fila)
+        if mostrar:
+            print(f"tareas={n_tareas:>6}  máquinas={maquinas:>4}  genes={fila['n_genes']:>7}  "
+                  f"tiempo={fila['tiempo_s']:>9.3f} s  ({fila['tiempo_por_generacion_ms']:.2f} ms/gen)")
+
+    estudio = {"resultados": resultados}
+    if len(resultados) >= 2:
+        tiempos = [fila["tiempo_s"] for fila in resultados]
+        for nombre, clave in (("ajuste_genes", "n_genes"), ("ajuste_tareas", "n_tareas")):
+            b, c, r2 = ajustar_potencia([fila[clave] for fila in resultados], tiempos)
+            estudio[nombre] = {"exponente": b, "coeficiente": c, "r2": r2}
+        if mostrar:
+            ajuste = estudio["ajuste_genes"]
+            print(f"\nAjuste: tiempo ≈ {ajuste['coeficiente']:.3g} * genes^{ajuste['exponente']:.2f}  "
+                  f"(R² = {ajuste['r2']:.3f})")
+    return estudio
+
+
+# ------------------------------ LÍNEA DE COMANDOS ------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Instancias sintéticas y estudio de escalamiento.")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    generar = subparsers.add_parser("generar", help="Escribe una instancia en un directorio.")
+    generar.add_argument("directorio")
+    generar.add_argument("--tareas", type=int, required=True)
+    generar.add_argument("--maquinas", type=int, required=True)
+    generar.add_argument("--operaciones", type=int, required=True)
+    generar.add_argument("--ops-por-tarea", type=int, nargs=2, metavar=("MIN", "MAX"))
+    generar.add_argument("--tiempo", nargs="+", default=["uniforme", "1", "10"],
+                         help="Distribución de los tiempos, por ejemplo: uniforme 1 10 | normal 5 1.5 | lognormal 1 0.5")
+    generar.add_argument("--energia", nargs="+", default=["uniforme", "1", "10"])
+    generar.add_argument("--decimales", type=int, default=1)
+    generar.add_argument("--semilla", type=int, default=0)
+
+    escalamiento = subparsers.add_parser("escalamiento", help="Ajusta el tiempo de ejecución contra el tamaño.")
+    escalamiento.add_argument("--tareas", type=int, nargs="+", default=[10, 20, 40, 80])
+    escalamiento.add_argument("--maquinas", type=int, default=10)
+    escalamiento.add_argument("--maquinas-por-tarea", type=float)
+    escalamiento.add_argument("--operaciones", type=int, default=10)
+    escalamiento.add_argument("--ops-por-tarea", type=int, nargs=2, metavar=("MIN", "MAX"))
+    escalamiento.add_argument("--poblacion", type=int, default=50)
+    escalamiento.add_argument("--generaciones", type=int, default=20)
+    escalamiento.add_argument("--repeticiones", type=int, default=3)
+    escalamiento.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    ops_por_tarea = tuple(args.ops_por_tarea) if args.ops_por_tarea else None
+    if args.comando == "generar":
+        distribuciones = [(nombre, *map(float, parametros)) for nombre, *parametros in (args.tiempo, args.energia)]
+        instancia = generar_instancia(args.tareas, args.operaciones, args.maquinas, ops_por_tarea, *distribuciones,
+                                      decimales=args.decimales, semilla=args.semilla)
+        rutas = escribir_instancia(args.directorio, *instancia, decimales=args.decimales)
+        print("Instancia escrita en:", ", ".join(rutas.values()))
+    else:
+        estudio_escalamiento(args.tareas, args.operaciones, args.maquinas, ops_por_tarea, args.maquinas_por_tarea,
+                             args.poblacion, args.generaciones, args.repeticiones, args.semilla)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
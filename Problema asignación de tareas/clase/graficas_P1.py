@@ -1,5 +1,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from historial import LectorHistorial
 
 
 ## -----------> Función para graficar todos los frentes de pareto de una generación 
@@ -336,4 +337,83 @@ def graficar_distancia_crowding(
         ax.grid(True, linestyle='--', alpha=0.6)
 
     plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    plt.show()
+
+
+# ------------------- Frentes leídos de un historial en disco ------------------------
+def cargar_frentes_historial(historial, generaciones):
+    """
+    Lee del historial (ver `historial.py`) los frentes de las generaciones indicadas, en el mismo
+    formato que las listas `conjuntos_F_Pareto` del notebook, listo para las funciones de este módulo.
+    Solo se descomprimen los bloques de las generaciones pedidas.
+
+    Parámetros:
+    -----------
+    historial : str | LectorHistorial
+        Ruta del archivo de historial o un lector ya abierto.
+
+    generaciones : list
+        Números de generación que se quieren leer.
+
+    Retorna:
+    --------
+    list
+        Una lista con los frentes de cada generación pedida.
+    """
+    if not isinstance(historial, LectorHistorial):
+        historial = LectorHistorial(historial)
+    return [historial.frentes(generacion) for generacion in generaciones]
+
+
+def graficar_generacion_historial(historial, generacion, etiqueta_x='F1: Tiempo', etiqueta_y='F2: Consumo energético'):
+    """
+    Grafica los frentes de cualquier generación guardada en un historial en disco.
+
+    Parámetros:
+    -----------
+    historial : str | LectorHistorial
+        Ruta del archivo de historial o un lector ya abierto.
+
+    generacion : int
+        Número de la generación a graficar.
+    """
+    frentes = cargar_frentes_historial(historial, [generacion])[0]
+    graficar_F_pareto_1_generacion(frentes, generacion, etiqueta_x, etiqueta_y)
+
+
+# ------------------- Archivo externo de soluciones no dominadas ------------------------
+def graficar_archivo_pareto(archivo, poblacion=None, titulo='Archivo de Pareto', etiqueta_x='F1: Tiempo', etiqueta_y='F2: Consumo energético'):
+    """
+    Grafica las soluciones de un archivo externo (ver `archivo_pareto.py`) y, opcionalmente,
+    el primer frente de la población final para comparar lo que el reemplazo conservó.
+
+    Parámetros:
+    -----------
+    archivo : ArchivoPareto | list
+        Archivo de Pareto, o una lista de soluciones con el formato [[cromosoma], [f1, f2]]
+        (por ejemplo, `motor.soluciones`).
+
+    poblacion : list, opcional
+        Población final con el formato [[cromosoma], [f1, f2]]. Se dibujan sus no dominados.
+    """
+    soluciones = archivo.soluciones if hasattr(archivo, 'soluciones') else archivo
+    puntos = sorted((tuple(s[1]) for s in soluciones), key=lambda p: p[0])
+
+    plt.figure(figsize=(10, 7))
+    plt.plot([p[0] for p in puntos], [p[1] for p in puntos], marker='o', linestyle='-', linewidth=0.8,
+             color='darkblue', label=f'Archivo ({len(puntos)} soluciones)', zorder=2)
+
+    if poblacion:
+        aptitudes = [tuple(individuo[1]) for individuo in poblacion]
+        frente = sorted({p for p in aptitudes
+                         if not any(q[0] <= p[0] and q[1] <= p[1] and q != p for q in aptitudes)},
+                        key=lambda p: p[0])
+        plt.scatter([p[0] for p in frente], [p[1] for p in frente], color='orange', s=80,
+                    edgecolors='black', label=f'Primer frente de la población ({len(frente)})', zorder=3)
+
+    plt.title(titulo)
+    plt.xlabel(etiqueta_x)
+    plt.ylabel(etiqueta_y)
+    plt.legend()
+    plt.grid(True, linestyle='--', alpha=0.6)
+    plt.show()
@@ -0,0 +1,245 @@
+#####################################################################################################
+#       hipervolumen.py
+#       Indicador de hipervolumen sin dependencias externas (solo NumPy).
+#           - 2 objetivos: barrido O(n log n).
+#           - 3 a 5 objetivos: algoritmo exacto WFG (Walking Fish Group).
+#           - Más objetivos: estimación Monte Carlo vectorizada con intervalo de confianza.
+#####################################################################################################
+
+from statistics import NormalDist
+
+import numpy as np
+
+# Número máximo de objetivos para los que "auto" usa el algoritmo exacto
+_MAX_OBJETIVOS_EXACTO = 5
+
+# Tamaño máximo (en elementos) de los tensores temporales de la estimación Monte Carlo
+_ELEMENTOS_POR_BLOQUE_MC = 2**22
+
+# Hasta este número de puntos los no dominados se filtran con una matriz de comparaciones (n, n);
+# con más puntos se usa el recorrido en orden lexicográfico, que no necesita memoria cuadrática
+_MAX_PUNTOS_FILTRO_MATRICIAL = 512
+
+
+# ------------------------------ PREPARACIÓN DE LOS DATOS ------------------------------
+def _preparar(frente, punto_referencia, modo):
+    """
+    Convierte el frente y la referencia a minimización y descarta los puntos que no dominan
+    estrictamente a la referencia (su contribución al hipervolumen es cero).
+    """
+    if modo not in ("minimize", "maximize"):
+        raise ValueError("El modo debe ser 'minimize' o 'maximize'.")
+    F = np.asarray(frente, dtype=float)
+    r = np.asarray(punto_referencia, dtype=float).ravel()
+    if F.size == 0:
+        return np.empty((0, len(r))), r
+    if F.ndim == 1:
+        F = F.reshape(1, -1)
+    if F.shape[1] != len(r):
+        raise ValueError("El punto de referencia debe tener la misma dimensión que los vectores del frente.")
+    if modo == "maximize":
+        F, r = -F, -r
+    return F[np.all(F < r, axis=1)], r
+
+
+def _filtrar_no_dominados(F):
+    """
+    Regresa los puntos no dominados (minimización), sin repetidos.
+
+    Con muchos puntos se ordenan lexicográficamente; así, quien domina a un punto siempre aparece
+    antes que él y basta con compararlo contra los que ya se conservaron.
+    """
+    if len(F) <= 1:
+        return F
+    F = np.unique(F, axis=0)  # np.unique también los deja en orden lexicográfico
+    if len(F) <= _MAX_PUNTOS_FILTRO_MATRICIAL:
+        # (menor_igual & menor)[i, j]: el punto i domina al punto j
+        menor_igual = np.all(F[:, None, :] <= F[None, :, :], axis=2)
+        menor = np.any(F[:, None, :] < F[None, :, :], axis=2)
+        return F[~np.any(menor_igual & menor, axis=0)]
+    conservados = np.empty_like(F)
+    n_conservados = 0
+    for punto in F:
+        if n_conservados and np.any(np.all(conservados[:n_conservados] <= punto, axis=1)):
+            continue
+        conservados[n_conservados] = punto
+        n_conservados += 1
+    return conservados[:n_conservados]
+
+
+# ------------------------------ 2 OBJETIVOS: BARRIDO ------------------------------
+def _hv_2d(F, r):
+    """Barrido O(n log n): se ordena por f1 y se suman los rectángulos que agrega cada punto."""
+    if len(F) == 0:
+        return 0.0
+    F = F[np.lexsort((F[:, 1], F[:, 0]))]
+    # Solo cuentan los puntos que mejoran el mejor f2 visto hasta ahora (los no dominados)
+    mejor_f2 = np.minimum.accumulate(F[:, 1])
+    mejora = np.r_[True, mejor_f2[1:] < mejor_f2[:-1]]
+    F = F[mejora]
+    anchos = np.r_[F[1:, 0], r[0]] - F[:, 0]
+    return float(np.sum(anchos * (r[1] - F[:, 1])))
+
+
+# ------------------------------ 3+ OBJETIVOS: WFG ------------------------------
+def _hv_wfg(F, r):
+    """
+    Hipervolumen exacto con WFG:
+        HV(P) = suma_i [ volumen(p_i) - HV(limitar(P[i+1:], p_i)) ]
+    donde limitar(Q, p) reemplaza cada q por max(q, p) y conserva los no dominados.
+    """
+    n, m = F.shape
+    if n == 0:
+        return 0.0
+    if n == 1:
+        return float(np.prod(r - F[0]))
+    if m == 2:
+        return _hv_2d(F, r)
+
+    # Ordenar por el último objetivo (descendente) hace que los conjuntos limitados sean pequeños
+    F = F[np.argsort(-F[:, -1], kind="stable")]
+    volumenes = np.prod(r - F, axis=1)
+
+    total = 0.0
+    for i in range(n):
+        total += volumenes[i]
+        if i + 1 < n:
+            limitados = _filtrar_no_dominados(np.maximum(F[i + 1:], F[i]))
+            total -= _hv_wfg(limitados, r)
+    return total
+
+
+# ------------------------------ MUCHOS OBJETIVOS: MONTE CARLO ------------------------------
+def hipervolumen_montecarlo(frente, punto_referencia, modo="minimize", n_muestras=100000, confianza=0.95,
+                            semilla=None):
+    """
+    Estima el hipervolumen por Monte Carlo.
+
+    Se muestrean puntos uniformes en la caja [ideal, referencia] y se cuenta la fracción que es
+    dominada por al menos un punto del frente. La comprobación está vectorizada por bloques de
+    muestras para acotar la memoria.
+
+    Args:
+        frente (list | np.ndarray): Vectores de aptitud, forma (n, M).
+        punto_referencia (list | np.ndarray): Punto de referencia, dimensión M.
+        modo (str): "minimize" o "maximize".
+        n_muestras (int): Número de muestras.
+        confianza (float): Nivel del intervalo de confianza (aproximación normal de la binomial).
+        semilla (int | np.random.Generator, opcional): Semilla o generador de números aleatorios.
+
+    Returns:
+        tuple: (estimacion, (limite_inferior, limite_superior))
+    """
+    F, r = _preparar(frente, punto_referencia, modo)
+    if len(F) == 0:
+        return 0.0, (0.0, 0.0)
+    F = _filtrar_no_dominados(F)
+
+    generador = np.random.default_rng(semilla)
+    ideal = F.min(axis=0)
+    volumen_caja = float(np.prod(r - ideal))
+    n, m = F.shape
+
+    tam_bloque = max(1, _ELEMENTOS_POR_BLOQUE_MC // (n * m))
+    dominadas = 0
+    restantes = n_muestras
+    while restantes > 0:
+        k = min(tam_bloque, restantes)
+        muestras = ideal + generador.random((k, m)) * (r - ideal)
+        # (k, n, m): ¿el punto j del frente es <= a la muestra i en todos los objetivos?
+        dominadas += int(np.count_nonzero(np.any(np.all(F[None, :, :] <= muestras[:, None, :], axis=2), axis=1)))
+        restantes -= k
+
+    p = dominadas / n_muestras
+    z = NormalDist().inv_cdf(0.5 + confianza / 2)
+    margen = z * np.sqrt(p * (1 - p) / n_muestras)
+    estimacion = p * volumen_caja
+    return estimacion, (max(p - margen, 0.0) * volumen_caja, min(p + margen, 1.0) * volumen_caja)
+
+
+# ------------------------------ INTERFAZ GENERAL ------------------------------
+def hipervolumen(frente, punto_referencia, modo="minimize", metodo="auto", n_muestras=100000, semilla=None):
+    """
+    Calcula el hipervolumen de un conjunto de vectores respecto a un punto de referencia.
+
+    Los puntos que no dominan estrictamente a la referencia no aportan, y los puntos dominados
+    o repetidos se descartan, así que se puede pasar cualquier conjunto (no solo un frente).
+
+    Args:
+        frente (list | np.ndarray): Vectores de aptitud, forma (n, M).
+        punto_referencia (list | np.ndarray): Punto de referencia, dimensión M.
+        modo (str): "minimize" o "maximize".
+        metodo (str):
+            - "barrido": exacto, O(n log n), solo para 2 objetivos.
+            - "wfg": exacto, cualquier número de objetivos (costoso a partir de ~6).
+            - "montecarlo": estimación (ver `hipervolumen_montecarlo` para el intervalo de confianza).
+            - "auto": barrido con 2 objetivos, WFG hasta 5 objetivos y Monte Carlo con más.
+        n_muestras (int): Número de muestras para Monte Carlo.
+        semilla (int, opcional): Semilla para Monte Carlo.
+
+    Returns:
+        float: Valor del hipervolumen.
+
+    Ejemplo:
+        >>> hipervolumen([[3, 5], [2, 6], [4, 2], [1, 8], [6, 1]], [10, 10])
+        63.0
+    """
+    F, r = _preparar(frente, punto_referencia, modo)
+    m = len(r)
+
+    if metodo == "auto":
+        if m == 2:
+            metodo = "barrido"
+        elif m <= _MAX_OBJETIVOS_EXACTO:
+            metodo = "wfg"
+        else:
+            metodo = "montecarlo"
+
+    if len(F) == 0:
+        return 0.0
+    if m == 1:
+        return float(r[0] - F[:, 0].min())
+
+    if metodo == "barrido":
+        if m != 2:
+            raise ValueError("El método 'barrido' solo aplica a dos objetivos.")
+        return _hv_2d(F, r)
+    if metodo == "wfg":
+        return _hv_wfg(_filtrar_no_dominados(F), r)
+    if metodo == "montecarlo":
+        # F y r ya están en minimización
+        return hipervolumen_montecarlo(F, r, "minimize", n_muestras, semilla=semilla)[0]
+    raise ValueError(f"Método de hipervolumen no reconocido: {metodo}")
+
+
+def contribuciones_hipervolumen(frente, punto_referencia, modo="minimize"):
+    """
+    Contribución exclusiva de cada punto al hipervolumen: HV(frente) - HV(frente sin el punto).
+
+    Returns:
+        np.ndarray: Una contribución por vector, en el orden de entrada (cero para los dominados
+        y para los que no dominan a la referencia).
+    """
+    F = np.asarray(frente, dtype=float)
+    if F.size == 0:
+        return np.empty(0)
+    if F.ndim == 1:
+        F = F.reshape(1, -1)
+    r = np.asarray(punto_referencia, dtype=float).ravel()
+    if modo == "maximize":
+        F, r = -F, -r
+    elif modo != "minimize":
+        raise ValueError("El modo debe ser 'minimize' o 'maximize'.")
+
+    # Contribución exclusiva de p: volumen(p) - HV(limitar(resto, p)), igual que en WFG
+    contribuciones = np.zeros(len(F))
+    mascara = np.ones(len(F), dtype=bool)
+    for i, punto in enumerate(F):
+        if not np.all(punto < r):
+            continue
+        mascara[i] = False
+        limitados = np.maximum(F[mascara], punto)
+        mascara[i] = True
+        limitados = limitados[np.all(limitados < r, axis=1)]
+        contribuciones[i] = np.prod(r - punto) - _hv_wfg(_filtrar_no_dominados(limitados), r)
+    return contribuciones
@@ -0,0 +1,331 @@
+#####################################################################################################
+#       historial.py
+#       Historial de generaciones en disco, comprimido y por bloques.
+#           En cada generación se guarda la matriz de aptitud de la población combinada, el frente
+#           (rango) de cada individuo y los índices de los sobrevivientes. Las generaciones se
+#           acumulan en un bloque pequeño que se comprime con zlib y se AGREGA al final del
+#           archivo, así que la memoria no crece con la duración de la ejecución. La lectura es
+#           perezosa: solo se descomprime el bloque de la generación que se pide.
+#
+#       Formato:
+#           encabezado : MAGIA (8 bytes) | versión (uint32) | largo (uint32) | metadatos JSON
+#           bloque     : b"BLOQ" | gen_inicio (int64) | n_generaciones (int64) | largo (int64) | crc32 (uint32)
+#                        | datos comprimidos
+#           datos      : por generación, (generacion, n, m, k) en int64, aptitud (n x m float64),
+#                        rango (n int32) y sobrevivientes (k int32)
+#####################################################################################################
+
+import json
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from NSGAII import fast_non_dominated_sort
+
+MAGIA = b"HISTNSGA"
+VERSION_FORMATO = 1
+_ENCABEZADO = struct.Struct("<8sII")
+_BLOQUE = struct.Struct("<4sqqqI")
+_GENERACION = struct.Struct("<qqqq")
+
+
+# ------------------------------ ESCRITURA ------------------------------
+class RegistroHistorial:
+    """
+    Escribe el historial de una ejecución en un archivo de solo-agregar.
+
+    Se puede usar directamente con `agregar(...)` o conectarlo a un MotorNSGAII:
+
+        with RegistroHistorial("corrida.hist") as historial:
+            historial.conectar(motor)
+            motor.ejecutar()
+
+    Si el archivo ya existe se siguen agregando bloques al final (por ejemplo al reanudar
+    una ejecución desde un checkpoint); antes se recorta el archivo al final del último bloque
+    válido.
+
+    Atributos:
+    ----------
+    ruta : str
+        Ruta del archivo.
+    generaciones_por_bloque : int
+        Número de generaciones que se acumulan en memoria antes de comprimirlas y escribirlas.
+    """
+
+    def __init__(self, ruta, generaciones_por_bloque=50, nivel_compresion=6, metadatos=None):
+        if generaciones_por_bloque < 1:
+            raise ValueError("Cada bloque debe tener al menos una generación.")
+        self.ruta = ruta
+        self.generaciones_por_bloque = generaciones_por_bloque
+        self.nivel_compresion = nivel_compresion
+        self.n_generaciones = 0
+
+        self._pendientes = [ ]
+        self._gen_inicio = None
+
+        if os.path.exists(ruta) and os.path.getsize(ruta) > 0:
+            # Valida que sea un historial y recorta un bloque final incompleto o dañado (el proceso
+            # murió mientras se escribía); si no, los bloques nuevos quedarían detrás de él y el
+            # lector no podría separarlos
+            _, desplazamiento = _leer_encabezado(ruta)
+            _, fin_valido = _escanear_bloques(ruta, desplazamiento, verificar_crc=True)
+            if fin_valido < os.path.getsize(ruta):
+                os.truncate(ruta, fin_valido)
+            self._archivo = open(ruta, "ab")
+        else:
+            self._archivo = open(ruta, "wb")
+            datos = json.dumps(metadatos or { }).encode("utf-8")
+            self._archivo.write(_ENCABEZADO.pack(MAGIA, VERSION_FORMATO, len(datos)) + datos)
+            self._archivo.flush()
+
+    def agregar(self, generacion, aptitud, rango, sobrevivientes):
+        """
+        Agrega una generación al historial.
+
+        Args:
+            generacion (int): Número de generación.
+            aptitud (array): Matriz (n, m) con la aptitud de la población combinada.
+            rango (array): Frente (0 = primero) de cada uno de los n individuos.
+            sobrevivientes (array): Índices (en la población combinada) de los individuos que sobrevivieron.
+        """
+        aptitud = np.ascontiguousarray(aptitud, dtype=np.float64)
+        if aptitud.ndim == 1:
+            aptitud = aptitud.reshape(len(aptitud), -1)
+        rango = np.ascontiguousarray(rango, dtype=np.int32)
+        sobrevivientes = np.ascontiguousarray(sobrevivientes, dtype=np.int32)
+        if len(rango) != len(aptitud):
+            raise ValueError("Debe haber un rango por cada fila de aptitud.")
+
+        # Un bloque solo contiene generaciones consecutivas: si hay un salto se cierra el bloque actual
+        if self._gen_inicio is not None and generacion != self._gen_inicio + len(self._pendientes):
+            self.vaciar()
+        if self._gen_inicio is None:
+            self._gen_inicio = generacion
+        n, m = aptitud.shape
+        self._pendientes.append(_GENERACION.pack(generacion, n, m, len(sobrevivientes)) + aptitud.tobytes()
+                                + rango.tobytes() + sobrevivientes.tobytes())
+        self.n_generaciones += 1
+
+        if len(self._pendientes) >= self.generaciones_por_bloque:
+            self.vaciar()
+
+    def vaciar(self):
+        """Comprime las generaciones pendientes y las escribe como un bloque nuevo."""
+        if not self._pendientes:
+            return
+        comprimido = zlib.compress(b"".join(self._pendientes), self.nivel_compresion)
+        self._archivo.write(_BLOQUE.pack(b"BLOQ", self._gen_inicio, len(self._pendientes), len(comprimido),
+                                         zlib.crc32(comprimido)) + comprimido)
+        self._archivo.flush()
+        self._pendientes = [ ]
+        self._gen_inicio = None
+
+    def cerrar(self):
+        if not self._archivo.closed:
+            self.vaciar()
+            self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    # ------------------------------ Uso con MotorNSGAII ------------------------------
+    def conectar(self, motor):
+        """Registra el historial en los eventos "al_terminar_generacion" y "al_terminar" del motor."""
+        motor.registrar("al_terminar_generacion", self)
+        motor.registrar("al_terminar", lambda _motor: self.vaciar())
+        return self
+
+    def __call__(self, motor):
+        combinada = motor.poblacion_combinada
+        aptitud = np.array([np.asarray(individuo[1], dtype=float) for individuo in combinada])
+
+        # El reemplazo conserva los objetos: los sobrevivientes y los vectores de cada frente
+        # se ubican por identidad, sin repetir el ordenamiento
+        posicion = {id(individuo): i for i, individuo in enumerate(combinada)}
+        sobrevivientes = [posicion[id(individuo)] for individuo in motor.poblacion if id(individuo) in posicion]
+        rango = _rango_por_identidad(combinada, motor.frentes)
+        if rango is None:
+            _, frentes_idxs = fast_non_dominated_sort(aptitud, "minimize")
+            rango = np.empty(len(aptitud), dtype=np.int32)
+            for r, frente in enumerate(frentes_idxs):
+                rango[frente] = r
+
+        self.agregar(motor.generacion, aptitud, rango, sobrevivientes)
+
+
+def _rango_por_identidad(combinada, frentes):
+    """Rango de cada individuo a partir de los vectores de los frentes, o None si no se pueden ubicar todos."""
+    if not frentes:
+        return None
+    posicion = {id(individuo[1]): i for i, individuo in enumerate(combinada)}
+    rango = np.full(len(combinada), -1, dtype=np.int32)
+    for r, frente in enumerate(frentes):
+        for vector in frente:
+            i = posicion.get(id(vector))
+            if i is None:
+                return None
+            rango[i] = r
+    return rango if (rango >= 0).all() else None
+
+
+# ------------------------------ LECTURA ------------------------------
+def _leer_encabezado(ruta):
+    with open(ruta, "rb") as archivo:
+        crudo = archivo.read(_ENCABEZADO.size)
+        if len(crudo) < _ENCABEZADO.size:
+            raise ValueError(f"{ruta} no es un historial válido.")
+        magia, version, largo = _ENCABEZADO.unpack(crudo)
+        if magia != MAGIA:
+            raise ValueError(f"{ruta} no es un historial válido.")
+        if version != VERSION_FORMATO:
+            raise ValueError(f"Versión de historial no soportada: {version}.")
+        metadatos = json.loads(archivo.read(largo).decode("utf-8"))
+    return metadatos, _ENCABEZADO.size + largo
+
+
+def _escanear_bloques(ruta, desplazamiento, verificar_crc=False):
+    """
+    Recorre los encabezados de los bloques a partir de `desplazamiento` y se detiene en el primero
+    incompleto (marca, largo o, si se pide, crc inválidos).
+
+    Returns:
+        tuple: (bloques, fin) con una tupla (inicio de los datos, largo, crc, gen_inicio,
+        n_generaciones) por bloque válido y la posición en que termina el último de ellos.
+    """
+    bloques = [ ]
+    tamano_archivo = os.path.getsize(ruta)
+    with open(ruta, "rb") as archivo:
+        archivo.seek(desplazamiento)
+        while True:
+            crudo = archivo.read(_BLOQUE.size)
+            if len(crudo) < _BLOQUE.size:
+                break
+            marca, gen_inicio, n_generaciones, largo, crc = _BLOQUE.unpack(crudo)
+            inicio_datos = archivo.tell()
+            if marca != b"BLOQ" or largo < 0 or inicio_datos + largo > tamano_archivo:
+                break
+            if verificar_crc:
+                if zlib.crc32(archivo.read(largo)) != crc:
+                    break
+            else:
+                archivo.seek(largo, os.SEEK_CUR)
+            bloques.append((inicio_datos, largo, crc, gen_inicio, n_generaciones))
+            desplazamiento = inicio_datos + largo
+    return bloques, desplazamiento
+
+
+class LectorHistorial:
+    """
+    Lectura perezosa de un historial.
+
+    Al abrirlo solo se leen los encabezados de los bloques para construir el índice; los datos de
+    una generación se descomprimen cuando se piden (se conserva en memoria únicamente el último
+    bloque leído). Un bloque final incompleto (por ejemplo, si el proceso murió mientras se
+    escribía) se ignora.
+
+    Atributos:
+    ----------
+    metadatos : dict
+        Metadatos guardados al crear el historial.
+    generaciones : list
+        Números de generación disponibles, en el orden en que se escribieron por primera vez.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.metadatos, desplazamiento = _leer_encabezado(ruta)
+
+        self._bloques = [ ]       # (desplazamiento de los datos, largo, crc)
+        self._ubicacion = { }     # generación -> (número de bloque, posición dentro del bloque)
+        self.generaciones = [ ]
+        bloques, _ = _escanear_bloques(ruta, desplazamiento)
+        for inicio_datos, largo, crc, gen_inicio, n_generaciones in bloques:
+            self._bloques.append((inicio_datos, largo, crc))
+            self._indexar_bloque(len(self._bloques) - 1, gen_inicio, n_generaciones)
+
+        self._bloque_en_memoria = (None, None)
+
+    def _indexar_bloque(self, numero, gen_inicio, n_generaciones):
+        # Las generaciones de un bloque son consecutivas. Si una generación aparece en varios
+        # bloques (una ejecución reanudada que repite generaciones) vale la más reciente
+        for posicion in range(n_generaciones):
+            generacion = gen_inicio + posicion
+            if generacion not in self._ubicacion:
+                self.generaciones.append(generacion)
+            self._ubicacion[generacion] = (numero, posicion)
+
+    def _decodificar_bloque(self, numero):
+        if self._bloque_en_memoria[0] == numero:
+            return self._bloque_en_memoria[1]
+
+        inicio, largo, crc = self._bloques[numero]
+        with open(self.ruta, "rb") as archivo:
+            archivo.seek(inicio)
+            comprimido = archivo.read(largo)
+        if zlib.crc32(comprimido) != crc:
+            raise ValueError(f"El bloque {numero} del historial está dañado.")
+        datos = memoryview(zlib.decompress(comprimido))
+
+        generaciones = [ ]
+        desplazamiento = 0
+        while desplazamiento < len(datos):
+            generacion, n, m, k = _GENERACION.unpack_from(datos, desplazamiento)
+            desplazamiento += _GENERACION.size
+            aptitud = np.frombuffer(datos, np.float64, n * m, desplazamiento).reshape(n, m)
+            desplazamiento += aptitud.nbytes
+            rango = np.frombuffer(datos, np.int32, n, desplazamiento)
+            desplazamiento += rango.nbytes
+            sobrevivientes = np.frombuffer(datos, np.int32, k, desplazamiento)
+            desplazamiento += sobrevivientes.nbytes
+            generaciones.append({"generacion": generacion, "aptitud": aptitud, "rango": rango,
+                                 "sobrevivientes": sobrevivientes})
+
+        self._bloque_en_memoria = (numero, generaciones)
+        return generaciones
+
+    def leer(self, generacion):
+        """
+        Regresa los datos de una generación.
+
+        Returns:
+            dict: {"generacion", "aptitud" (n, m), "rango" (n,), "sobrevivientes" (k,)}. Los arreglos
+            son de solo lectura.
+        """
+        if generacion not in self._ubicacion:
+            raise KeyError(f"La generación {generacion} no está en el historial.")
+        numero, posicion = self._ubicacion[generacion]
+        return self._decodificar_bloque(numero)[posicion]
+
+    def frentes(self, generacion):
+        """
+        Frentes de una generación en el formato de `graficas_P1`: lista de frentes, cada uno una
+        lista de arreglos [f1, f2, ...].
+        """
+        datos = self.leer(generacion)
+        rango = datos["rango"]
+        if len(rango) == 0:
+            return [ ]
+        return [list(datos["aptitud"][rango == r]) for r in range(int(rango.max()) + 1)]
+
+    def sobrevivientes(self, generacion):
+        """Matriz de aptitud de los individuos que sobrevivieron en la generación."""
+        datos = self.leer(generacion)
+        return datos["aptitud"][datos["sobrevivientes"]]
+
+    def __len__(self):
+        return len(self.generaciones)
+
+    def __contains__(self, generacion):
+        return generacion in self._ubicacion
+
+    def __iter__(self):
+        for generacion in self.generaciones:
+            yield self.leer(generacion)
+
+    def __repr__(self):
+        return f"LectorHistorial(ruta={self.ruta!r}, generaciones={len(self)}, bloques={len(self._bloques)})"
@@ -0,0 +1,163 @@
+#####################################################################################################
+#       instancia.py
+#       Instancia compilada del problema de asignación de tareas (job-shop flexible).
+#           Los datos que regresan `cargar_matriz_operaciones_maquina` y `cargar_matriz_tareas`
+#           se transforman una sola vez en arreglos planos y contiguos indexados por gen,
+#           para que el decodificador no repita la aritmética de índices en cada evaluación.
+#####################################################################################################
+
+import numpy as np
+
+
+class InstanciaProblema:
+    """
+    Representación compilada de una instancia del problema de asignación de tareas.
+
+    El gen g del cromosoma corresponde a la operación `operacion_gen[g]` de la tarea
+    `tarea_gen[g]`, en el mismo orden en que `evaluar_fitness` recorre `l_tsk_oper`.
+
+    Atributos:
+    ----------
+    operacion_gen : np.ndarray
+        Id de la operación (base 1) de cada gen.
+    tarea_gen : np.ndarray
+        Índice de la tarea (base 0) a la que pertenece cada gen.
+    inicio_tareas : np.ndarray
+        Posición del primer gen de cada tarea. Tiene n_tareas + 1 elementos, el último es n_genes.
+    tiempos_gen : np.ndarray
+        Matriz (n_genes, n_maquinas) con la duración de la operación de cada gen en cada máquina.
+    energia_gen : np.ndarray
+        Matriz (n_genes, n_maquinas) con el consumo de energía de la operación de cada gen en cada máquina.
+    """
+
+    def __init__(self, mtx_op_t, mtx_op_e, l_tsk_oper):
+        """
+        Parámetros:
+        -----------
+        mtx_op_t : list | np.ndarray
+            Matriz operaciones-máquinas con los tiempos.
+        mtx_op_e : list | np.ndarray | None
+            Matriz operaciones-máquinas con la energía. Si es None se usan ceros
+            (útil cuando solo se necesitan los tiempos, como en el visualizador).
+        l_tsk_oper : list
+            Lista de listas con las operaciones (base 1) de cada tarea.
+        """
+        mtx_op_t = np.asarray(mtx_op_t, dtype=float)
+        if mtx_op_e is None:
+            mtx_op_e = np.zeros_like(mtx_op_t)
+        mtx_op_e = np.asarray(mtx_op_e, dtype=float)
+        if mtx_op_t.shape != mtx_op_e.shape:
+            raise ValueError("Las matrices de tiempo y energía deben tener las mismas dimensiones.")
+
+        longitudes = [len(operaciones) for operaciones in l_tsk_oper]
+        self.inicio_tareas = np.zeros(len(l_tsk_oper) + 1, dtype=np.intp)
+        self.inicio_tareas[1:] = np.cumsum(longitudes)
+
+        self.operacion_gen = np.array([op for operaciones in l_tsk_oper for op in operaciones], dtype=np.intp)
+        self.tarea_gen = np.repeat(np.arange(len(l_tsk_oper), dtype=np.intp), longitudes)
+
+        if self.operacion_gen.size and (self.operacion_gen.min() < 1 or self.operacion_gen.max() > mtx_op_t.shape[0]):
+            raise ValueError("Las tareas hacen referencia a operaciones que no existen en las matrices.")
+
+        # Se pre-reúnen las filas de cada operación en el orden de los genes
+        self.tiempos_gen = np.ascontiguousarray(mtx_op_t[self.operacion_gen - 1])
+        self.energia_gen = np.ascontiguousarray(mtx_op_e[self.operacion_gen - 1])
+
+        # Índices auxiliares que el decodificador usa en cada evaluación
+        self.idx_genes = np.arange(len(self.operacion_gen))
+        self.tarea_gen_lista = self.tarea_gen.tolist()
+
+        # Datos originales, por si algún consumidor los necesita
+        self.mtx_op_t = mtx_op_t
+        self.mtx_op_e = mtx_op_e
+        self.l_tsk_oper = [list(operaciones) for operaciones in l_tsk_oper]
+
+    # Arreglos a partir de los cuales se puede reconstruir la instancia (ver `desde_tablas`)
+    _TABLAS = ("operacion_gen", "tarea_gen", "inicio_tareas", "tiempos_gen", "energia_gen", "mtx_op_t", "mtx_op_e")
+
+    def tablas(self):
+        """
+        Regresa un diccionario {nombre: arreglo} con los arreglos que definen la instancia.
+
+        Sirve para copiar la instancia a otro lugar (por ejemplo, memoria compartida entre
+        procesos) y reconstruirla después con `desde_tablas` sin volver a compilarla.
+        """
+        return {nombre: getattr(self, nombre) for nombre in self._TABLAS}
+
+    @classmethod
+    def desde_tablas(cls, tablas):
+        """
+        Reconstruye una instancia a partir del diccionario que regresa `tablas`.
+
+        Los arreglos se usan tal cual, sin copiarlos, así que pueden vivir en memoria compartida.
+        """
+        instancia = cls.__new__(cls)
+        for nombre in cls._TABLAS:
+            setattr(instancia, nombre, tablas[nombre])
+
+        instancia.idx_genes = np.arange(len(instancia.operacion_gen))
+        instancia.tarea_gen_lista = instancia.tarea_gen.tolist()
+        inicio = instancia.inicio_tareas.tolist()
+        operaciones = instancia.operacion_gen.tolist()
+        instancia.l_tsk_oper = [operaciones[a:b] for a, b in zip(inicio[:-1], inicio[1:])]
+        return instancia
+
+    @property
+    def n_genes(self):
+        return len(self.operacion_gen)
+
+    @property
+    def n_tareas(self):
+        return len(self.inicio_tareas) - 1
+
+    @property
+    def n_maquinas(self):
+        return self.mtx_op_t.shape[1]
+
+    def __repr__(self):
+        return (f"InstanciaProblema(n_tareas={self.n_tareas}, n_genes={self.n_genes}, "
+                f"n_maquinas={self.n_maquinas})")
+
+
+# Última instancia compilada a partir de matrices crudas: (mtx_op_t, mtx_op_e, l_tsk_oper, instancia)
+_ULTIMA_COMPILACION = None
+
+
+def compilar_instancia(mtx_op_t, mtx_op_e=None, l_tsk_oper=None):
+    """
+    Regresa la InstanciaProblema correspondiente a los datos recibidos.
+
+    Si `mtx_op_t` ya es una InstanciaProblema se regresa tal cual. En otro caso se compila
+    a partir de las matrices y la lista de tareas. La última compilación se recuerda por
+    identidad de los objetos, así que llamar repetidamente con las mismas matrices (como hacen
+    los operadores generación tras generación) no vuelve a compilar. Si se modifican las
+    matrices o la lista en sitio, se debe crear una InstanciaProblema nueva de forma explícita.
+
+    Parámetros:
+    -----------
+    mtx_op_t : InstanciaProblema | list | np.ndarray
+        Instancia compilada o matriz operaciones-máquinas con los tiempos.
+    mtx_op_e : list | np.ndarray | None
+        Matriz operaciones-máquinas con la energía.
+    l_tsk_oper : list | None
+        Lista con las operaciones de cada tarea.
+
+    Retorna:
+    --------
+    InstanciaProblema
+    """
+    global _ULTIMA_COMPILACION
+
+    if isinstance(mtx_op_t, InstanciaProblema):
+        return mtx_op_t
+    if l_tsk_oper is None:
+        raise ValueError("Se necesita la lista de tareas para compilar la instancia.")
+
+    if _ULTIMA_COMPILACION is not None:
+        t, e, l, instancia = _ULTIMA_COMPILACION
+        if t is mtx_op_t and e is mtx_op_e and l is l_tsk_oper:
+            return instancia
+
+    instancia = InstanciaProblema(mtx_op_t, mtx_op_e, l_tsk_oper)
+    _ULTIMA_COMPILACION = (mtx_op_t, mtx_op_e, l_tsk_oper, instancia)
+    return instancia
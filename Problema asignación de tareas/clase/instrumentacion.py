@@ -0,0 +1,262 @@
+#####################################################################################################
+#       instrumentacion.py
+#       Medición por etapas de una ejecución de MotorNSGAII.
+#           Se activa por ejecución con `Instrumentacion().conectar(motor)`. Registra, en cada
+#           generación, el tiempo (reloj monotónico) de selección, cruza, mutación, evaluación y
+#           reemplazo, el número de evaluaciones de aptitud, las comparaciones de dominancia, el
+#           número de frentes y el tamaño del primer frente. Al final imprime una tabla resumen.
+#           Opcionalmente captura cProfile y/o tracemalloc en una ventana de generaciones.
+#####################################################################################################
+
+import cProfile
+import pstats
+import time
+import tracemalloc
+
+import numpy as np
+
+from NSGAII import ESTADISTICAS
+from algoritmo_genetico import evaluar_fitness_poblacion
+
+# Etapas que se miden; "otros" es el resto del tiempo de la generación (hooks, criterios de paro)
+ETAPAS = ("seleccion", "cruza", "mutacion", "evaluacion", "reemplazo", "otros")
+
+
+class _EvaluadorMedido:
+    """
+    Evaluador por lotes (ver `evaluar_fitness_poblacion(evaluador=...)`) que mide el tiempo de
+    decodificación y cuenta los cromosomas evaluados. Con caché solo llegan aquí los que no
+    estaban en ella, así que el conteo es de evaluaciones reales.
+    """
+
+    def __init__(self, instancia, base=None):
+        self.instancia = instancia
+        self.base = base
+        self.tiempo = 0.0
+        self.n_evaluaciones = 0
+
+    def evaluar(self, poblacion_genes):
+        inicio = time.perf_counter()
+        if self.base is not None:
+            aptitudes = self.base.evaluar(poblacion_genes)
+        else:
+            aptitudes = evaluar_fitness_poblacion(poblacion_genes, self.instancia)
+        self.tiempo += time.perf_counter() - inicio
+        self.n_evaluaciones += len(aptitudes)
+        return aptitudes
+
+    def __call__(self, poblacion_genes):
+        return self.evaluar(poblacion_genes)
+
+
+class Instrumentacion:
+    """
+    Instrumentación de baja sobrecarga para MotorNSGAII.
+
+        instrumentacion = Instrumentacion(perfilar=(100, 109), memoria=True).conectar(motor)
+        motor.ejecutar()                       # imprime el resumen al terminar
+        instrumentacion.imprimir_perfil(15)    # cProfile de las generaciones 100 a 109
+
+    Los operadores del motor se envuelven con funciones que toman el tiempo con
+    `time.perf_counter`. La evaluación se mide con un evaluador envoltorio, y su tiempo se
+    descuenta de la cruza y la mutación, que son las etapas que la llaman. Con `checkpoints` la
+    evaluación incremental no pasa por el evaluador y queda incluida en la cruza y la mutación.
+
+    Atributos:
+    ----------
+    generaciones : list
+        Un diccionario por generación con los tiempos (segundos) de cada etapa, "total",
+        "evaluaciones", "comparaciones_dominancia", "n_frentes" y "tam_primer_frente".
+    perfil : pstats.Stats | None
+        Perfil de cProfile de la ventana indicada.
+    memoria : list | None
+        Estadísticas de tracemalloc (diferencia entre el inicio y el fin de la ventana).
+    pico_memoria : int | None
+        Pico de memoria (bytes) que registró tracemalloc durante la ventana.
+    """
+
+    def __init__(self, perfilar=None, memoria=False, imprimir_al_terminar=True):
+        """
+        Parámetros:
+        -----------
+        perfilar : tuple | None
+            (primera, ultima) generación (base 0, inclusiva) en la que se activan las capturas.
+            Si es None no se captura nada aunque se pida `memoria`.
+        memoria : bool
+            Si es True, además de cProfile se captura la memoria con tracemalloc en la misma ventana.
+        imprimir_al_terminar : bool
+            Imprime la tabla resumen en el evento "al_terminar" del motor.
+        """
+        self.ventana = perfilar
+        self.capturar_memoria = memoria
+        self.imprimir_al_terminar = imprimir_al_terminar
+
+        self.generaciones = [ ]
+        self.perfil = None
+        self.memoria = None
+        self.pico_memoria = None
+
+        self._actual = None
+        self._inicio_generacion = None
+        self._comparaciones_inicio = 0
+        self._evaluador = None
+        self._perfilador = None
+        self._foto_memoria = None
+
+    # ------------------------------ Conexión con el motor ------------------------------
+    def _medir(self, etapa, funcion):
+        def medida(*args, **kwargs):
+            evaluacion_antes = self._evaluador.tiempo
+            inicio = time.perf_counter()
+            resultado = funcion(*args, **kwargs)
+            transcurrido = time.perf_counter() - inicio
+            if self._actual is not None:
+                self._actual[etapa] += transcurrido - (self._evaluador.tiempo - evaluacion_antes)
+            return resultado
+        medida.__wrapped__ = funcion
+        return medida
+
+    def conectar(self, motor):
+        """Envuelve los operadores y el evaluador del motor y registra los hooks. Regresa la instrumentación."""
+        self._evaluador = _EvaluadorMedido(motor.instancia, motor.evaluador)
+        motor.evaluador = self._evaluador
+        motor.seleccion = self._medir("seleccion", motor.seleccion)
+        motor.cruza = self._medir("cruza", motor.cruza)
+        motor.mutacion = self._medir("mutacion", motor.mutacion)
+        motor.reemplazo = self._medir("reemplazo", motor.reemplazo)
+
+        motor.registrar("al_iniciar", self._al_iniciar)
+        motor.registrar("al_terminar_generacion", self._al_terminar_generacion)
+        motor.registrar("al_terminar", self._al_terminar)
+        return self
+
+    def _nueva_generacion(self, motor):
+        self._actual = dict.fromkeys(ETAPAS, 0.0)
+        self._evaluaciones_inicio = self._evaluador.n_evaluaciones
+        self._tiempo_evaluacion_inicio = self._evaluador.tiempo
+        self._comparaciones_inicio = ESTADISTICAS["comparaciones_dominancia"]
+        if self.ventana is not None and motor.generacion == self.ventana[0]:
+            self._iniciar_captura()
+        self._inicio_generacion = time.perf_counter()
+
+    def _al_iniciar(self, motor):
+        self._nueva_generacion(motor)
+
+    def _al_terminar_generacion(self, motor):
+        registro = self._actual
+        if registro is None:
+            # La ejecución se reanudó sin pasar por "al_iniciar"
+            self._nueva_generacion(motor)
+            return
+        registro["total"] = time.perf_counter() - self._inicio_generacion
+        registro["evaluacion"] = self._evaluador.tiempo - self._tiempo_evaluacion_inicio
+        registro["otros"] = max(registro["total"] - sum(registro[etapa] for etapa in ETAPAS[:-1]), 0.0)
+        registro["generacion"] = motor.generacion - 1
+        registro["evaluaciones"] = self._evaluador.n_evaluaciones - self._evaluaciones_inicio
+        registro["comparaciones_dominancia"] = ESTADISTICAS["comparaciones_dominancia"] - self._comparaciones_inicio
+        registro["n_frentes"] = len(motor.frentes) if motor.frentes else 0
+        registro["tam_primer_frente"] = len(motor.frentes[0]) if motor.frentes else 0
+        self.generaciones.append(registro)
+
+        if self.ventana is not None and motor.generacion - 1 == self.ventana[1]:
+            self._terminar_captura()
+        self._nueva_generacion(motor)
+
+    def _al_terminar(self, motor):
+        self._terminar_captura()
+        self._actual = None
+        if self.imprimir_al_terminar:
+            self.imprimir_resumen()
+
+    # ------------------------------ cProfile / tracemalloc ------------------------------
+    def _iniciar_captura(self):
+        if self.capturar_memoria:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._foto_memoria = tracemalloc.take_snapshot()
+        self._perfilador = cProfile.Profile()
+        self._perfilador.enable()
+
+    def _terminar_captura(self):
+        if self._perfilador is None:
+            return
+        self._perfilador.disable()
+        self.perfil = pstats.Stats(self._perfilador)
+        self._perfilador = None
+        if self._foto_memoria is not None:
+            # Se excluyen las asignaciones del propio perfilador y de tracemalloc
+            filtros = [tracemalloc.Filter(False, cProfile.__file__), tracemalloc.Filter(False, tracemalloc.__file__)]
+            self.memoria = (tracemalloc.take_snapshot().filter_traces(filtros)
+                            .compare_to(self._foto_memoria.filter_traces(filtros), "lineno"))
+            self.pico_memoria = tracemalloc.get_traced_memory()[1]
+            self._foto_memoria = None
+            tracemalloc.stop()
+
+    # ------------------------------ Resultados ------------------------------
+    def resumen(self):
+        """
+        Resumen de todas las generaciones registradas.
+
+        Returns:
+            dict: {"etapas": {etapa: {"total_s", "porcentaje", "media_ms", "p50_ms", "p95_ms"}},
+                   "generaciones", "tiempo_total_s", "evaluaciones", "evaluaciones_por_segundo",
+                   "comparaciones_dominancia", "n_frentes_medio", "tam_primer_frente_medio"}
+        """
+        if not self.generaciones:
+            return {"etapas": {}, "generaciones": 0}
+        total = sum(registro["total"] for registro in self.generaciones)
+        etapas = {}
+        for etapa in ETAPAS:
+            tiempos = np.array([registro[etapa] for registro in self.generaciones])
+            p50, p95 = np.percentile(tiempos, (50, 95))
+            etapas[etapa] = {"total_s": float(tiempos.sum()),
+                             "porcentaje": float(100 * tiempos.sum() / total) if total > 0 else 0.0,
+                             "media_ms": float(tiempos.mean() * 1e3), "p50_ms": float(p50 * 1e3),
+                             "p95_ms": float(p95 * 1e3)}
+        evaluaciones = sum(registro["evaluaciones"] for registro in self.generaciones)
+        tiempo_evaluacion = etapas["evaluacion"]["total_s"]
+        return {
+            "etapas": etapas,
+            "generaciones": len(self.generaciones),
+            "tiempo_total_s": total,
+            "evaluaciones": evaluaciones,
+            "evaluaciones_por_segundo": evaluaciones / tiempo_evaluacion if tiempo_evaluacion > 0 else None,
+            "comparaciones_dominancia": sum(r["comparaciones_dominancia"] for r in self.generaciones),
+            "n_frentes_medio": float(np.mean([r["n_frentes"] for r in self.generaciones])),
+            "tam_primer_frente_medio": float(np.mean([r["tam_primer_frente"] for r in self.generaciones])),
+        }
+
+    def imprimir_resumen(self):
+        resumen = self.resumen()
+        if not resumen["generaciones"]:
+            print("Instrumentación: no se registraron generaciones.")
+            return
+        print(f"\n{'etapa':<12}{'total (s)':>11}{'%':>8}{'media (ms)':>12}{'p50 (ms)':>10}{'p95 (ms)':>10}")
+        for etapa, datos in resumen["etapas"].items():
+            print(f"{etapa:<12}{datos['total_s']:>11.3f}{datos['porcentaje']:>8.1f}{datos['media_ms']:>12.3f}"
+                  f"{datos['p50_ms']:>10.3f}{datos['p95_ms']:>10.3f}")
+        print(f"{'total':<12}{resumen['tiempo_total_s']:>11.3f}")
+        eval_s = resumen["evaluaciones_por_segundo"]
+        print(f"\nGeneraciones: {resumen['generaciones']}   Evaluaciones: {resumen['evaluaciones']}"
+              + (f" ({eval_s:,.0f} por segundo de evaluación)" if eval_s else ""))
+        print(f"Comparaciones de dominancia: {resumen['comparaciones_dominancia']:,}   "
+              f"Frentes por generación: {resumen['n_frentes_medio']:.1f}   "
+              f"Tamaño medio del primer frente: {resumen['tam_primer_frente_medio']:.1f}")
+        if self.pico_memoria is not None:
+            print(f"Pico de memoria en la ventana perfilada: {self.pico_memoria / 2**20:.2f} MiB")
+
+    def imprimir_perfil(self, n_funciones=20, orden="cumulative"):
+        """Imprime las funciones más costosas de la ventana perfilada con cProfile."""
+        if self.perfil is None:
+            print("No hay perfil: indique perfilar=(primera, ultima) y ejecute esas generaciones.")
+            return
+        self.perfil.sort_stats(orden).print_stats(n_funciones)
+
+    def imprimir_memoria(self, n_lineas=10):
+        """Imprime las líneas que más memoria asignaron durante la ventana perfilada."""
+        if self.memoria is None:
+            print("No hay captura de memoria: indique perfilar=(primera, ultima) y memoria=True.")
+            return
+        for estadistica in self.memoria[:n_lineas]:
+            print(estadistica)
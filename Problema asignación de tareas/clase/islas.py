@@ -0,0 +1,246 @@
+#####################################################################################################
+#       islas.py
+#       Modelo de islas para NSGA-II.
+#           Varias poblaciones evolucionan de forma independiente, cada una en su propio proceso,
+#           con los mismos operadores de `algoritmo_genetico.py` (torneo, crearHijos, mutación por
+#           desplazamiento y nueva_poblacion). Cada K generaciones cada isla envía a otra una
+#           parte de su primer frente (topología en anillo o aleatoria). Al final se fusionan
+#           las poblaciones y se regresa el frente de Pareto global.
+#####################################################################################################
+
+import multiprocessing as mp
+import queue
+import random
+
+import numpy as np
+
+from NSGAII import fast_non_dominated_sort, sobrevivientes_dist_crowding
+from instancia import compilar_instancia
+from algoritmo_genetico import (generar_poblacion_inicial, seleccion_por_torneo, crearHijos,
+                                mutar_poblacion_por_desplazamiento, nueva_poblacion)
+
+TOPOLOGIAS = ("anillo", "aleatoria")
+
+
+# ------------------------------- TOPOLOGÍA --------------------------------
+def destino_migracion(id_isla, n_islas, epoca, topologia, semilla):
+    """
+    Regresa la isla a la que `id_isla` envía sus migrantes en la época de migración `epoca`.
+
+    - "anillo": la isla i envía a la isla (i + 1) mod n.
+    - "aleatoria": en cada época se sortea una permutación sin puntos fijos (nadie se envía a sí
+      mismo). Todas las islas calculan la misma permutación a partir de (semilla, época), así que
+      cada isla recibe exactamente un mensaje por época sin necesidad de coordinarse.
+    """
+    if n_islas < 2:
+        raise ValueError("La migración necesita al menos dos islas.")
+    if topologia == "anillo":
+        return (id_isla + 1) % n_islas
+    if topologia == "aleatoria":
+        generador = random.Random(semilla * 1000003 + epoca)
+        destinos = list(range(n_islas))
+        while any(i == d for i, d in enumerate(destinos)):
+            generador.shuffle(destinos)
+        return destinos[id_isla]
+    raise ValueError(f"Topología no válida: {topologia}. Use una de {TOPOLOGIAS}.")
+
+
+# ------------------------------- MIGRACIÓN --------------------------------
+def elegir_migrantes(poblacion, n_migrantes):
+    """
+    Elige hasta `n_migrantes` individuos del primer frente de la población.
+
+    Si el frente tiene más individuos de los necesarios, se prefieren los de mayor distancia
+    de crowding, para enviar la parte más dispersa del frente.
+    """
+    aptitudes = [individuo[1] for individuo in poblacion]
+    _, frentes_idxs = fast_non_dominated_sort(aptitudes, "minimize")
+    primer_frente = frentes_idxs[0]
+    _, elegidos = sobrevivientes_dist_crowding([aptitudes[i] for i in primer_frente], n_migrantes)
+    return [[list(poblacion[primer_frente[i]][0]), np.array(poblacion[primer_frente[i]][1])] for i in elegidos]
+
+
+def _recibir_migrantes(cola, epoca, pendientes):
+    """
+    Espera los migrantes de la época indicada. Los mensajes de épocas posteriores que lleguen
+    antes (de una isla que va más adelantada) se guardan en `pendientes`.
+    """
+    while epoca not in pendientes:
+        epoca_mensaje, migrantes = cola.get()
+        pendientes[epoca_mensaje] = migrantes
+    return pendientes.pop(epoca)
+
+
+# ------------------------------- CICLO DE UNA ISLA --------------------------------
+def evolucionar_isla(id_isla, instancia, config, colas=None):
+    """
+    Ejecuta el ciclo NSGA-II de una isla.
+
+    Args:
+        id_isla (int): Índice de la isla.
+        instancia (InstanciaProblema): Instancia compilada del problema.
+        config (dict): Parámetros del algoritmo (ver `ejecutar_islas`).
+        colas (list, opcional): Una cola de entrada por isla. Si es None no hay migración.
+
+    Returns:
+        list: Población final con el formato [[cromosoma], [f1, f2]].
+    """
+    semilla = config["semilla"]
+    # Semillas independientes por isla: con semilla + id_isla, las corridas con semillas s y s + 1
+    # compartirían casi todos los flujos de números aleatorios
+    secuencia = np.random.SeedSequence(semilla).spawn(config["n_islas"])[id_isla]
+    random.seed(int(secuencia.generate_state(1, np.uint64)[0]))
+    np.random.seed(secuencia.generate_state(4))
+
+    tam_poblacion = config["tam_poblacion"]
+    poblacion = generar_poblacion_inicial(tam_poblacion, instancia.n_genes, instancia)
+    por_crowding = config.get("por_crowding", False)
+    if por_crowding:
+        poblacion, _, _, _, rango, crowding = nueva_poblacion(poblacion, tam_poblacion, por_crowding=True)
+
+    n_islas = config["n_islas"]
+    intervalo = config["intervalo_migracion"]
+    migrar = colas is not None and n_islas > 1 and config["n_migrantes"] > 0
+    pendientes = { }
+
+    for generacion in range(1, config["n_generaciones"] + 1):
+        if por_crowding:
+            idx_padres = seleccion_por_torneo(poblacion, config["k_torneo"], "minimize", rango=rango, crowding=crowding)
+        else:
+            idx_padres = seleccion_por_torneo(poblacion, config["k_torneo"], "minimize")
+        hijos = crearHijos(poblacion, idx_padres, config["p_cruza"], config["n_puntos_cruza"], instancia)
+        hijos = mutar_poblacion_por_desplazamiento(hijos, config["p_mutacion"], instancia)
+        if por_crowding:
+            poblacion, _, _, _, rango, crowding = nueva_poblacion(poblacion + hijos, tam_poblacion, por_crowding=True)
+        else:
+            poblacion, _, _, _ = nueva_poblacion(poblacion + hijos, tam_poblacion)
+
+        # No se migra en la última generación: los migrantes ya no tendrían efecto
+        if migrar and generacion % intervalo == 0 and generacion < config["n_generaciones"]:
+            epoca = generacion // intervalo
+            destino = destino_migracion(id_isla, n_islas, epoca, config["topologia"], semilla)
+            colas[destino].put((epoca, elegir_migrantes(poblacion, config["n_migrantes"])))
+
+            # Los migrantes compiten con la población local en el reemplazo habitual
+            migrantes = _recibir_migrantes(colas[id_isla], epoca, pendientes)
+            if por_crowding:
+                poblacion, _, _, _, rango, crowding = nueva_poblacion(poblacion + migrantes, tam_poblacion,
+                                                                      por_crowding=True)
+            else:
+                poblacion, _, _, _ = nueva_poblacion(poblacion + migrantes, tam_poblacion)
+
+    return poblacion
+
+
+def _proceso_isla(id_isla, instancia, config, colas, cola_resultados):
+    """Punto de entrada de cada proceso: evoluciona la isla y envía su población final."""
+    try:
+        cola_resultados.put((id_isla, evolucionar_isla(id_isla, instancia, config, colas), None))
+    except Exception as error:  # Se reporta al proceso principal en lugar de dejarlo esperando
+        cola_resultados.put((id_isla, None, repr(error)))
+        raise
+
+
+# ------------------------------- FUSIÓN DE FRENTES --------------------------------
+def fusionar_frentes(poblaciones):
+    """
+    Fusiona varias poblaciones y regresa los individuos del primer frente global.
+
+    Los cromosomas repetidos (el mismo individuo puede vivir en varias islas por la
+    migración) se cuentan una sola vez.
+
+    Args:
+        poblaciones (list): Lista de poblaciones con el formato [[cromosoma], [f1, f2]].
+
+    Returns:
+        list: Individuos no dominados del conjunto, con el mismo formato.
+    """
+    unicos = { }
+    for poblacion in poblaciones:
+        for individuo in poblacion:
+            unicos.setdefault(tuple(individuo[0]), individuo)
+    individuos = list(unicos.values())
+    if not individuos:
+        return [ ]
+
+    _, frentes_idxs = fast_non_dominated_sort([individuo[1] for individuo in individuos], "minimize")
+    return [individuos[i] for i in frentes_idxs[0]]
+
+
+# ------------------------------- MOTOR DE ISLAS --------------------------------
+def ejecutar_islas(mtx_op_t, mtx_op_e=None, l_tsk_oper=None, n_islas=4, tam_poblacion=150, n_generaciones=500,
+                   p_cruza=0.7, n_puntos_cruza=3, p_mutacion=0.3, k_torneo=2, intervalo_migracion=10,
+                   n_migrantes=5, topologia="anillo", semilla=None, por_crowding=False):
+    """
+    Ejecuta NSGA-II con el modelo de islas, una isla por proceso.
+
+    Args:
+        mtx_op_t (list | InstanciaProblema): matriz con la relación de operaciones-tiempo,
+            o una instancia compilada (en cuyo caso mtx_op_e y l_tsk_oper no se usan).
+        mtx_op_e (list): matriz con la relación de operaciones-energía
+        l_tsk_oper (list): lista con las operaciones de cada tarea
+        n_islas (int): Número de islas (procesos).
+        tam_poblacion (int): Tamaño de la población de CADA isla.
+        n_generaciones (int): Número de generaciones de cada isla.
+        p_cruza (float): Probabilidad de cruza.
+        n_puntos_cruza (int): Número de puntos de cruza.
+        p_mutacion (float): Probabilidad de mutación de cada hijo.
+        k_torneo (int): Tamaño del torneo.
+        intervalo_migracion (int): Cada cuántas generaciones se migra (K).
+        n_migrantes (int): Número de individuos del primer frente que envía cada isla.
+        topologia (str): "anillo" o "aleatoria".
+        semilla (int, opcional): Semilla global; la isla i usa la i-ésima semilla que deriva
+            `np.random.SeedSequence(semilla).spawn(n_islas)`. Con la misma semilla se obtienen los
+            mismos resultados.
+        por_crowding (bool): Si es True, el torneo usa el rango y la distancia de crowding que
+            calculó el reemplazo (ver `MotorNSGAII`).
+
+    Returns:
+        frente (list): Individuos del frente de Pareto fusionado, formato [[cromosoma], [f1, f2]].
+        poblaciones (list): Población final de cada isla, en orden de isla.
+    """
+    if n_islas < 1:
+        raise ValueError("Se necesita al menos una isla.")
+    if intervalo_migracion < 1:
+        raise ValueError("El intervalo de migración debe ser al menos 1.")
+    if topologia not in TOPOLOGIAS:
+        raise ValueError(f"Topología no válida: {topologia}. Use una de {TOPOLOGIAS}.")
+
+    instancia = compilar_instancia(mtx_op_t, mtx_op_e, l_tsk_oper)
+    config = {
+        "n_islas": n_islas, "tam_poblacion": tam_poblacion, "n_generaciones": n_generaciones,
+        "p_cruza": p_cruza, "n_puntos_cruza": n_puntos_cruza, "p_mutacion": p_mutacion, "k_torneo": k_torneo,
+        "intervalo_migracion": intervalo_migracion, "n_migrantes": n_migrantes, "topologia": topologia,
+        "semilla": semilla if semilla is not None else random.randrange(2**31), "por_crowding": por_crowding,
+    }
+
+    contexto = mp.get_context()
+    colas = [contexto.Queue() for _ in range(n_islas)]
+    cola_resultados = contexto.Queue()
+    procesos = [contexto.Process(target=_proceso_isla, args=(i, instancia, config, colas, cola_resultados), daemon=True)
+                for i in range(n_islas)]
+    for proceso in procesos:
+        proceso.start()
+
+    # Los resultados se leen ANTES de esperar a los procesos: una cola con datos pendientes
+    # impide que el proceso que la llenó termine
+    poblaciones = [None] * n_islas
+    try:
+        for _ in range(n_islas):
+            while True:
+                try:
+                    id_isla, poblacion, error = cola_resultados.get(timeout=1.0)
+                    break
+                except queue.Empty:
+                    if any(p.exitcode not in (None, 0) for p in procesos):
+                        raise RuntimeError("Un proceso de isla terminó de forma inesperada.")
+            if error is not None:
+                raise RuntimeError(f"La isla {id_isla} falló: {error}")
+            poblaciones[id_isla] = poblacion
+    finally:
+        for proceso in procesos:
+            if poblaciones.count(None) and proceso.is_alive():
+                proceso.terminate()
+            proceso.join()
+
+    return fusionar_frentes(poblaciones), poblaciones
@@ -0,0 +1,305 @@
+#####################################################################################################
+#       motor_nsga2.py
+#       Motor de NSGA-II para el problema de asignación de tareas.
+#           Encapsula el ciclo que antes vivía en el notebook (selección, cruza, mutación y
+#           reemplazo) para poder ejecutarlo sin notebook, cambiar operadores y engancharle
+#           funciones (hooks) en cada etapa: evaluadores, archivos, instrumentación, etc.
+#####################################################################################################
+
+import random
+import time
+
+import numpy as np
+
+from instancia import compilar_instancia
+from algoritmo_genetico import (ESTADISTICAS_EVALUACION, generar_poblacion_inicial, seleccion_por_torneo,
+                                crearHijos, mutar_poblacion_por_desplazamiento, nueva_poblacion)
+
+# Eventos a los que se pueden registrar funciones
+EVENTOS = ("al_iniciar", "al_evaluar", "al_terminar_generacion", "al_terminar")
+
+
+class MotorNSGAII:
+    """
+    Motor que ejecuta NSGA-II generación por generación.
+
+    Con los parámetros por defecto hace exactamente lo mismo que el ciclo de `practica1.ipynb`:
+    con la misma semilla se obtiene la misma población.
+
+    Hooks:
+    ------
+    Se registran con `registrar(evento, funcion)`; cada función recibe el motor como primer argumento.
+        - "al_iniciar"(motor): después de generar y evaluar la población inicial.
+        - "al_evaluar"(motor, hijos): después de cruzar, mutar y evaluar los hijos de la generación.
+        - "al_terminar_generacion"(motor): después del reemplazo.
+        - "al_terminar"(motor): al salir del ciclo.
+    Un hook puede llamar a `motor.detener()` para terminar al final de la generación actual.
+
+    Criterios de paro:
+    ------------------
+    Además del número máximo de generaciones, `criterios_paro` es una lista de funciones
+    criterio(motor) -> bool que se revisan al final de cada generación; el ciclo termina en
+    cuanto una regresa True. `motor.motivo_paro` indica cuál fue.
+
+    Atributos:
+    ----------
+    poblacion : list
+        Población actual con el formato [[cromosoma], [f1, f2]].
+    generacion : int
+        Número de generaciones completadas.
+    frentes : list
+        Frentes de Pareto (vectores de aptitud) de la última población combinada.
+    vectores_crowding : list
+        Vectores elegidos por distancia de crowding en el último reemplazo.
+    idx_frente_crowding : int
+        Frente (base 1) en el que se aplicó la distancia de crowding en el último reemplazo.
+    n_evaluaciones : int
+        Número de evaluaciones de aptitud (decodificaciones) de la población inicial, los hijos y los
+        mutantes re-evaluados. Los aciertos de la caché no cuentan.
+    poblacion_combinada : list
+        Población combinada (padres + hijos) del último reemplazo. Los sobrevivientes son los
+        mismos objetos que quedan en `poblacion`.
+    rango, crowding : np.ndarray | None
+        Con `por_crowding`, frente (0 = primero) y distancia de crowding de cada individuo de
+        `poblacion`, tal como los dejó el reemplazo.
+    """
+
+    def __init__(self, mtx_op_t, mtx_op_e=None, l_tsk_oper=None, tam_poblacion=150, n_generaciones=500,
+                 p_cruza=0.7, n_puntos_cruza=3, p_mutacion=0.3, k_torneo=2, seleccion=seleccion_por_torneo,
+                 cruza=crearHijos, mutacion=mutar_poblacion_por_desplazamiento, reemplazo=nueva_poblacion,
+                 criterios_paro=None, cache=None, checkpoints=None, evaluador=None, archivo=None, semilla=None,
+                 por_crowding=False):
+        """
+        Parámetros:
+        -----------
+        mtx_op_t : InstanciaProblema | list
+            Instancia compilada o matriz operaciones-máquinas con los tiempos.
+        mtx_op_e : list | None
+            Matriz operaciones-máquinas con la energía.
+        l_tsk_oper : list | None
+            Lista con las operaciones de cada tarea.
+        tam_poblacion, n_generaciones, p_cruza, n_puntos_cruza, p_mutacion, k_torneo :
+            Parámetros del algoritmo.
+        seleccion : function
+            seleccion(poblacion, k, modo) -> índices de los padres. Con `por_crowding` recibe además
+            rango= y crowding=.
+        cruza : function
+            cruza(poblacion, idx_padres, p_cruza, n_puntos, instancia, cache=, checkpoints=, evaluador=) -> hijos.
+        mutacion : function
+            mutacion(hijos, p_mutacion, instancia, cache=, checkpoints=, evaluador=) -> hijos.
+        reemplazo : function
+            reemplazo(poblacion_combinada, tam_poblacion) -> (poblacion, frentes, vectores_crowding, idx_frente).
+            Con `por_crowding` se llama con por_crowding=True y regresa además (rango, crowding).
+        criterios_paro : list | None
+            Funciones criterio(motor) -> bool adicionales al número de generaciones.
+        cache : CacheAptitud | None
+            Caché de evaluaciones.
+        checkpoints : CacheAptitud | None
+            Almacén de checkpoints de decodificación para la evaluación incremental.
+        evaluador : EvaluadorParalelo | None
+            Evaluador por lotes en paralelo.
+        archivo : ArchivoPareto | None
+            Archivo externo al que se ofrecen la población inicial y todos los hijos evaluados.
+        semilla : int | None
+            Si se da, se inicializan `random` y `np.random` con ella al iniciar.
+        por_crowding : bool
+            Si es True, la selección usa el torneo por rango y distancia de crowding (el operador de
+            comparación de NSGA-II) con los valores que calculó el reemplazo, en lugar del torneo
+            por dominancia de Pareto.
+        """
+        self.instancia = compilar_instancia(mtx_op_t, mtx_op_e, l_tsk_oper)
+        self.tam_poblacion = tam_poblacion
+        self.n_generaciones = n_generaciones
+        self.p_cruza = p_cruza
+        self.n_puntos_cruza = n_puntos_cruza
+        self.p_mutacion = p_mutacion
+        self.k_torneo = k_torneo
+
+        self.seleccion = seleccion
+        self.cruza = cruza
+        self.mutacion = mutacion
+        self.reemplazo = reemplazo
+        self.criterios_paro = list(criterios_paro or [])
+
+        self.cache = cache
+        self.checkpoints = checkpoints
+        self.evaluador = evaluador
+        self.archivo = archivo
+        self.semilla = semilla
+        self.por_crowding = por_crowding
+
+        self.hooks = {evento: [ ] for evento in EVENTOS}
+        if archivo is not None:
+            archivo.conectar(self)
+
+        self.poblacion = None
+        self.generacion = 0
+        self.frentes = None
+        self.vectores_crowding = None
+        self.idx_frente_crowding = None
+        self.poblacion_combinada = None
+        self.rango = None
+        self.crowding = None
+        self.n_evaluaciones = 0
+        self.tiempo_ejecucion = 0.0
+        self.motivo_paro = None
+        self._detener = False
+        self._inicio = None
+
+    # ------------------------------ Hooks ------------------------------
+    def registrar(self, evento, funcion):
+        """Registra una función para un evento (ver EVENTOS). Regresa la función, para usarlo como decorador."""
+        if evento not in self.hooks:
+            raise ValueError(f"Evento no válido: {evento}. Use uno de {EVENTOS}.")
+        self.hooks[evento].append(funcion)
+        return funcion
+
+    def _disparar(self, evento, *args):
+        for funcion in self.hooks[evento]:
+            funcion(self, *args)
+
+    def detener(self, motivo="detenido por un hook"):
+        """Pide terminar el ciclo al final de la generación actual."""
+        self._detener = True
+        self.motivo_paro = motivo
+
+    # ------------------------------ Ciclo ------------------------------
+    def _argumentos_evaluacion(self):
+        return {"cache": self.cache, "checkpoints": self.checkpoints, "evaluador": self.evaluador}
+
+    def inicializar(self):
+        """Genera y evalúa la población inicial."""
+        if self.semilla is not None:
+            random.seed(self.semilla)
+            np.random.seed(self.semilla % 2**32)
+
+        evaluaciones_antes = ESTADISTICAS_EVALUACION["evaluaciones"]
+        self.poblacion = generar_poblacion_inicial(self.tam_poblacion, self.instancia.n_genes, self.instancia,
+                                                   **self._argumentos_evaluacion())
+        if self.por_crowding:
+            # La población inicial pasa por el reemplazo completo (sin descartar a nadie) para
+            # tener su rango y crowding antes del primer torneo
+            (self.poblacion, _, _, _, self.rango,
+             self.crowding) = self.reemplazo(self.poblacion, self.tam_poblacion, por_crowding=True)
+        self.generacion = 0
+        self.n_evaluaciones = ESTADISTICAS_EVALUACION["evaluaciones"] - evaluaciones_antes
+        self._disparar("al_iniciar")
+
+    def paso(self):
+        """Ejecuta una generación completa."""
+        argumentos = self._argumentos_evaluacion()
+
+        if self.por_crowding:
+            idx_padres = self.seleccion(self.poblacion, self.k_torneo, "minimize",
+                                        rango=self.rango, crowding=self.crowding)
+        else:
+            idx_padres = self.seleccion(self.poblacion, self.k_torneo, "minimize")
+        evaluaciones_antes = ESTADISTICAS_EVALUACION["evaluaciones"]
+        hijos = self.cruza(self.poblacion, idx_padres, self.p_cruza, self.n_puntos_cruza, self.instancia, **argumentos)
+        hijos = self.mutacion(hijos, self.p_mutacion, self.instancia, **argumentos)
+        self.n_evaluaciones += ESTADISTICAS_EVALUACION["evaluaciones"] - evaluaciones_antes
+        self._disparar("al_evaluar", hijos)
+
+        self.poblacion_combinada = self.poblacion + hijos
+        if self.por_crowding:
+            (self.poblacion, self.frentes, self.vectores_crowding, self.idx_frente_crowding,
+             self.rango, self.crowding) = self.reemplazo(self.poblacion_combinada, self.tam_poblacion,
+                                                         por_crowding=True)
+        else:
+            (self.poblacion, self.frentes, self.vectores_crowding,
+             self.idx_frente_crowding) = self.reemplazo(self.poblacion_combinada, self.tam_poblacion)
+        self.generacion += 1
+        self._disparar("al_terminar_generacion")
+
+    def debe_parar(self):
+        """Revisa el número de generaciones, las peticiones de los hooks y los criterios de paro."""
+        if self._detener:
+            return True
+        if self.generacion >= self.n_generaciones:
+            self.motivo_paro = "n_generaciones"
+            return True
+        for criterio in self.criterios_paro:
+            if criterio(self):
+                self.motivo_paro = getattr(criterio, "__name__", type(criterio).__name__)
+                return True
+        return False
+
+    def ejecutar(self):
+        """
+        Ejecuta el algoritmo hasta cumplir un criterio de paro. Si la población ya existe (por
+        ejemplo, al continuar una ejecución) no se vuelve a generar.
+
+        Returns:
+            list: Población final.
+        """
+        self._inicio = time.perf_counter()
+        if self.poblacion is None:
+            self.inicializar()
+
+        self._detener = False
+        self.motivo_paro = None
+        while not self.debe_parar():
+            self.paso()
+
+        self.tiempo_ejecucion += time.perf_counter() - self._inicio
+        self._inicio = None
+        self._disparar("al_terminar")
+        return self.poblacion
+
+    # ------------------------------ Resultados ------------------------------
+    @property
+    def tiempo_transcurrido(self):
+        """Segundos de ejecución acumulados, incluida la llamada a `ejecutar` en curso."""
+        if self._inicio is None:
+            return self.tiempo_ejecucion
+        return self.tiempo_ejecucion + time.perf_counter() - self._inicio
+
+    @property
+    def frente_pareto(self):
+        """Vectores de aptitud del primer frente de la última población combinada."""
+        return self.frentes[0] if self.frentes else [ ]
+
+    @property
+    def soluciones(self):
+        """Resultado de la ejecución: las soluciones del archivo si hay uno; si no, la población."""
+        return self.archivo.soluciones if self.archivo is not None else self.poblacion
+
+    def __repr__(self):
+        return (f"MotorNSGAII(generacion={self.generacion}/{self.n_generaciones}, "
+                f"tam_poblacion={self.tam_poblacion}, n_evaluaciones={self.n_evaluaciones})")
+
+
+# ------------------------------ HOOKS Y CRITERIOS DE USO COMÚN ------------------------------
+class RegistroFrentes:
+    """
+    Hook "al_terminar_generacion" que guarda los frentes en generaciones específicas,
+    como las listas que llenaba el notebook para las gráficas.
+
+    Las generaciones se cuentan desde 0 (la primera generación completada es la 0).
+    """
+
+    def __init__(self, generaciones):
+        self.generaciones = set(generaciones)
+        self.frentes = [ ]
+        self.vectores_crowding = [ ]
+        self.idx_frentes_crowding = [ ]
+
+    def __call__(self, motor):
+        if motor.generacion - 1 in self.generaciones:
+            self.frentes.append(motor.frentes)
+            self.vectores_crowding.append(motor.vectores_crowding)
+            self.idx_frentes_crowding.append(motor.idx_frente_crowding)
+
+
+def limite_de_tiempo(segundos):
+    """Criterio de paro: termina cuando el tiempo de ejecución acumulado del motor alcanza `segundos`."""
+    def limite_de_tiempo(motor):
+        return motor.tiempo_transcurrido >= segundos
+    return limite_de_tiempo
+
+
+def limite_de_evaluaciones(n_maximo):
+    """Criterio de paro: termina cuando el número de evaluaciones alcanza `n_maximo`."""
+    def limite_de_evaluaciones(motor):
+        return motor.n_evaluaciones >= n_maximo
+    return limite_de_evaluaciones
@@ -0,0 +1,343 @@
+#####################################################################################################
+#       poblacion_arreglo.py
+#       Población guardada en arreglos contiguos en lugar de listas [[cromosoma], aptitud].
+#           - genes: matriz (capacidad, n_genes) de enteros pequeños (int8 / int16)
+#           - aptitud: matriz (capacidad, n_objetivos) de flotantes
+#           - rango y crowding: columnas que llena el reemplazo
+#           Los operadores trabajan con arreglos de ÍNDICES y escriben en filas ya reservadas,
+#           así que el consumo de memoria no crece generación tras generación.
+#####################################################################################################
+
+import random
+import numpy as np
+
+from NSGAII import fast_non_dominated_sort, crowding_distance, indices_mayor_crowding
+from instancia import compilar_instancia
+from algoritmo_genetico import (generar_cromosoma_random, seleccion_por_torneo, seleccion_por_torneo_crowding,
+                                cruza_n_puntos_lote, mutacion_desplazamiento_lote, evaluar_fitness_poblacion)
+
+
+def tipo_genes_para(n_maquinas):
+    """Regresa el tipo entero más pequeño (int8 o int16) que alcanza para guardar el número de máquina."""
+    if n_maquinas <= np.iinfo(np.int8).max:
+        return np.int8
+    if n_maquinas <= np.iinfo(np.int16).max:
+        return np.int16
+    raise ValueError("Demasiadas máquinas para guardar los genes en int16.")
+
+
+class PoblacionArreglo:
+    """
+    Población de tamaño variable sobre buffers preasignados.
+
+    Las filas [0, n) son los individuos activos; las filas restantes hasta `capacidad` están
+    reservadas para escribir hijos sin pedir memoria nueva. `poblacion[i]` regresa la pareja
+    (genes, aptitud) de la fila i, de modo que las funciones que esperan el formato
+    [[cromosoma], aptitud] (por ejemplo `seleccion_por_torneo`) también aceptan esta clase.
+
+    Atributos:
+    ----------
+    n : int
+        Número de individuos activos.
+    capacidad : int
+        Número máximo de individuos que caben en los buffers.
+    """
+
+    def __init__(self, capacidad, n_genes, n_objetivos=2, tipo_genes=np.int8):
+        self.capacidad = capacidad
+        self.n = 0
+        self._genes = np.zeros((capacidad, n_genes), dtype=tipo_genes)
+        self._aptitud = np.zeros((capacidad, n_objetivos))
+        self._rango = np.zeros(capacidad, dtype=np.int32)
+        self._crowding = np.zeros(capacidad)
+
+    @classmethod
+    def desde_lista(cls, poblacion, capacidad=None, tipo_genes=np.int8):
+        """Crea la población a partir de una lista con el formato [[cromosoma], [f1, f2]]."""
+        n_genes = len(poblacion[0][0])
+        n_objetivos = len(poblacion[0][1])
+        nueva = cls(capacidad or len(poblacion), n_genes, n_objetivos, tipo_genes)
+        nueva.agregar([individuo[0] for individuo in poblacion], [individuo[1] for individuo in poblacion])
+        return nueva
+
+    def a_lista(self):
+        """Regresa la población en el formato de listas [[cromosoma], aptitud]."""
+        return [[fila.tolist(), aptitud.copy()] for fila, aptitud in zip(self.genes, self.aptitud)]
+
+    # ------------------------------ Vistas de las filas activas ------------------------------
+    @property
+    def genes(self):
+        return self._genes[:self.n]
+
+    @property
+    def aptitud(self):
+        return self._aptitud[:self.n]
+
+    @property
+    def rango(self):
+        return self._rango[:self.n]
+
+    @property
+    def crowding(self):
+        return self._crowding[:self.n]
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        if not -self.n <= i < self.n:
+            raise IndexError("Índice fuera de la población.")
+        return self._genes[i], self._aptitud[i]
+
+    # ------------------------------ Escritura de filas ------------------------------
+    def reservar(self, k):
+        """Reserva k filas al final de la población y regresa sus índices."""
+        if self.n + k > self.capacidad:
+            raise ValueError(f"No caben {k} individuos más (capacidad {self.capacidad}, ocupados {self.n}).")
+        indices = np.arange(self.n, self.n + k)
+        self.n += k
+        return indices
+
+    def agregar(self, genes, aptitudes=None):
+        """Copia cromosomas (y opcionalmente su aptitud) al final de la población. Regresa sus índices."""
+        genes = np.asarray(genes)
+        indices = self.reservar(len(genes))
+        self._genes[indices] = genes
+        if aptitudes is not None:
+            self._aptitud[indices] = aptitudes
+        return indices
+
+    def tomar(self, indices, destino):
+        """
+        Copia las filas `indices` (genes, aptitud, rango y crowding) al inicio de `destino`.
+
+        `destino` debe ser otra PoblacionArreglo con las mismas dimensiones; su contenido previo
+        se descarta. No se pide memoria nueva para los individuos.
+        """
+        k = len(indices)
+        if k > destino.capacidad:
+            raise ValueError("El destino no tiene capacidad suficiente.")
+        np.take(self._genes, indices, axis=0, out=destino._genes[:k])
+        np.take(self._aptitud, indices, axis=0, out=destino._aptitud[:k])
+        np.take(self._rango, indices, out=destino._rango[:k])
+        np.take(self._crowding, indices, out=destino._crowding[:k])
+        destino.n = k
+        return destino
+
+    def __repr__(self):
+        return (f"PoblacionArreglo(n={self.n}, capacidad={self.capacidad}, n_genes={self._genes.shape[1]}, "
+                f"tipo_genes={self._genes.dtype})")
+
+
+# ---------------------- INICIALIZACIÓN ------------------
+def generar_poblacion_arreglo(tam_poblacion, mtx_op_t, mtx_op_e=None, l_tsk_oper=None, cache=None, evaluador=None):
+    """
+    Genera y evalúa la población inicial, con capacidad para la población combinada (padres + hijos).
+
+    Usa los mismos números aleatorios que `generar_poblacion_inicial`, así que con la misma semilla
+    se obtienen los mismos individuos.
+
+    Returns:
+        tuple: (poblacion, buffer). `buffer` es una segunda PoblacionArreglo del mismo tamaño que
+        usa el reemplazo para no pedir memoria; ambas se intercambian en cada generación.
+    """
+    instancia = compilar_instancia(mtx_op_t, mtx_op_e, l_tsk_oper)
+    tipo = tipo_genes_para(instancia.n_maquinas)
+    # Padres + hijos: la selección puede regresar un padre extra para completar parejas
+    capacidad = 2 * tam_poblacion + 2
+
+    poblacion = PoblacionArreglo(capacidad, instancia.n_genes, 2, tipo)
+    buffer = PoblacionArreglo(capacidad, instancia.n_genes, 2, tipo)
+    for _ in range(tam_poblacion):
+        poblacion.agregar([generar_cromosoma_random(instancia.n_genes, 1, instancia.n_maquinas)])
+    poblacion.aptitud[:] = evaluar_fitness_poblacion(poblacion.genes, instancia, cache=cache, evaluador=evaluador)
+    asignar_rango_crowding(poblacion)
+    return poblacion, buffer
+
+
+# ----------------------- SELECCIÓN -----------------------
+def seleccion_por_torneo_arreglo(poblacion, k, modo_optimizacion="minimize", por_crowding=False):
+    """
+    Torneo sobre una PoblacionArreglo. Regresa un arreglo de índices.
+
+    Si `por_crowding` es True se usa el operador de comparación por crowding con las columnas
+    de rango y crowding que guardó el reemplazo (solo minimización); si no, el torneo por
+    dominancia de Pareto de `seleccion_por_torneo`.
+    """
+    if por_crowding:
+        return seleccion_por_torneo_crowding(poblacion.rango, poblacion.crowding, k)
+    return np.asarray(seleccion_por_torneo(poblacion, k, modo_optimizacion), dtype=np.intp)
+
+
+# ----------------------- CRUZA -----------------------
+def cruzar_en_arreglo(poblacion, idx_padres, pCruza, nPtosCruza):
+    """
+    Cruza de n puntos que escribe los hijos en filas reservadas al final de la población.
+
+    Consume los números aleatorios en el mismo orden que `crearHijos` + `cruza_n_puntos`.
+
+    Returns:
+        np.ndarray: Índices de las filas con los hijos (sin evaluar).
+    """
+    n_genes = poblacion._genes.shape[1]
+    if nPtosCruza < 1 or nPtosCruza >= n_genes:
+        raise ValueError("El número de puntos de cruce debe ser entre 1 y len(p1) - 1.")
+
+    parejas = [ ]
+    for j in range(0, len(idx_padres) - 1, 2):
+        if random.uniform(0, 1) <= pCruza:
+            puntos = sorted(random.sample(range(1, n_genes), nPtosCruza))
+            parejas.append((idx_padres[j], idx_padres[j + 1], puntos))
+
+    idx_hijos = poblacion.reservar(2 * len(parejas))
+    genes = poblacion._genes
+    for (idx_p1, idx_p2, puntos), h1, h2 in zip(parejas, idx_hijos[0::2], idx_hijos[1::2]):
+        genes[h1] = genes[idx_p1]
+        genes[h2] = genes[idx_p2]
+        # Los segmentos impares se toman del otro padre
+        limites = puntos + [n_genes]
+        for inicio, fin in zip(limites[0::2], limites[1::2]):
+            genes[h1, inicio:fin] = genes[idx_p2, inicio:fin]
+            genes[h2, inicio:fin] = genes[idx_p1, inicio:fin]
+    return idx_hijos
+
+
+def cruzar_en_arreglo_lote(poblacion, idx_padres, pCruza, nPtosCruza, generador=None):
+    """
+    Igual que `cruzar_en_arreglo`, pero todas las parejas se cruzan juntas con `cruza_n_puntos_lote`.
+
+    Los números aleatorios salen de NumPy (no del módulo random), así que con la misma semilla
+    los hijos no coinciden con los de `cruzar_en_arreglo`.
+
+    Returns:
+        np.ndarray: Índices de las filas con los hijos (sin evaluar).
+    """
+    n_pares = len(idx_padres) // 2
+    parejas = np.asarray(idx_padres[:2 * n_pares], dtype=np.intp).reshape(-1, 2)
+    hijos, _ = cruza_n_puntos_lote(poblacion.genes, parejas, pCruza, nPtosCruza, generador)
+    return poblacion.agregar(hijos)
+
+
+# ----------------------- MUTACIÓN -----------------------
+def mutar_en_arreglo(poblacion, idx_hijos, porc_muta):
+    """
+    Mutación por desplazamiento aplicada en sitio a las filas `idx_hijos`.
+
+    Consume los números aleatorios en el mismo orden que `mutar_poblacion_por_desplazamiento`.
+
+    Returns:
+        np.ndarray: Índices de las filas que cambiaron.
+    """
+    n_genes = poblacion._genes.shape[1]
+    genes = poblacion._genes
+    mutados = [ ]
+    for idx in idx_hijos:
+        if random.uniform(0, 1) <= porc_muta and n_genes > 1:
+            inicio, fin = sorted(random.sample(range(n_genes), 2))
+            nueva_pos = random.randint(0, n_genes - (fin - inicio + 1))
+
+            # Permutación de posiciones: resto[:nueva_pos] + segmento + resto[nueva_pos:]
+            resto = np.r_[0:inicio, fin + 1:n_genes]
+            orden = np.concatenate((resto[:nueva_pos], np.arange(inicio, fin + 1), resto[nueva_pos:]))
+            genes[idx] = genes[idx, orden]
+            mutados.append(idx)
+    return np.asarray(mutados, dtype=np.intp)
+
+
+def mutar_en_arreglo_lote(poblacion, idx_hijos, porc_muta, generador=None):
+    """
+    Igual que `mutar_en_arreglo`, pero todas las filas se mutan juntas con `mutacion_desplazamiento_lote`.
+
+    Returns:
+        np.ndarray: Índices de las filas que cambiaron.
+    """
+    idx_hijos = np.asarray(idx_hijos, dtype=np.intp)
+    if len(idx_hijos) == 0:
+        return idx_hijos
+    bloque, cambiados = mutacion_desplazamiento_lote(poblacion._genes[idx_hijos], porc_muta, generador, en_sitio=True)
+    poblacion._genes[idx_hijos[cambiados]] = bloque[cambiados]
+    return idx_hijos[cambiados]
+
+
+# ------------------------------- REEMPLAZO ---------------------------
+def asignar_rango_crowding(poblacion, tam_poblacion=None):
+    """
+    Llena las columnas de rango y crowding de la población. Regresa los frentes (listas de índices).
+
+    Si se da `tam_poblacion`, el crowding solo se calcula hasta el frente de corte: las filas de
+    los frentes posteriores las descarta el reemplazo y su crowding queda sin actualizar.
+    """
+    _, frentes_idxs = fast_non_dominated_sort(poblacion.aptitud, "minimize")
+    contador = 0
+    for rango, frente in enumerate(frentes_idxs):
+        poblacion._rango[frente] = rango
+        if tam_poblacion is None or contador < tam_poblacion:
+            poblacion._crowding[frente] = crowding_distance(poblacion._aptitud[frente])
+        contador += len(frente)
+    return frentes_idxs
+
+
+def reemplazo_en_arreglo(poblacion, tam_poblacion, destino):
+    """
+    Reemplazo de NSGA-II (frentes completos + distancia de crowding en el frente de corte).
+
+    Llena las columnas de rango y crowding de la población combinada y copia a `destino` las
+    filas sobrevivientes, en el mismo orden que `nueva_poblacion`.
+
+    Returns:
+        tuple: (destino, indices_sobrevivientes)
+    """
+    frentes_idxs = asignar_rango_crowding(poblacion, tam_poblacion)
+
+    sobrevivientes = [ ]
+    contador = 0
+    for frente in frentes_idxs:
+        frente = np.asarray(frente, dtype=np.intp)
+        if contador + len(frente) <= tam_poblacion:
+            sobrevivientes.append(frente)
+            contador += len(frente)
+        else:
+            # El crowding del frente de corte ya está en la columna de crowding
+            elegidos = indices_mayor_crowding(poblacion._crowding[frente], tam_poblacion - contador)
+            sobrevivientes.append(frente[elegidos])
+            break
+
+    indices = np.concatenate(sobrevivientes) if sobrevivientes else np.empty(0, dtype=np.intp)
+    return poblacion.tomar(indices, destino), indices
+
+
+# ------------------------------- GENERACIÓN COMPLETA ---------------------------
+def generacion_arreglo(poblacion, buffer, tam_poblacion, k_torneo, pCruza, nPtosCruza, porc_muta, mtx_op_t,
+                       mtx_op_e=None, l_tsks=None, cache=None, evaluador=None, por_crowding=False,
+                       operadores_lote=False):
+    """
+    Ejecuta una generación completa de NSGA-II sobre arreglos.
+
+    Los hijos se escriben después de los padres dentro de la misma PoblacionArreglo (esa es la
+    población combinada) y el reemplazo copia los sobrevivientes a `buffer`. Con `por_crowding`
+    la selección usa el torneo por rango y crowding en lugar del torneo por dominancia. Con
+    `operadores_lote` la cruza y la mutación se aplican a todo el bloque de hijos a la vez
+    (`cruzar_en_arreglo_lote` y `mutar_en_arreglo_lote`).
+
+    Returns:
+        tuple: (nueva_poblacion, nuevo_buffer). Son los mismos dos objetos, intercambiados.
+    """
+    instancia = compilar_instancia(mtx_op_t, mtx_op_e, l_tsks)
+
+    idx_padres = seleccion_por_torneo_arreglo(poblacion, k_torneo, "minimize", por_crowding)
+    if operadores_lote:
+        idx_hijos = cruzar_en_arreglo_lote(poblacion, idx_padres, pCruza, nPtosCruza)
+    else:
+        idx_hijos = cruzar_en_arreglo(poblacion, idx_padres, pCruza, nPtosCruza)
+    if operadores_lote:
+        mutar_en_arreglo_lote(poblacion, idx_hijos, porc_muta)
+    else:
+        mutar_en_arreglo(poblacion, idx_hijos, porc_muta)
+
+    # Cada hijo se evalúa una sola vez, ya mutado
+    if len(idx_hijos):
+        poblacion._aptitud[idx_hijos] = evaluar_fitness_poblacion(poblacion._genes[idx_hijos], instancia,
+                                                                   cache=cache, evaluador=evaluador)
+
+    nueva, _ = reemplazo_en_arreglo(poblacion, tam_poblacion, buffer)
+    return nueva, poblacion
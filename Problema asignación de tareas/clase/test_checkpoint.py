@@ -0,0 +1,38 @@
+import os
+
+import numpy as np
+
+from checkpoint import guardar_checkpoint, reanudar
+from criterios_paro import ConvergenciaFrente
+from datos_transformacion import cargar_instancia
+from motor_nsga2 import MotorNSGAII
+
+DATOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datos_practica")
+
+
+def _motor(instancia):
+    criterio = ConvergenciaFrente(ventana=10)
+    motor = MotorNSGAII(*instancia, tam_poblacion=30, n_generaciones=500, semilla=5, criterios_paro=[criterio])
+    return motor, criterio
+
+
+def test_reanudar_con_criterio_de_convergencia(tmp_path):
+    instancia = cargar_instancia(DATOS, cache=False)
+    continuo, criterio_continuo = _motor(instancia)
+    continuo.ejecutar()
+
+    ruta = str(tmp_path / "corrida.npz")
+    interrumpido, _ = _motor(instancia)
+    interrumpido.n_generaciones = 40
+    interrumpido.ejecutar()
+    guardar_checkpoint(ruta, interrumpido)
+
+    reanudado, criterio_reanudado = _motor(instancia)
+    reanudar(ruta, reanudado)
+    reanudado.ejecutar()
+
+    assert 40 < continuo.generacion < 500
+    assert reanudado.generacion == continuo.generacion
+    assert criterio_reanudado.historial["hipervolumen"] == criterio_continuo.historial["hipervolumen"]
+    for a, b in zip(reanudado.poblacion, continuo.poblacion):
+        np.testing.assert_array_equal(a[0], b[0])
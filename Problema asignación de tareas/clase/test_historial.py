@@ -0,0 +1,30 @@
+import os
+
+import numpy as np
+
+from historial import LectorHistorial, RegistroHistorial
+
+
+def _generacion(g):
+    aptitud = np.arange(8, dtype=float).reshape(4, 2) + g
+    return g, aptitud, np.array([0, 0, 1, 1]), np.array([0, 1])
+
+
+def test_reanudar_tras_bloque_incompleto(tmp_path):
+    ruta = str(tmp_path / "corrida.hist")
+    with RegistroHistorial(ruta, generaciones_por_bloque=5) as historial:
+        for g in range(10):
+            historial.agregar(*_generacion(g))
+
+    # El proceso muere mientras escribe el último bloque
+    os.truncate(ruta, os.path.getsize(ruta) - 30)
+    assert LectorHistorial(ruta).generaciones == list(range(5))
+
+    with RegistroHistorial(ruta, generaciones_por_bloque=5) as historial:
+        for g in range(5, 15):
+            historial.agregar(*_generacion(g))
+
+    lector = LectorHistorial(ruta)
+    assert lector.generaciones == list(range(15))
+    for g in (0, 6, 12, 14):
+        np.testing.assert_array_equal(lector.leer(g)["aptitud"], _generacion(g)[1])
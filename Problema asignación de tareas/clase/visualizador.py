@@ -1,21 +1,27 @@
-import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from instancia import InstanciaProblema
 
-def transformar_datos_visualizador(mtx_oper_mach, mtx_oper_tsk, vector_gen):
+def transformar_datos_visualizador(mtx_oper_mach, mtx_oper_tsk=None, vector_gen=None):
     """_summary_
 
     Args:
-        mtx_oper_mach (list): Listas o vectores bidimensionales que contienen la relación de las operaciones con el consumo de tiempo por máquina. 
+        mtx_oper_mach (list | InstanciaProblema): Listas o vectores bidimensionales que contienen la relación de las operaciones con el consumo de tiempo por máquina,
+            o una instancia compilada. Con una instancia se puede llamar como `transformar_datos_visualizador(instancia, vector_gen=vector)`.
         mtx_oper_tsk (list): Lista unidimensional que contiene las tareas con sus operaciones para ser ejecutadas por el algoritmo 
         vector_gen (list): Es el vector solución (cromosoma) al cual se le van a obtener los datos. 
 
     Returns:
-        _type_: _description_
+        list: Lista por tarea con un diccionario por operación (máquina, duración, inicio, número de actividad y de tarea)
     """
+    if isinstance(mtx_oper_mach, InstanciaProblema):
+        instancia = mtx_oper_mach
+    else:
+        instancia = InstanciaProblema(mtx_oper_mach, None, mtx_oper_tsk)
+
     # --- LÓGICA DE TIEMPO CORREGIDA ---
-    num_tareas = len(mtx_oper_tsk)
-    num_maquinas = mtx_oper_mach.shape[1]
+    num_tareas = instancia.n_tareas
+    num_maquinas = instancia.n_maquinas
     
     # "Relojes" que indican cuándo queda libre cada recurso.
     tiempo_maquinas = [0.0] * num_maquinas
@@ -24,45 +30,40 @@ def transformar_datos_visualizador(mtx_oper_mach, mtx_oper_tsk, vector_gen):
     # Estructura de salida para los datos del gráfico
     arreglo_visualizador = [[] for _ in range(num_tareas)]
 
-    # El resto de tu código para decodificar el vector_gen es correcto.
-    # Lo he simplificado un poco para mayor claridad.
-    idx_operacion_global = 0
-    for i in range(num_tareas):  # Recorremos cada tarea
-        for j in range(len(mtx_oper_tsk[i])):  # Recorremos cada operación de la tarea
-            
-            # Obtenemos los datos de la operación actual
-            operacion_id = mtx_oper_tsk[i][j]
-            maquina_asignada = vector_gen[idx_operacion_global]
+    for idx_operacion_global in range(instancia.n_genes):  # Recorremos cada gen del cromosoma
             
-            # Los índices para las matrices son base 0
-            maquina_idx = maquina_asignada - 1
-            operacion_idx = operacion_id - 1
+        # Obtenemos los datos de la operación actual
+        i = int(instancia.tarea_gen[idx_operacion_global])
+        j = idx_operacion_global - int(instancia.inicio_tareas[i])  # Operación dentro de la tarea
+        operacion_id = int(instancia.operacion_gen[idx_operacion_global])
+        maquina_asignada = vector_gen[idx_operacion_global]
             
-            duracion = mtx_oper_mach[operacion_idx][maquina_idx]
+        # Los índices para las matrices son base 0
+        maquina_idx = maquina_asignada - 1
             
-            # --- CÁLCULO CLAVE DEL TIEMPO DE INICIO ---
-            tiempo_maquina_libre = tiempo_maquinas[maquina_idx]
-            tiempo_tarea_lista = tiempo_tareas[i]
+        duracion = instancia.tiempos_gen[idx_operacion_global][maquina_idx]
             
-            inicio = max(tiempo_maquina_libre, tiempo_tarea_lista)
-            fin = inicio + duracion
+        # --- CÁLCULO CLAVE DEL TIEMPO DE INICIO ---
+        tiempo_maquina_libre = tiempo_maquinas[maquina_idx]
+        tiempo_tarea_lista = tiempo_tareas[i]
             
-            # --- ACTUALIZACIÓN DE LOS RELOJES ---
-            tiempo_maquinas[maquina_idx] = fin
-            tiempo_tareas[i] = fin
+        inicio = max(tiempo_maquina_libre, tiempo_tarea_lista)
+        fin = inicio + duracion
             
-            # Agregamos el diccionario con los datos correctos para la gráfica
-            arreglo_visualizador[i].append({
-                'maquina': maquina_idx,  # Usamos índice base 0 para graficar
-                'duracion': duracion,
-                'inicio': inicio,
-                'actividad_num': j + 1, # El número de operación dentro de la tarea
-                'tarea_num': i + 1
-            })
+        # --- ACTUALIZACIÓN DE LOS RELOJES ---
+        tiempo_maquinas[maquina_idx] = fin
+        tiempo_tareas[i] = fin
             
-            print(f"T{i+1}-Op{j+1} (ID:{operacion_id}): Máq {maquina_asignada}, Inicia: {inicio:.2f}, Dura: {duracion:.2f}, Termina: {fin:.2f}")
+        # Agregamos el diccionario con los datos correctos para la gráfica
+        arreglo_visualizador[i].append({
+            'maquina': maquina_idx,  # Usamos índice base 0 para graficar
+            'duracion': duracion,
+            'inicio': inicio,
+            'actividad_num': j + 1, # El número de operación dentro de la tarea
+            'tarea_num': i + 1
+        })
             
-            idx_operacion_global += 1
+        print(f"T{i+1}-Op{j+1} (ID:{operacion_id}): Máq {maquina_asignada}, Inicia: {inicio:.2f}, Dura: {duracion:.2f}, Termina: {fin:.2f}")
 
     return arreglo_visualizador
 
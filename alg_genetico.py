@@ -33,7 +33,7 @@ def generar_cadena_binaria(longitud):
 
 
 # ************************* EVALUACIÓN DE APTITUD  *****************************
-def calcular_aptitud(poblacion, funcion_fitness_especifica, **kwargs):
+def calcular_aptitud(poblacion, funcion_fitness_especifica, cache=None, **kwargs):
     """
     Calcula la aptitud para cada cromosoma en la población usando
     una función de aptitud específica que se pasa como parámetro.
@@ -44,6 +44,10 @@ def calcular_aptitud(poblacion, funcion_fitness_especifica, **kwargs):
         Una lista de cromosomas.
     funcion_fitness_especifica : function
         La función que se usará para calcular la aptitud.
+    cache : CacheAptitud, opcional
+        Caché de evaluaciones (ver `cache_aptitud.py`). Si se proporciona, los cromosomas
+        que ya se evaluaron no vuelven a pasar por la función de aptitud. Cualquier objeto
+        con un método evaluar(cromosoma, funcion, **kwargs) sirve.
     **kwargs : dict
         Argumentos adicionales necesarios para la función de aptitud específica.
 
@@ -54,10 +58,70 @@ def calcular_aptitud(poblacion, funcion_fitness_especifica, **kwargs):
     """
     aptitudes = []
     for cromosoma in poblacion:
-        aptitud = funcion_fitness_especifica(cromosoma, **kwargs)
+        if cache is not None:
+            aptitud = cache.evaluar(cromosoma, funcion_fitness_especifica, **kwargs)
+        else:
+            aptitud = funcion_fitness_especifica(cromosoma, **kwargs)
         aptitudes.append(aptitud)
     return aptitudes
 
+
+def _aptitud_bloque(bloque, funcion_fitness_especifica, kwargs):
+    """Evalúa un bloque de cromosomas dentro de un proceso trabajador."""
+    return [funcion_fitness_especifica(cromosoma, **kwargs) for cromosoma in bloque]
+
+
+def calcular_aptitud_paralela(poblacion, funcion_fitness_especifica, ejecutor, tam_bloque=32, umbral_serial=64,
+                              cache=None, **kwargs):
+    """
+    Versión en paralelo de `calcular_aptitud`: reparte la población en bloques entre los
+    procesos de un ejecutor y regresa las aptitudes en el mismo orden de entrada.
+
+    Parámetros:
+    -----------
+    poblacion : list
+        Una lista de cromosomas.
+    funcion_fitness_especifica : function
+        La función de aptitud. Debe poder enviarse a otro proceso (definida a nivel de módulo).
+    ejecutor : concurrent.futures.Executor
+        Ejecutor persistente (por ejemplo un ProcessPoolExecutor creado una sola vez y reutilizado
+        en todas las generaciones). Si es None se evalúa en serie.
+    tam_bloque : int
+        Número de cromosomas que se envían juntos a un proceso.
+    umbral_serial : int
+        Si la población tiene menos cromosomas que este valor se evalúa en serie, porque la
+        comunicación entre procesos costaría más que la evaluación.
+    cache : CacheAptitud, opcional
+        Caché de evaluaciones; solo los cromosomas que no están en ella se envían a los procesos.
+    **kwargs : dict
+        Argumentos adicionales para la función de aptitud. Se envían con cada bloque; si son
+        datos grandes conviene cargarlos una vez en los procesos (con el `initializer` del
+        ejecutor) o, para el problema de asignación de tareas, usar `EvaluadorParalelo`
+        (ver `evaluacion_paralela.py`), que los pone en memoria compartida.
+
+    Retorna:
+    --------
+    list
+        Una lista de los valores de aptitud calculados.
+    """
+    if tam_bloque < 1:
+        raise ValueError("El tamaño de bloque debe ser al menos 1.")
+
+    def evaluar_lista(cromosomas):
+        if ejecutor is None or len(cromosomas) < umbral_serial:
+            return _aptitud_bloque(cromosomas, funcion_fitness_especifica, kwargs)
+        bloques = [cromosomas[i:i + tam_bloque] for i in range(0, len(cromosomas), tam_bloque)]
+        futuros = [ejecutor.submit(_aptitud_bloque, bloque, funcion_fitness_especifica, kwargs) for bloque in bloques]
+        aptitudes = []
+        for futuro in futuros:
+            aptitudes.extend(futuro.result())
+        return aptitudes
+
+    poblacion = list(poblacion)
+    if cache is not None:
+        return cache.evaluar_lista(poblacion, evaluar_lista)
+    return evaluar_lista(poblacion)
+
 # *********************** SELECCIÒN DE CROMOSOMAS (PADRES) *********************
 
 # *********************** OPERADORES DE CRUZA **********************************